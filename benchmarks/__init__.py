@@ -0,0 +1,4 @@
+"""Offline benchmarks for the ``job_automation`` package.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_prefilter``.
+"""
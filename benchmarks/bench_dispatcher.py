@@ -0,0 +1,129 @@
+"""Batch throughput and crash recovery of the webhook dispatcher.
+
+Runs ``--jds`` JDs against the fake ``cover-letter-generator`` webhook:
+
+1. today's loop: one call at a time with ``--delay`` of sleep between calls
+   (``BATCH_PROCESSING_DELAY``, scaled like ``--latency``);
+2. the dispatcher with AIMD concurrency;
+3. the dispatcher killed half-way, restarted, and checked for lost keys and
+   repeated webhook calls.
+
+Latencies are scaled down; real executions take a minute or more.
+
+    python -m benchmarks.bench_dispatcher --jds 200 --latency 0.5 --delay 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from job_automation.dispatcher import AIMDLimiter, Dispatcher, JobQueue, TokenBucket
+from job_automation.fakes import FakeWebhook
+from job_automation.httpclient import ConnectionPool
+from job_automation.records import job_description
+
+from .corpus import synthetic_jds
+
+WEBHOOK = "/webhook/cover-letter-generator"
+
+
+def batch(count: int) -> List[Tuple[str, str]]:
+    return [(str(n), job_description(jd)) for n, jd in enumerate(synthetic_jds(count), 1)]
+
+
+def sequential(url: str, jobs: List[Tuple[str, str]], delay: float) -> float:
+    pool = ConnectionPool(url, size=1, timeout=60)
+    started = time.perf_counter()
+    for key, text in jobs:
+        body = json.dumps({"jobDescription": text, "key": int(key)}).encode("utf-8")
+        pool.request("POST", "", body, {"Content-Type": "application/json"})
+        time.sleep(delay)
+    pool.close()
+    return time.perf_counter() - started
+
+
+def dispatcher(queue: JobQueue, url: str, pdf_dir: Path, maximum: int, on_result=None) -> Dispatcher:
+    return Dispatcher(
+        queue,
+        url,
+        pdf_dir,
+        AIMDLimiter(2, maximum=maximum),
+        TokenBucket(0),
+        backoff=0.2,
+        timeout=60,
+        on_result=on_result,
+    )
+
+
+async def crash_half_way(queue: JobQueue, url: str, pdf_dir: Path, maximum: int, jobs: int) -> None:
+    finished = 0
+    task: asyncio.Future
+
+    def count(key, outcome, latency, error) -> None:
+        nonlocal finished
+        finished += outcome == "done"
+        if finished >= jobs // 2:
+            task.cancel()
+
+    task = asyncio.ensure_future(dispatcher(queue, url, pdf_dir, maximum, count).run())
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake execution seconds")
+    parser.add_argument("--delay", type=float, default=0.05, help="sleep between sequential calls")
+    parser.add_argument("--workers", type=int, default=6, help="fake n8n concurrent executions")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    args = parser.parse_args()
+    jobs = batch(args.jds)
+
+    def fake(pdf_dir: Path) -> FakeWebhook:
+        return FakeWebhook(args.latency, args.failure_rate, args.workers, args.workers, pdf_dir=pdf_dir)
+
+    with tempfile.TemporaryDirectory() as tmp, fake(Path(tmp)) as hook:
+        elapsed = sequential(hook.url + WEBHOOK, jobs, args.delay)
+        print(f"sequential + delay: {elapsed:7.2f}s  {args.jds / elapsed:6.2f} JDs/sec")
+
+    with tempfile.TemporaryDirectory() as tmp, fake(Path(tmp)) as hook:
+        queue = JobQueue(Path(tmp) / "queue.sqlite")
+        queue.enqueue(jobs)
+        summary = asyncio.run(dispatcher(queue, hook.url + WEBHOOK, Path(tmp), args.max_concurrency).run())
+        print(
+            f"dispatcher (AIMD): {summary.seconds:7.2f}s  {args.jds / summary.seconds:6.2f} JDs/sec  "
+            f"peak {summary.peak_concurrency}, {summary.limit_cuts} cuts, {summary.retried} retries, "
+            f"{summary.failed} failed"
+        )
+        queue.close()
+
+    with tempfile.TemporaryDirectory() as tmp, fake(Path(tmp)) as hook:
+        queue = JobQueue(Path(tmp) / "queue.sqlite")
+        queue.enqueue(jobs)
+        url = hook.url + WEBHOOK
+        asyncio.run(crash_half_way(queue, url, Path(tmp), args.max_concurrency, args.jds))
+        print(f"killed half-way:    {queue.counts()}")
+        # The executions the dead run started still finish on the n8n side
+        time.sleep(args.latency * 2)
+        summary = asyncio.run(dispatcher(queue, url, Path(tmp), args.max_concurrency).run())
+        repeated = sum(calls - 1 for calls in hook.calls.values() if calls > 1)
+        print(
+            f"resumed:            {queue.counts()}  recovered {summary.recovered}, "
+            f"skipped (PDFs exist) {summary.skipped}, repeated calls {repeated} "
+            f"(retries {summary.retried})"
+        )
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Render throughput and latency against the fake Gotenberg server.
+
+Renders a resume and a cover letter for ``--apps`` applications, first one
+document at a time (how the workflows render today), then through the pooled
+client at increasing concurrency. Reports docs/sec and p50/p95 per-document
+latency.
+
+    python -m benchmarks.bench_gotenberg --apps 50 --latency 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+from job_automation.fakes import FakeGotenberg
+from job_automation.gotenberg import GotenbergClient, RenderJob, RenderResult
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+
+
+def jobs(apps: int, out_dir: Path) -> Iterator[RenderJob]:
+    resume = (TEMPLATES / "resume_template.html").read_bytes()
+    letter = (TEMPLATES / "cover_letter_template.html").read_bytes()
+    for key in range(1, apps + 1):
+        yield RenderJob(resume, out_dir / f"{key}-R.pdf", f"{key}-R")
+        yield RenderJob(letter, out_dir / f"{key}-CL.pdf", f"{key}-CL")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, results: List[RenderResult], elapsed: float) -> None:
+    seconds = [r.seconds for r in results]
+    retries = sum(r.attempts - 1 for r in results)
+    failed = sum(not r.ok for r in results)
+    print(
+        f"{label:<16} {len(results) / elapsed:7.2f} docs/sec  "
+        f"p50 {statistics.median(seconds):.3f}s  p95 {percentile(seconds, 95):.3f}s  "
+        f"retries {retries}  failed {failed}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake render seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--chromium", type=int, default=6, help="fake Chromium pool size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakeGotenberg(
+        args.latency, args.failure_rate, args.chromium
+    ) as fake:
+        out_dir = Path(tmp)
+        with GotenbergClient(fake.url, concurrency=1, backoff=0.05) as client:
+            started = time.perf_counter()
+            results = [client.render_job(job) for job in jobs(args.apps, out_dir)]
+            report("serial", results, time.perf_counter() - started)
+
+        for concurrency in (2, 4, 8):
+            with GotenbergClient(fake.url, concurrency=concurrency, backoff=0.05) as client:
+                started = time.perf_counter()
+                results = list(client.render_many(jobs(args.apps, out_dir)))
+                elapsed = time.perf_counter() - started
+                report(f"pooled x{concurrency}", results, elapsed)
+                print(f"{'':<16} {client.pool.opened} connection(s) opened")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Ingest throughput and peak memory against crawl size.
+
+Writes a synthetic crawl of ``N`` postings: half structured records and half
+raw posting text that needs extraction. About 10% are re-posts under a new
+URL with tracking parameters, 5% repeat an earlier URL and 1% are broken. Each
+size is ingested in a fresh process, which reports records/sec, its peak RSS
+and the size of the fingerprint file.
+
+    python -m benchmarks.bench_ingest --sizes 500 5000 50000 --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from job_automation.ingest import FingerprintSet, Schema, ingest_stream, iter_lines
+
+from .corpus import synthetic_jds
+
+
+def raw_posting(jd: Dict[str, Any]) -> Dict[str, Any]:
+    """The same JD as a crawler that only grabbed the page text would store it."""
+    lines = [f"{jd['position']} at {jd['company']}"]
+    if jd["location"]:
+        lines.append(f"Location: {jd['location']}")
+    lines += ["", jd["description"], "", "Responsibilities:"]
+    lines += [f"- {item}" for item in jd["responsibilities"]]
+    lines += ["", "Qualifications:"] + [f"• {item}" for item in jd["requirements"]["required"]]
+    lines += ["", "Nice to have:"] + [f"• {item}" for item in jd["requirements"]["preferred"]]
+    lines += ["", f"Salary: {jd['salary_range']}"]
+    return {"job_url": jd["job_url"], "description": "\n".join(lines)}
+
+
+def crawl(count: int, seed: int = 11) -> Iterator[str]:
+    rng = random.Random(seed)
+    recent: deque = deque(maxlen=500)
+    for index, jd in enumerate(synthetic_jds(count, seed)):
+        roll = rng.random()
+        if roll < 0.10 and recent:
+            repost = dict(rng.choice(recent))
+            repost["job_url"] = f"https://boards.example.org/{index}?utm_source=linkedin"
+            yield json.dumps(repost)
+            continue
+        if roll < 0.15 and recent:
+            yield json.dumps(dict(jd, job_url=rng.choice(recent)["job_url"] + "/"))
+            continue
+        if roll < 0.16:
+            yield '{"job_url": "https://example.com/broken", "position": ' if index % 2 else json.dumps({"job_url": jd["job_url"]})
+            continue
+        # Extraction output: salary_range is re-derived, so drop the shortcut
+        jd.pop("salary_cad", None)
+        recent.append(jd)
+        yield json.dumps(raw_posting(jd) if index % 2 else jd)
+
+
+def run(path: Path, seen_path: Path, schema_path: str, workers: int, results) -> None:
+    schema = Schema.from_file(schema_path)
+    seen = FingerprintSet(seen_path)
+    counts: Counter = Counter()
+    started = time.perf_counter()
+    with open(path.with_suffix(".out.jsonl"), "w", encoding="utf-8") as out:
+        for status, line in ingest_stream(iter_lines(path), schema, seen, workers, flush=out.flush):
+            counts[status] += 1
+            out.write(line)
+            out.write("\n")
+    elapsed = time.perf_counter() - started
+    seen.close()
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, dict(counts), rss_kb, seen_path.stat().st_size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--schema", default="examples/sample-jd.json")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"crawl-{size}.jsonl"
+            with path.open("w", encoding="utf-8") as handle:
+                for line in crawl(size):
+                    handle.write(line + "\n")
+            megabytes = path.stat().st_size / 1e6
+            for workers in args.workers:
+                seen = Path(tmp) / f"seen-{size}-{workers}.fpset"
+                results = context.Queue()
+                child = context.Process(target=run, args=(path, seen, args.schema, workers, results))
+                child.start()
+                elapsed, counts, rss_kb, set_bytes = results.get()
+                child.join()
+                print(
+                    f"{size:>7} postings ({megabytes:6.1f} MB) workers={workers}: "
+                    f"{size / elapsed:8,.0f}/sec  peak RSS {rss_kb / 1024:6.1f} MB  "
+                    f"seen set {set_bytes / 1e6:5.2f} MB  {counts}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Re-run time of the resume chain with and without the LLM cache.
+
+Replays the call pattern of ``jd-resume-generator.json`` (Analyze JD, the four
+parallel branches, one impact call per selected project) against the fake
+Anthropic server through the caching proxy: cold, exact re-run, and a
+near-duplicate JD (new req ID and an extra boilerplate line).
+
+    python -m benchmarks.bench_llm_cache --latency 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from job_automation.fakes import FakeAnthropic
+from job_automation.llm_cache import CachingProxy, ResponseCache
+
+from .corpus import synthetic_jds
+
+BRANCH_PROMPTS = [
+    "Select courses most relevant to the target job skills (master).\n{skills}\nReturn ONLY valid JSON: {{\"selected_courses\": []}}",
+    "Select courses most relevant to the target job skills (bachelor).\n{skills}\nReturn ONLY valid JSON: {{\"selected_courses\": []}}",
+    "Match user's skills to JD requirements and organize by category.\n{skills}\nReturn ONLY valid JSON: {{\"skills_by_category\": {{}}}}",
+    "Select exactly 3 projects that best demonstrate the target job skills.\n{skills}\nReturn ONLY valid JSON: {{\"selected_projects\": []}}",
+]
+
+
+def call(base_url: str, prompt: str, temperature: float = 0.3) -> str:
+    body = {
+        "model": "claude-sonnet-4-5-20250929",
+        "max_tokens": 2000,
+        "temperature": temperature,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    request = urllib.request.Request(
+        base_url + "/v1/messages",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json", "anthropic-version": "2023-06-01"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["content"][0]["text"]
+
+
+def run_chain(base_url: str, jd: str, projects: int = 3) -> float:
+    started = time.perf_counter()
+    analysis = call(
+        base_url,
+        "Extract TOP 10 skills from this job description, ranked by importance.\n\n"
+        f"<job_description>\n{jd}\n</job_description>\n\n"
+        'Return ONLY valid JSON: {"top_10_skills": []}',
+    )
+    skills = json.loads(analysis)["top_10_skills"]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda p: call(base_url, p.format(skills=skills)), BRANCH_PROMPTS))
+    with ThreadPoolExecutor(max_workers=projects) as pool:
+        list(
+            pool.map(
+                lambda i: call(base_url, f"Write resume bullet points for project {i}. impact_sentences"),
+                range(projects),
+            )
+        )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM seconds per call")
+    args = parser.parse_args()
+
+    record = next(synthetic_jds(1))
+    jd = f"Req ID R-10482\n{record['position']} at {record['company']}\n{record['description']}"
+    reposted = jd.replace("R-10482", "JR-2231") + "\nWe are an equal opportunity employer."
+
+    with tempfile.TemporaryDirectory() as tmp, FakeAnthropic(latency=args.latency) as llm:
+        cache = ResponseCache(Path(tmp) / "cache.sqlite")
+        with CachingProxy(cache, upstream=llm.url) as proxy:
+            print(f"uncached chain:  {run_chain(llm.url, jd):6.2f}s")
+            print(f"cold (via cache):{run_chain(proxy.url, jd):6.2f}s")
+            print(f"exact re-run:    {run_chain(proxy.url, jd):6.2f}s")
+            print(f"near-duplicate:  {run_chain(proxy.url, reposted):6.2f}s")
+            stats = cache.stats.to_dict()
+        cache.close()
+    stats.pop("stages")
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Shortlist query latency and prompt size against project-library size.
+
+Builds synthetic data directories of growing size, then reports the cold
+index build, a no-change refresh, p50/p95 query latency for a
+``top_10_skills`` query, and the characters pasted into the prompts with and
+without the shortlist.
+
+    python -m benchmarks.bench_materials --sizes 50 200 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from job_automation.materials import PROMPT_FIELDS, MaterialsIndex
+
+from .bench_gotenberg import percentile
+from .corpus import TECHNOLOGIES, synthetic_materials
+
+
+def full_prompt_chars(directory: Path) -> int:
+    return sum(len(p.read_text(encoding="utf-8")) for p in directory.rglob("*.md"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    queries = [
+        [{"rank": i + 1, "skill": skill, "jd_keywords": [skill]} for i, skill in enumerate(rng.sample(TECHNOLOGIES, k=10))]
+        for _ in range(args.queries)
+    ]
+    print(f"{'projects':>8} {'build':>8} {'refresh':>8} {'p50':>8} {'p95':>8} {'prompt chars':>22}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "data"
+            synthetic_materials(data, size)
+            index = MaterialsIndex(data, Path(tmp) / "index.json")
+
+            started = time.perf_counter()
+            index.refresh()
+            index.search(queries[0], "projects")  # builds the arrays
+            build = time.perf_counter() - started
+            started = time.perf_counter()
+            index.refresh()
+            refresh = time.perf_counter() - started
+
+            latencies = []
+            for skills in queries:
+                started = time.perf_counter()
+                fields = index.prompt_fields(skills)
+                latencies.append(time.perf_counter() - started)
+            shortlist_chars = sum(len(fields[name]) for name in PROMPT_FIELDS.values())
+            print(
+                f"{size:>8} {build:>7.2f}s {refresh * 1000:>6.1f}ms "
+                f"{statistics.median(latencies) * 1000:>6.2f}ms {percentile(latencies, 95) * 1000:>6.2f}ms "
+                f"{full_prompt_chars(data):>10,} -> {shortlist_chars:>7,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
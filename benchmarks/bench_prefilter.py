@@ -0,0 +1,49 @@
+"""Pre-filter throughput on a synthetic corpus.
+
+Reports JDs/sec for a single process and for the process pool, plus the share
+of JDs that would still need an LLM call.
+
+    python -m benchmarks.bench_prefilter --count 5000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections import Counter
+
+from job_automation.prefilter import NEEDS_LLM, CompiledCriteria, classify_stream
+
+from .corpus import synthetic_jds
+
+
+def run(criteria: CompiledCriteria, count: int, workers: int) -> Counter:
+    counts: Counter = Counter()
+    started = time.perf_counter()
+    for _, decision in classify_stream(synthetic_jds(count), criteria, workers):
+        counts[decision["verdict"]] += 1
+    elapsed = time.perf_counter() - started
+    print(f"workers={workers:<3} {count / elapsed:>10,.0f} JDs/sec  ({elapsed:.2f}s)")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--criteria", default="examples/filter-criteria.yaml")
+    args = parser.parse_args()
+
+    criteria = CompiledCriteria.from_file(args.criteria)
+    counts = run(criteria, args.count, 1)
+    if args.workers > 1:
+        run(criteria, args.count, args.workers)
+
+    llm = counts[NEEDS_LLM]
+    print(f"verdicts: {dict(counts)}")
+    print(f"LLM calls: {llm}/{args.count} ({100 * llm / args.count:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
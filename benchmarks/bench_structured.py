@@ -0,0 +1,155 @@
+"""Full-answer parsing with re-runs against streaming with tail retries.
+
+Sends ``--calls`` prompts, cycling through the six JSON stages of the chain,
+to the fake Anthropic server. A ``--damage-rate`` share of its answers come
+back broken: a stray ``}`` or cut off at ``max_tokens``. Each call runs twice:
+
+1. today: wait for the whole answer, ``\\{[\\s\\S]*\\}`` plus ``json.loads``, and
+   run the whole prompt again when that fails (up to two re-runs);
+2. :class:`~job_automation.structured.StructuredStream`: elements as they
+   close, and only the broken tail generated again.
+
+Reports latency, output tokens and outcome per answer. For "Analyze JD" it
+also reports when the first three ranked skills are available, which is what
+the four branches after "Parse JD Analysis" need.
+
+    python -m benchmarks.bench_structured --calls 120 --latency 1.0 --damage-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from job_automation.fakes import CANNED_RESPONSES, FakeAnthropic
+from job_automation.httpclient import ConnectionPool
+from job_automation.structured import SCHEMAS, MessagesClient, StructuredOutputError, StructuredStream
+
+from .bench_gotenberg import percentile
+from .corpus import FILLER, TECHNOLOGIES
+
+_GREEDY_OBJECT = re.compile(r"\{[\s\S]*\}")
+
+
+def answers() -> Dict[str, Dict[str, Any]]:
+    """Canned answers at realistic length: ten skills, a full cover letter."""
+    payloads = json.loads(json.dumps(CANNED_RESPONSES))
+    payloads["top_10_skills"]["top_10_skills"] = [
+        {"rank": rank, "skill": skill, "category": "technical", "jd_keywords": [skill]}
+        for rank, skill in enumerate(TECHNOLOGIES[:10], 1)
+    ]
+    payloads["impact_sentences"]["impact_sentences"] *= 2
+    letter = "\n\n".join(FILLER.format(title="Data Analyst") for _ in range(6))
+    payloads["cover_letter_text"]["cover_letter_text"] = "Dear Hiring Team,\n\n" + letter + "\n\nSincerely,\nAlex"
+    return payloads
+
+
+def responder(payloads: Dict[str, Dict[str, Any]]):
+    def reply(prompt: str) -> str:
+        for marker, payload in payloads.items():
+            if marker in prompt:
+                return json.dumps(payload, indent=2)
+        return "{}"
+
+    return reply
+
+
+def body(marker: str) -> Dict[str, Any]:
+    return {
+        "model": "claude-sonnet-4-5-20250929",
+        "max_tokens": 2000,
+        "messages": [{"role": "user", "content": f'Return ONLY valid JSON: {{"{marker}": ...}}'}],
+    }
+
+
+def today(pool: ConnectionPool, marker: str, reruns: int = 2) -> Tuple[float, int, int, Optional[Dict[str, Any]]]:
+    """``(seconds, calls, output_tokens, value)``; ``value`` is None if every run failed."""
+    started = time.perf_counter()
+    tokens = 0
+    schema = SCHEMAS[next(name for name, s in SCHEMAS.items() if s.marker == marker)]
+    for attempt in range(1, reruns + 2):
+        response = pool.request("POST", "/v1/messages", json.dumps(body(marker)).encode("utf-8"), {"Content-Type": "application/json"})
+        message = json.loads(response.body)
+        tokens += message["usage"]["output_tokens"]
+        match = _GREEDY_OBJECT.search(message["content"][0]["text"])
+        try:
+            value = json.loads(match.group()) if match else None
+        except ValueError:
+            value = None
+        if value is not None and not schema.missing(value):
+            return time.perf_counter() - started, attempt, tokens, value
+    return time.perf_counter() - started, reruns + 1, tokens, None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM seconds per full answer")
+    parser.add_argument("--damage-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    payloads = answers()
+    markers = [list(payloads)[n % len(payloads)] for n in range(args.calls)]
+    rows: Dict[str, Dict[str, List[float]]] = {"today": {}, "streaming": {}}
+    outcomes: Dict[str, Counter] = {"today": Counter(), "streaming": Counter()}
+    for label in rows:
+        rows[label] = {"seconds": [], "calls": [], "tokens": [], "top3": []}
+
+    # A fresh fake per run, so both see the same damage
+    with FakeAnthropic(args.latency, responder(payloads), damage_rate=args.damage_rate, seed=7) as llm:
+        pool = ConnectionPool(llm.url)
+        for marker in markers:
+            seconds, calls, tokens, value = today(pool, marker)
+            row = rows["today"]
+            row["seconds"].append(seconds)
+            row["calls"].append(calls)
+            row["tokens"].append(tokens)
+            if marker == "top_10_skills" and value is not None:
+                row["top3"].append(seconds)
+            outcomes["today"][_outcome(value, payloads[marker])] += 1
+        pool.close()
+
+    with FakeAnthropic(args.latency, responder(payloads), damage_rate=args.damage_rate, seed=7) as llm:
+        client = MessagesClient(llm.url)
+        for marker in markers:
+            stream = StructuredStream(client, body(marker))
+            started = time.perf_counter()
+            tokens_before = client.usage["output_tokens"]
+            requests_before = llm.requests
+            row = rows["streaming"]
+            try:
+                for event in stream:
+                    if event.path == ("top_10_skills", 2):
+                        row["top3"].append(event.at)
+                value: Optional[Dict[str, Any]] = stream.result.value
+            except StructuredOutputError:
+                value = None
+            row["calls"].append(llm.requests - requests_before)
+            row["seconds"].append(time.perf_counter() - started)
+            row["tokens"].append(client.usage["output_tokens"] - tokens_before)
+            outcomes["streaming"][_outcome(value, payloads[marker])] += 1
+        client.close()
+
+    print(f"{args.calls} answers, {args.latency:.1f}s each, {args.damage_rate:.0%} damaged")
+    for label, row in rows.items():
+        top3 = f"top-3 skills at p50 {percentile(row['top3'], 50):5.2f}s" if row["top3"] else "no top-3 skills"
+        print(
+            f"{label:<10} p50 {percentile(row['seconds'], 50):5.2f}s p95 {percentile(row['seconds'], 95):5.2f}s  "
+            f"{sum(row['calls']) / len(row['calls']):4.2f} calls/answer  "
+            f"{sum(row['tokens']) / len(row['tokens']):6.1f} output tokens/answer  {top3}  {dict(outcomes[label])}"
+        )
+
+
+def _outcome(value: Optional[Dict[str, Any]], expected: Dict[str, Any]) -> str:
+    if value is None:
+        return "failed"
+    # A stray "}" inside a nested object can still parse; no parser sees that
+    return "ok" if value == expected else "valid, shifted"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Trace analysis speed and replayed wall time per pipeline shape.
+
+Builds ``--apps`` synthetic execution exports by walking the real
+``cover-letter-generator.json`` and ``jd-resume-generator.json`` graphs in
+n8n's v1 order (one node at a time, branch after branch). LLM latency follows
+the token counts, with three projects per JD for the "Write Impact" fan-out.
+The exports are analysed and the report printed. Then ``--replay`` of them
+are replayed against the fake LLM and Gotenberg, scaled by ``--scale``, once
+per shape: as recorded, with overlapping branches, and with concurrent
+fan-out too.
+
+    python -m benchmarks.bench_tracing --apps 200 --replay 8 --scale 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from job_automation.fakes import FakeAnthropic, FakeGotenberg
+from job_automation.tracing import SHAPES, Replayer, load_applications, print_report, summarize
+
+WORKFLOWS = Path(__file__).resolve().parent.parent / "n8n-workflows"
+
+# (input tokens, output tokens, marker of the canned answer) per agent item
+AGENTS = {
+    "AI Agent - Analyze JD": (2600, 650, "top_10_skills"),
+    "AI - Extract Master Courses": (2200, 120, "selected_courses"),
+    "AI - Extract Bachelor Courses": (2400, 120, "selected_courses"),
+    "AI - Extract Skills": (1900, 320, "skills_by_category"),
+    "AI - Select Top 3 Projects": (5200, 260, "selected_projects"),
+    "AI - Write Impact for Project": (1400, 230, "impact_sentences"),
+    "AI Agent - Write Cover Letter": (4200, 1500, "cover_letter_text"),
+}
+PROJECTS = 3
+
+
+def _iso(ms: float) -> str:
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _run(start: float, seconds: float, source: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "startTime": int(start),
+        "executionTime": int(seconds * 1000),
+        "executionStatus": "success",
+        "source": [{"previousNode": name} for name in source],
+        "data": data,
+    }
+
+
+def _llm_runs(agent: str, model: str, start: float, items: int, rng: random.Random) -> Tuple[List[Dict[str, Any]], float]:
+    prompt_tokens, completion_tokens, marker = AGENTS[agent]
+    runs, clock = [], start
+    for _ in range(items):
+        tokens_in = int(prompt_tokens * rng.uniform(0.8, 1.25))
+        tokens_out = int(completion_tokens * rng.uniform(0.75, 1.3))
+        seconds = 0.4 + tokens_in / 20000 + tokens_out / rng.uniform(55, 75)
+        run = _run(clock, seconds, [agent], {
+            "ai_languageModel": [[{"json": {
+                "response": {"generations": [[{"text": "{}"}]]},
+                "tokenUsage": {"promptTokens": tokens_in, "completionTokens": tokens_out, "totalTokens": tokens_in + tokens_out},
+            }}]]
+        })
+        run["inputOverride"] = {"ai_languageModel": [[{"json": {
+            "messages": [f"Human: answer with {marker} as JSON"],
+            "options": {"model": model, "max_tokens": 2000},
+        }}]]}
+        runs.append(run)
+        clock += seconds * 1000 + 5
+    return runs, clock - start
+
+
+def simulate(
+    workflow: Dict[str, Any],
+    start: float,
+    rng: random.Random,
+    call: Callable[[str, float], Tuple[float, Dict[str, Any]]],
+) -> Tuple[Dict[str, List[Dict[str, Any]]], float]:
+    """``runData`` of one execution in v1 order; returns it and the end time (ms)."""
+    nodes = {n["name"]: n for n in workflow["nodes"]}
+    successors: Dict[str, List[str]] = defaultdict(list)
+    inputs: Dict[str, List[str]] = defaultdict(list)
+    models: Dict[str, Tuple[str, str]] = {}
+    for source, outputs in workflow["connections"].items():
+        for target in (t for group in outputs.get("main", []) for t in group):
+            successors[source].append(target["node"])
+            inputs[target["node"]].append(source)
+        for target in (t for group in outputs.get("ai_languageModel", []) for t in group):
+            models[target["node"]] = (source, nodes[source]["parameters"]["model"]["value"])
+
+    run_data: Dict[str, List[Dict[str, Any]]] = {}
+    items: Dict[str, int] = {}
+    clock = start
+    stack = [n for n in nodes if n not in inputs and n in successors and "lmChat" not in nodes[n]["type"]]
+    while stack:
+        name = stack.pop()
+        if name in run_data or any(i not in run_data for i in inputs[name]):
+            continue
+        kind = nodes[name]["type"].rsplit(".", 1)[-1]
+        count = sum(items[i] for i in inputs[name]) if name.startswith("Parse Impact") else 1
+        extra: Dict[str, Any] = {}
+        if name in models:
+            count = max(1, sum(items[i] for i in inputs[name]))
+            lm, model = models[name]
+            run_data[lm], seconds = _llm_runs(name, model, clock + 20, count, rng)
+            seconds = seconds / 1000 + 0.04
+        elif kind == "executeWorkflow":
+            seconds, extra = call(name, clock + 5)
+        elif kind == "httpRequest":
+            seconds = rng.uniform(1.0, 2.2)
+        elif kind in ("readWriteFile", "writeBinaryFile"):
+            seconds = rng.uniform(0.005, 0.02)
+        elif kind == "code":
+            seconds = rng.uniform(0.003, 0.03)
+        else:
+            seconds = rng.uniform(0.001, 0.003)
+        if name == "Parse Selected Projects":
+            count = PROJECTS
+        items[name] = count
+        run = _run(clock, seconds, inputs[name], {"main": [[{"json": {}}] * count]})
+        run.update(extra)
+        run_data[name] = [run]
+        clock += seconds * 1000 + 2
+        stack.extend(reversed(successors[name]))
+    return run_data, clock
+
+
+def executions(count: int, seed: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    parent_flow = json.loads((WORKFLOWS / "cover-letter-generator.json").read_text(encoding="utf-8"))
+    child_flow = json.loads((WORKFLOWS / "jd-resume-generator.json").read_text(encoding="utf-8"))
+    child_flow = dict(child_flow, name="Resume Generator", id="AWv5m9jqUOnkHyG-3gWzr")
+    out: List[Dict[str, Any]] = []
+    clock = 1_760_000_000_000.0
+    for n in range(count):
+        parent_id, child_id = str(2 * n + 1000), str(2 * n + 1001)
+
+        def call(node: str, start: float) -> Tuple[float, Dict[str, Any]]:
+            run_data, end = simulate(child_flow, start, rng, call)
+            out.append(execution(child_id, child_flow, run_data, start, end, parent_id))
+            return (end - start) / 1000 + 0.04, {"metadata": {"subExecution": {"executionId": child_id, "workflowId": child_flow["id"]}}}
+
+        run_data, end = simulate(parent_flow, clock, rng, call)
+        out.append(execution(parent_id, parent_flow, run_data, clock, end))
+        clock = end + rng.uniform(1000, 60000)
+    return out
+
+
+def execution(
+    execution_id: str, workflow: Dict[str, Any], run_data: Dict[str, Any], start: float, end: float, parent: str = ""
+) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"resultData": {"runData": run_data, "lastNodeExecuted": list(run_data)[-1]}}
+    if parent:
+        data["parentExecution"] = {"executionId": parent}
+    return {
+        "id": execution_id,
+        "finished": True,
+        "mode": "integrated" if parent else "webhook",
+        "status": "success",
+        "startedAt": _iso(start),
+        "stoppedAt": _iso(end),
+        "workflowId": workflow.get("id", ""),
+        "workflowData": {k: workflow.get(k) for k in ("id", "name", "nodes", "connections")},
+        "data": data,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--replay", type=int, default=8, help="applications to replay per shape")
+    parser.add_argument("--scale", type=float, default=0.02)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "executions.json"
+        path.write_text(json.dumps({"data": executions(args.apps)}), encoding="utf-8")
+        started = time.perf_counter()
+        apps = load_applications([path])
+        summary = summarize(apps)
+        elapsed = time.perf_counter() - started
+        megabytes = path.stat().st_size / 1e6
+    print(f"analysed {len(apps)} applications ({megabytes:.1f} MB of exports) in {elapsed:.2f}s\n")
+    print_report(summary)
+
+    print()
+    sample = apps[: args.replay]
+    with FakeAnthropic() as llm, FakeGotenberg() as gotenberg:
+        for shape in SHAPES:
+            replayer = Replayer(llm.url, gotenberg.url, scale=args.scale, shape=shape)
+            try:
+                result = asyncio.run(replayer.run(sample))
+            finally:
+                replayer.close()
+            print(
+                f"replay {shape:<8}: p50 {result.p50:6.1f}s p95 {result.p95:6.1f}s "
+                f"(predicted {result.predicted_p50:6.1f}s, recorded {result.recorded_p50:6.1f}s), "
+                f"{result.llm_calls} LLM calls, {result.renders} renders, {result.errors} errors, "
+                f"{result.seconds:.1f}s real"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Tracker update cost against the number of applications.
+
+For each size the store is filled with ``N`` synthetic applications and
+exported once. Then ``--rounds`` update batches run: ``--changes`` status
+changes on random rows plus ``--new`` postings (half of them re-posts of
+existing URLs with tracking parameters). Each batch is timed as store upsert
+plus incremental xlsx export.
+
+With ``openpyxl`` installed, the same batches go through today's flow for
+sizes up to ``--baseline-max``: load the workbook, edit and append cells,
+copy a backup, save.
+
+    python -m benchmarks.bench_tracker --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from job_automation.tracker import COLUMNS, ApplicationStore
+
+from .bench_gotenberg import percentile
+from .corpus import COMPANIES, FILLER, LOCATIONS, TITLES
+
+STATUSES = ["New", "PASS", "REJECT", "ERROR", "Applied"]
+
+
+def postings(start: int, count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    for n in range(start, start + count):
+        title = rng.choice(TITLES)
+        yield {
+            "jobUrl": f"https://jobs.example.com/req/{n}",
+            "jobTitle": title,
+            "companyName": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "salaryRange": f"${rng.randint(50, 90)},000 - ${rng.randint(90, 130)},000 CAD",
+            "jobDescription": f"Req {n}. " + FILLER.format(title=title) * 3,
+            "status": rng.choice(STATUSES),
+        }
+
+
+def batch(size: int, top: int, changes: int, new: int, rng: random.Random) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = [
+        {"jobUrl": f"https://jobs.example.com/req/{rng.randrange(size)}", "status": rng.choice(STATUSES)}
+        for _ in range(changes)
+    ]
+    records += postings(top, new - new // 2, rng)
+    records += [
+        {"jobUrl": f"https://jobs.example.com/req/{rng.randrange(size)}/?utm_source=linkedin", "notes": "re-posted"}
+        for _ in range(new // 2)
+    ]
+    return records
+
+
+def openpyxl_update(path: Path, records: List[Dict[str, Any]], rows: Dict[str, int]) -> float:
+    """Today's tracker flow: load, edit, append, back up and save the whole workbook."""
+    from openpyxl import load_workbook
+    from openpyxl.styles import PatternFill
+
+    fills = {"PASS": "FFC6EFCE", "REJECT": "FFFFC7CE", "ERROR": "FFFFEB9C"}
+    fields = [c.field for c in COLUMNS]
+    started = time.perf_counter()
+    workbook = load_workbook(path)
+    sheet = workbook.active
+    for record in records:
+        url = record["jobUrl"].split("/?")[0]
+        if url in rows:
+            row = rows[url]
+            for field, value in record.items():
+                if field in fields and field != "jobUrl":
+                    sheet.cell(row, fields.index(field) + 1, value)
+        else:
+            sheet.append([record.get(field, "") for field in fields])
+            row = rows[url] = sheet.max_row
+        status = str(sheet.cell(row, fields.index("status") + 1).value or "").upper()
+        if status in fills:
+            fill = PatternFill("solid", fgColor=fills[status])
+            for column in range(1, len(fields) + 1):
+                sheet.cell(row, column).fill = fill
+    shutil.copy(path, path.with_name(path.stem + ".backup.xlsx"))
+    workbook.save(path)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--changes", type=int, default=20, help="status changes per batch")
+    parser.add_argument("--new", type=int, default=10, help="new postings per batch (half are re-posts)")
+    parser.add_argument("--baseline-max", type=int, default=10000, help="largest size for the openpyxl flow")
+    args = parser.parse_args()
+
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        args.baseline_max = 0
+        print("openpyxl not installed: skipping the full-rewrite baseline")
+
+    for size in args.sizes:
+        rng = random.Random(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ApplicationStore(Path(tmp) / "tracker.sqlite")
+            workbook = Path(tmp) / "job-applications.xlsx"
+            started = time.perf_counter()
+            generated = postings(0, size, rng)
+            for _ in range(0, size, 5000):
+                store.add(record for _, record in zip(range(5000), generated))
+            loaded = time.perf_counter() - started
+            initial = store.export(workbook)
+            print(
+                f"{size:>7} rows: load {loaded:6.2f}s, first export {initial.seconds:6.2f}s, "
+                f"{initial.bytes / 1e6:5.1f} MB in {initial.blocks} blocks"
+            )
+
+            upserts, exports, totals, rendered = [], [], [], 0
+            top = size
+            for _ in range(args.rounds):
+                records = batch(size, top, args.changes, args.new, rng)
+                top += args.new - args.new // 2
+                started = time.perf_counter()
+                store.add(records)
+                upserted = time.perf_counter()
+                stats = store.export(workbook)
+                upserts.append(upserted - started)
+                exports.append(stats.seconds)
+                totals.append(time.perf_counter() - started)
+                rendered += stats.rendered
+            print(
+                f"{'':>7}   store batch: upsert p50 {percentile(upserts, 50) * 1e3:6.1f}ms, "
+                f"export p50 {percentile(exports, 50) * 1e3:6.1f}ms, "
+                f"total p50 {percentile(totals, 50) * 1e3:6.1f}ms p95 {percentile(totals, 95) * 1e3:6.1f}ms "
+                f"({rendered / args.rounds:.1f} blocks re-rendered per batch)"
+            )
+            store.close()
+
+            if size <= args.baseline_max:
+                rows = {f"https://jobs.example.com/req/{n}": n + 2 for n in range(size)}
+                seconds = [
+                    openpyxl_update(workbook, batch(size, top + 1000 * i, args.changes, args.new, rng), rows)
+                    for i in range(min(args.rounds, 5))
+                ]
+                print(f"{'':>7}   openpyxl rewrite + backup: p50 {percentile(seconds, 50) * 1e3:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
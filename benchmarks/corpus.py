@@ -0,0 +1,129 @@
+"""Synthetic JD corpus in the ``examples/sample-jd.json`` shape, plus a
+synthetic n8n data directory of candidate materials."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+TITLES = [
+    "Data Analyst",
+    "Business Intelligence Analyst",
+    "Junior Data Scientist",
+    "Sales Development Representative",
+    "Reporting Analyst",
+    "Machine Learning Engineer",
+    "Financial Analyst",
+]
+COMPANIES = ["Acme Corporation", "Northwind Inc.", "Maple Analytics", "Beta Ltd.", "Lakeshore Bank"]
+LOCATIONS = [
+    "Toronto, ON (Hybrid)",
+    "Mississauga, ON",
+    "Remote (Canada)",
+    "Remote",
+    "Vancouver, BC",
+    "Montreal, QC (Hybrid)",
+    "",
+]
+REQUIRED = [
+    "Bachelor's degree in Statistics, Mathematics, or related field",
+    "{years}+ years of experience in data analysis",
+    "Strong SQL and Python skills",
+    "Experience with data visualization tools (Tableau, Power BI)",
+    "Excellent communication and stakeholder management",
+    "PhD in Computer Science or a related discipline",
+    "Comfortable with cold calling and prospecting new accounts",
+]
+PREFERRED = [
+    "Master's degree in Data Science or related field",
+    "Experience with machine learning",
+    "Knowledge of cloud platforms (AWS, Azure, GCP)",
+    "PhD is an asset",
+]
+FILLER = (
+    "We are seeking a talented {title} to join our growing team. You will work "
+    "with cross-functional partners to turn data into decisions, build reports "
+    "and automate recurring analysis. Our culture values curiosity, ownership "
+    "and continuous learning. "
+)
+
+
+def synthetic_jds(count: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` reproducible JDs covering every pre-filter outcome."""
+    rng = random.Random(seed)
+    for index in range(count):
+        title = rng.choice(TITLES)
+        required = [
+            line.format(years=rng.choice([1, 2, 3, 5, 7, 10]))
+            for line in rng.sample(REQUIRED, k=rng.randint(2, 4))
+        ]
+        yield {
+            "position": title,
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "posted_date": "2026-02-10",
+            "job_url": f"https://example.com/careers/{index}",
+            "description": FILLER.format(title=title) * rng.randint(2, 6),
+            "responsibilities": [
+                "Analyze large datasets to identify trends and insights",
+                "Build and maintain dashboards and reports",
+                "Present findings to stakeholders",
+            ],
+            "requirements": {
+                "required": required,
+                "preferred": rng.sample(PREFERRED, k=2),
+            },
+            "salary_range": f"${rng.randint(50, 90)},000 - ${rng.randint(90, 130)},000 CAD",
+            "benefits": ["Health and dental insurance", "RRSP matching"],
+        }
+
+
+TECHNOLOGIES = [
+    "Python", "SQL", "Tableau", "Power BI", "pandas", "scikit-learn", "TensorFlow",
+    "PyTorch", "Spark", "Airflow", "dbt", "Snowflake", "AWS", "Azure", "Docker",
+    "Kubernetes", "Excel", "R", "Looker", "Kafka", "PostgreSQL", "MongoDB",
+    "FastAPI", "React", "Git", "A/B testing", "time series forecasting",
+    "natural language processing", "computer vision", "regression", "clustering",
+]
+OUTCOMES = [
+    "cut reporting time by {n}%",
+    "improved forecast accuracy by {n}%",
+    "processed {n}K records per day",
+    "served {n} weekly active users",
+    "reduced churn by {n}%",
+]
+COURSES = [
+    "Machine Learning", "Data Mining", "Statistical Learning", "Database Systems",
+    "Big Data Analytics", "Data Visualization", "Time Series Analysis",
+    "Optimization", "Deep Learning", "Natural Language Processing",
+    "Cloud Computing", "Econometrics", "Stochastic Calculus", "Linear Algebra",
+    "Probability Theory", "Financial Mathematics", "Algorithms", "Operating Systems",
+]
+
+
+def synthetic_materials(directory: Path, projects: int, seed: int = 7) -> None:
+    """Write a data directory in the layout ``jd-resume-generator.json`` reads."""
+    rng = random.Random(seed)
+    (directory / "relevant_project").mkdir(parents=True, exist_ok=True)
+    for index in range(projects):
+        stack = rng.sample(TECHNOLOGIES, k=4)
+        bullets = "\n".join(
+            f"- Used {tech} to build the {rng.choice(['pipeline', 'model', 'dashboard', 'service'])} "
+            f"and {rng.choice(OUTCOMES).format(n=rng.randint(5, 90))}"
+            for tech in stack
+        )
+        (directory / "relevant_project" / f"project-{index:04d}.md").write_text(
+            f"# Project {index}: {stack[0]} {rng.choice(['Analytics', 'Platform', 'Forecasting', 'Insights'])}\n"
+            f"Date: {rng.choice(['Jan', 'May', 'Sep'])} {rng.randint(2019, 2025)}\n"
+            f"Technologies: {', '.join(stack)}\n\n{bullets}\n",
+            encoding="utf-8",
+        )
+    for name, count in (("edu_master_course.md", 12), ("edu_bech_course.md", 16)):
+        lines = [f"- {course}: {', '.join(rng.sample(TECHNOLOGIES, k=2))}" for course in rng.sample(COURSES, k=count)]
+        (directory / name).write_text("# Courses\n" + "\n".join(lines) + "\n", encoding="utf-8")
+    categories = ["Languages", "Data & BI", "ML", "Cloud & DevOps"]
+    skills = "\n".join(
+        f"## {category}\n" + "\n".join(f"- {tech}" for tech in rng.sample(TECHNOLOGIES, k=8)) for category in categories
+    )
+    (directory / "relevant_skills.md").write_text(skills + "\n", encoding="utf-8")
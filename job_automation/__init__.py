@@ -0,0 +1,12 @@
+"""Python helpers for the job automation toolkit.
+
+The Claude skills and n8n workflows do the orchestration; the modules in this
+package take over the deterministic, high-volume parts of the pipeline so that
+fewer JDs have to go through an LLM or a Chromium render.
+
+Modules are meant to be run directly, e.g.::
+
+    python -m job_automation.prefilter --criteria examples/filter-criteria.yaml jds.jsonl
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,38 @@
+"""Helpers for Anthropic Messages API payloads."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Tuple
+
+
+def prompt_text(body: Dict[str, Any]) -> str:
+    """Concatenate the system prompt and every text block of a messages request."""
+    parts = []
+    system = body.get("system")
+    if isinstance(system, str):
+        parts.append(system)
+    elif isinstance(system, list):
+        parts.extend(block.get("text", "") for block in system)
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content or [])
+    return "\n".join(parts)
+
+
+def sse_events(stream: BinaryIO) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """``(event, data)`` pairs of a ``"stream": true`` response, as they arrive."""
+    event, data = "", []
+    for raw in iter(stream.readline, b""):
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            payload = json.loads("\n".join(data))
+            yield event or payload.get("type", ""), payload
+            event, data = "", []
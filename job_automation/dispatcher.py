@@ -0,0 +1,490 @@
+"""Resumable, adaptive batch dispatcher for the ``cover-letter-generator`` webhook.
+
+``/job-processor`` posts ``{"jobDescription": ..., "key": N}`` one JD at a time
+and sleeps ``BATCH_PROCESSING_DELAY`` between calls; each call makes n8n write
+``N-R.pdf`` and ``N-CL.pdf``. This dispatcher keeps the batch in a SQLite queue
+and drives the webhook concurrently:
+
+* Jobs move through ``pending`` -> ``in_flight`` -> ``done``/``failed``.
+  Enqueueing is idempotent on ``key`` plus the JD hash; a changed JD for an
+  existing key is queued again, unless that key is already done. Records
+  without a key reuse the key of an identical JD or get the next free number,
+  so a second input file never lands on the keys of the first.
+* Concurrency adapts with AIMD: +1 slot per window of successes, halved on an
+  error, a timeout or a latency well above the observed baseline.
+* A token bucket caps the request rate.
+* After a crash, ``in_flight`` jobs return to ``pending``, and keys whose PDFs
+  already exist are marked done without calling the webhook again.
+
+Usage::
+
+    python -m job_automation.dispatcher run output/jds.jsonl --pdf-dir ~/.n8n-files/data
+    python -m job_automation.dispatcher status
+    python -m job_automation.dispatcher retry
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+from .httpclient import ConnectionPool
+from .records import iter_records, job_description
+
+DEFAULT_URL = os.environ.get("N8N_WEBHOOK_URL", "http://localhost:5678/webhook/cover-letter-generator")
+DEFAULT_DB = Path(".cache/dispatch.sqlite")
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("MAX_CONCURRENT_AGENTS", "5"))
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    jd_hash TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    pdf_after REAL NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,
+    latency REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, not_before, seq);
+CREATE INDEX IF NOT EXISTS jobs_jd ON jobs (jd_hash);
+"""
+
+# Timeouts and connection failures are OSErrors
+_NETWORK_ERRORS = (OSError, http.client.HTTPException)
+
+
+@dataclass
+class Job:
+    key: str
+    job_description: str
+    attempts: int
+    pdf_after: float
+
+
+class JobQueue:
+    """Durable job states in SQLite; one writer (the dispatcher's event loop)."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def enqueue(self, items: Iterable[Tuple[Optional[str], str]], force: bool = False) -> Counter:
+        """Add ``(key, job_description)`` pairs; returns added/unchanged/replaced/kept counts.
+
+        A ``None`` key reuses the key of a queued job with the same JD, or
+        takes the number after the highest numeric key. A replaced JD keeps
+        the key but only accepts PDFs written after now, so files rendered for
+        the old JD are not mistaken for the new ones. A ``done`` job is only
+        replaced with ``force``; otherwise it is counted as kept.
+        """
+        outcomes: Counter = Counter()
+        now = time.time()
+        with self._transaction():
+            (seq,) = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM jobs").fetchone()
+            number = max((int(k) for (k,) in self._db.execute("SELECT key FROM jobs") if k.isdigit()), default=0)
+            for key, text in items:
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if key is None:
+                    row = self._db.execute(
+                        "SELECT key FROM jobs WHERE jd_hash = ? ORDER BY seq LIMIT 1", (digest,)
+                    ).fetchone()
+                    key = row[0] if row else str(number + 1)
+                if key.isdigit():
+                    number = max(number, int(key))
+                row = self._db.execute("SELECT jd_hash, state FROM jobs WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    seq += 1
+                    self._db.execute(
+                        "INSERT INTO jobs (key, seq, jd_hash, job_description, state, updated)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, seq, digest, text, PENDING, now),
+                    )
+                    outcomes["added"] += 1
+                elif row[0] == digest:
+                    outcomes["unchanged"] += 1
+                elif row[1] == DONE and not force:
+                    outcomes["kept"] += 1
+                else:
+                    self._db.execute(
+                        "UPDATE jobs SET jd_hash = ?, job_description = ?, state = ?, attempts = 0,"
+                        " not_before = 0, pdf_after = ?, updated = ?, error = NULL WHERE key = ?",
+                        (digest, text, PENDING, now, now, key),
+                    )
+                    outcomes["replaced"] += 1
+        return outcomes
+
+    def recover(self) -> int:
+        """Return jobs left ``in_flight`` by a crashed run to ``pending``."""
+        cursor = self._db.execute(
+            "UPDATE jobs SET state = ?, updated = ? WHERE state = ?", (PENDING, time.time(), IN_FLIGHT)
+        )
+        return cursor.rowcount
+
+    def claim(self) -> Optional[Job]:
+        """Move the oldest ready job to ``in_flight`` and return it."""
+        now = time.time()
+        with self._transaction():
+            row = self._db.execute(
+                "SELECT key, job_description, attempts, pdf_after FROM jobs"
+                " WHERE state = ? AND not_before <= ? ORDER BY seq LIMIT 1",
+                (PENDING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, updated = ? WHERE key = ?",
+                (IN_FLIGHT, now, row[0]),
+            )
+        return Job(row[0], row[1], row[2] + 1, row[3])
+
+    def complete(self, key: str, latency: Optional[float], note: Optional[str] = None) -> None:
+        self._db.execute(
+            "UPDATE jobs SET state = ?, latency = ?, error = ?, updated = ? WHERE key = ?",
+            (DONE, latency, note, time.time(), key),
+        )
+
+    def fail(self, key: str, error: str, retry_at: Optional[float]) -> None:
+        """Back to ``pending`` until ``retry_at``, or ``failed`` for good."""
+        state = FAILED if retry_at is None else PENDING
+        self._db.execute(
+            "UPDATE jobs SET state = ?, not_before = ?, error = ?, updated = ? WHERE key = ?",
+            (state, retry_at or 0, error[:500], time.time(), key),
+        )
+
+    def next_ready(self) -> Optional[float]:
+        """Earliest ``not_before`` of the pending jobs, ``None`` if there are none."""
+        (value,) = self._db.execute(
+            "SELECT MIN(not_before) FROM jobs WHERE state = ?", (PENDING,)
+        ).fetchone()
+        return value
+
+    def retry_failed(self) -> int:
+        cursor = self._db.execute(
+            "UPDATE jobs SET state = ?, attempts = 0, not_before = 0, updated = ? WHERE state = ?",
+            (PENDING, time.time(), FAILED),
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        counts = {state: 0 for state in (PENDING, IN_FLIGHT, DONE, FAILED)}
+        counts.update(self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return counts
+
+    def failures(self) -> Sequence[Tuple[str, int, str]]:
+        return self._db.execute(
+            "SELECT key, attempts, error FROM jobs WHERE state = ? ORDER BY seq", (FAILED,)
+        ).fetchall()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+
+class TokenBucket:
+    """At most ``rate`` acquisitions per second on average, ``burst`` at once.
+
+    ``rate <= 0`` disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Every success adds ``increase / limit`` (about +1 per window of ``limit``
+    calls). An error, or a latency above ``tolerance`` times the fastest
+    recent call, multiplies the limit by ``decrease``, at most once per
+    window: calls that started before the last cut do not cut again.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2,
+        minimum: int = 1,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        window: int = 50,
+    ):
+        self.minimum, self.maximum = minimum, maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.increase, self.decrease, self.tolerance = increase, decrease, tolerance
+        self._recent: deque = deque(maxlen=window)
+        self._last_cut = float("-inf")
+        self.cuts = 0
+        self.peak = self.limit
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def on_success(self, latency: float, started: float) -> None:
+        baseline = min(self._recent) if len(self._recent) >= 5 else None
+        self._recent.append(latency)
+        if baseline is not None and latency > self.tolerance * baseline:
+            self._cut(started)
+            return
+        self.limit = min(float(self.maximum), self.limit + self.increase / self.limit)
+        self.peak = max(self.peak, self.limit)
+
+    def on_error(self, started: float) -> None:
+        self._cut(started)
+
+    def _cut(self, started: float) -> None:
+        if started < self._last_cut:
+            return
+        self.limit = max(float(self.minimum), self.limit * self.decrease)
+        self._last_cut = time.monotonic()
+        self.cuts += 1
+
+
+@dataclass
+class DispatchSummary:
+    done: int = 0
+    skipped: int = 0  # PDFs already on disk
+    retried: int = 0
+    failed: int = 0
+    recovered: int = 0
+    seconds: float = 0.0
+    peak_concurrency: int = 0
+    limit_cuts: int = 0
+
+
+class Dispatcher:
+    """Drain a :class:`JobQueue` into the webhook."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        url: str = DEFAULT_URL,
+        pdf_dir: Optional[Path] = None,
+        limiter: Optional[AIMDLimiter] = None,
+        bucket: Optional[TokenBucket] = None,
+        max_attempts: int = 3,
+        backoff: float = 30.0,
+        timeout: float = 900.0,
+        on_result: Optional[Callable[[str, str, float, str], None]] = None,
+    ):
+        self.queue = queue
+        self.pdf_dir = Path(pdf_dir) if pdf_dir else None
+        self.limiter = limiter or AIMDLimiter()
+        self.bucket = bucket or TokenBucket(0)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.on_result = on_result
+        self.pool = ConnectionPool(url, size=self.limiter.maximum, timeout=timeout)
+        self._executor = ThreadPoolExecutor(max_workers=self.limiter.maximum)
+        self._active = 0
+
+    def pdf_paths(self, key: str) -> Tuple[Path, Path]:
+        assert self.pdf_dir is not None
+        return self.pdf_dir / f"{key}-R.pdf", self.pdf_dir / f"{key}-CL.pdf"
+
+    def pdfs_exist(self, job: Job) -> bool:
+        if self.pdf_dir is None:
+            return False
+        return all(p.exists() and p.stat().st_mtime >= job.pdf_after for p in self.pdf_paths(job.key))
+
+    async def run(self) -> DispatchSummary:
+        """Dispatch until no job is pending; returns what happened."""
+        summary = DispatchSummary(recovered=self.queue.recover())
+        started = time.perf_counter()
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                while len(tasks) < self.limiter.current:
+                    job = self.queue.claim()
+                    if job is None:
+                        break
+                    if self.pdfs_exist(job):
+                        self.queue.complete(job.key, None, "PDFs already exist")
+                        summary.skipped += 1
+                        self._report(job.key, "skipped", 0.0, "")
+                        continue
+                    await self.bucket.acquire()
+                    tasks.add(asyncio.ensure_future(self._send(job, summary)))
+                summary.peak_concurrency = max(summary.peak_concurrency, len(tasks))
+
+                ready = self.queue.next_ready()
+                if not tasks:
+                    if ready is None:
+                        break
+                    await asyncio.sleep(max(0.0, ready - time.time()))
+                    continue
+                # With free slots, wake up when the next backed-off job is due
+                full = len(tasks) >= self.limiter.current
+                wait_for = None if ready is None or full else max(0.05, ready - time.time())
+                _, tasks = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # A cancelled run leaves its jobs in_flight, exactly like a crash
+            self._executor.shutdown(wait=False)
+        summary.seconds = time.perf_counter() - started
+        summary.limit_cuts = self.limiter.cuts
+        return summary
+
+    async def _send(self, job: Job, summary: DispatchSummary) -> None:
+        key = int(job.key) if job.key.isdigit() else job.key
+        body = json.dumps({"jobDescription": job.job_description, "key": key}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        status, error = 0, ""
+        try:
+            response = await loop.run_in_executor(
+                self._executor, self.pool.request, "POST", "", body, headers
+            )
+            status = response.status
+            if not response.ok:
+                error = f"HTTP {status}: {response.body[:200].decode('utf-8', 'replace')}"
+            elif self.pdf_dir is not None and not self.pdfs_exist(job):
+                error = "webhook answered but the PDFs were not written"
+        except _NETWORK_ERRORS as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        latency = time.monotonic() - started
+
+        if not error:
+            self.limiter.on_success(latency, started)
+            self.queue.complete(job.key, latency)
+            summary.done += 1
+            self._report(job.key, DONE, latency, "")
+            return
+
+        # 4xx other than 408/429 is a bad request, not load: no retry, no cut
+        permanent = 400 <= status < 500 and status not in (408, 429)
+        if not permanent:
+            self.limiter.on_error(started)
+        if permanent or job.attempts >= self.max_attempts:
+            self.queue.fail(job.key, error, None)
+            summary.failed += 1
+            self._report(job.key, FAILED, latency, error)
+        else:
+            delay = self.backoff * 2 ** (job.attempts - 1) * (0.5 + random.random())
+            self.queue.fail(job.key, error, time.time() + delay)
+            summary.retried += 1
+            self._report(job.key, "retry", latency, error)
+
+    def _report(self, key: str, outcome: str, latency: float, error: str) -> None:
+        if self.on_result:
+            self.on_result(key, outcome, latency, error)
+
+
+def keyed_jobs(path) -> Iterable[Tuple[Optional[str], str]]:
+    """``(key, jobDescription)`` per record; ``None`` for records without
+    ``key``, which :meth:`JobQueue.enqueue` numbers after the queued keys."""
+    for record in iter_records(path):
+        key = record.get("key")
+        yield (None if key is None else str(key)), job_description(record)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="enqueue JDs (optional) and dispatch everything pending")
+    run.add_argument("inputs", nargs="*", help="JSONL/CSV/JSON records; omit to resume the queue")
+    run.add_argument("--url", default=DEFAULT_URL)
+    run.add_argument("--pdf-dir", help="where n8n writes KEY-R.pdf / KEY-CL.pdf (enables skip and verify)")
+    run.add_argument("--initial-concurrency", type=float, default=2)
+    run.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    run.add_argument("--rate", type=float, default=1.0, help="max webhook calls per second (0: unlimited)")
+    run.add_argument("--burst", type=float, default=None, help="token bucket size (default: max concurrency)")
+    run.add_argument("--max-attempts", type=int, default=3)
+    run.add_argument("--backoff", type=float, default=30.0, help="seconds before the first retry")
+    run.add_argument("--timeout", type=float, default=900.0, help="seconds per webhook call")
+    run.add_argument("--force", action="store_true", help="requeue done keys whose JD changed")
+    sub.add_parser("status", help="job counts and failures")
+    sub.add_parser("retry", help="move failed jobs back to pending")
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(args.db)
+    try:
+        if args.command == "retry":
+            print(f"{queue.retry_failed()} job(s) pending again")
+            return 0
+        if args.command == "status":
+            print(json.dumps(queue.counts()))
+            for key, attempts, error in queue.failures():
+                print(f"  {key}: {attempts} attempt(s), {error}")
+            return 0
+
+        for path in args.inputs:
+            print(f"{path}: {dict(queue.enqueue(keyed_jobs(path), args.force))}", file=sys.stderr)
+
+        def progress(key: str, outcome: str, latency: float, error: str) -> None:
+            detail = f" ({error})" if error else ""
+            print(f"{key}: {outcome} in {latency:.1f}s, limit {dispatcher.limiter.current}{detail}", file=sys.stderr)
+
+        dispatcher = Dispatcher(
+            queue,
+            args.url,
+            Path(args.pdf_dir) if args.pdf_dir else None,
+            AIMDLimiter(args.initial_concurrency, maximum=args.max_concurrency),
+            TokenBucket(args.rate, args.burst or args.max_concurrency),
+            max_attempts=args.max_attempts,
+            backoff=args.backoff,
+            timeout=args.timeout,
+            on_result=progress,
+        )
+        summary = asyncio.run(dispatcher.run())
+        print(json.dumps(asdict(summary)))
+        return 1 if summary.failed else 0
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""Local stand-ins for the external services the pipeline talks to.
+
+They let caches, clients and benchmarks run offline with controllable latency.
+Every server binds to ``127.0.0.1`` on a free port and is used as a context
+manager. A request can override the server's latency with an
+``X-Fake-Latency`` header (seconds), which is how recorded executions are
+replayed::
+
+    with FakeAnthropic(latency=0.5) as llm:
+        post(llm.url + "/v1/messages", ...)
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .anthropic import prompt_text
+from .server import BackgroundServer, QuietHandler
+
+# Canned answers keyed on a marker that only appears in the matching prompt of
+# jd-resume-generator.json / cover-letter-generator.json.
+CANNED_RESPONSES = {
+    "top_10_skills": {
+        "top_10_skills": [
+            {"rank": 1, "skill": "SQL", "category": "technical", "jd_keywords": ["SQL"]},
+            {"rank": 2, "skill": "Python", "category": "technical", "jd_keywords": ["Python"]},
+            {"rank": 3, "skill": "Tableau", "category": "technical", "jd_keywords": ["Tableau"]},
+            {"rank": 4, "skill": "Stakeholder management", "category": "soft", "jd_keywords": ["stakeholders"]},
+        ],
+        "job_title": "Data Analyst",
+        "company_focus": "Business intelligence",
+    },
+    "selected_courses": {"selected_courses": ["Data Mining", "Statistical Learning"]},
+    "skills_by_category": {
+        "skills_by_category": {"Languages": ["Python", "SQL"], "Tools": ["Tableau", "Git"]}
+    },
+    "selected_projects": {
+        "selected_projects": [
+            {"file_name": "car-price-regression", "matched_skill": "Python", "relevance_reason": "Regression modelling in Python"}
+        ]
+    },
+    "impact_sentences": {
+        "project_title": "Car Price Regression",
+        "original_name": "car-price-regression",
+        "date": "September 2024 - December 2024",
+        "matched_skill": "Python",
+        "impact_sentences": [
+            "Built <b>Python</b> regression pipeline predicting prices within 8% MAE",
+            "Engineered 40 features from 50K listings, lifting R-squared from 0.71 to 0.89",
+        ],
+        "technologies_used": ["Python", "scikit-learn"],
+    },
+    "cover_letter_text": {
+        "cover_letter_text": "Dear Data Analytics Hiring Team,\n\nI'd love to contribute...",
+        "key_points_highlighted": ["SQL", "Python"],
+        "tone_analysis": "warm",
+    },
+}
+
+
+def canned_reply(prompt: str) -> str:
+    """Return the canned JSON answer for a pipeline prompt."""
+    for marker, payload in CANNED_RESPONSES.items():
+        if marker in prompt:
+            return json.dumps(payload)
+    return "{}"
+
+
+# Share of an answer's latency spent before the first token
+FIRST_TOKEN_SHARE = 0.15
+
+
+def _latency(handler: QuietHandler) -> float:
+    header = handler.headers.get("X-Fake-Latency")
+    return float(header) if header else handler.service.latency
+
+
+def _structural_commas(text: str) -> List[int]:
+    """Offsets of the commas outside JSON strings."""
+    positions, in_string, escaped = [], False, False
+    for offset, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            positions.append(offset)
+    return positions
+
+
+class _AnthropicHandler(QuietHandler):
+    def do_POST(self) -> None:
+        body = json.loads(self.read_body() or b"{}")
+        number = self.service.count_request()
+        latency = _latency(self)
+        prompt = prompt_text(body)
+        text = self.service.responder(prompt)
+        length = max(1, len(text))
+        # An assistant turn at the end is a prefill: answer with the rest
+        messages = body.get("messages") or []
+        if messages and messages[-1].get("role") == "assistant":
+            prefill = prompt_text({"messages": messages[-1:]})
+            if text.startswith(prefill):
+                text = text[len(prefill):]
+        text, stop_reason = self.service.damage(text)
+        # Time to first token, then the rest in proportion to what is sent
+        first = latency * FIRST_TOKEN_SHARE
+        per_char = (latency - first) / length
+        message = {
+            "id": f"msg_fake_{number}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake-model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+        }
+        if not body.get("stream"):
+            time.sleep(first + per_char * len(text))
+            self.send_json(200, message)
+            return
+        try:
+            self._stream(message, text, first, per_char)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading
+            self.close_connection = True
+
+    def _stream(self, message: Dict[str, Any], text: str, first: float, per_char: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        usage = message["usage"]
+        start = dict(message, content=[], stop_reason=None, usage=dict(usage, output_tokens=0))
+        self._event("message_start", {"type": "message_start", "message": start})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        time.sleep(first)
+        size = self.service.chunk_chars
+        for offset in range(0, len(text), size):
+            chunk = text[offset:offset + size]
+            time.sleep(per_char * len(chunk))
+            delta = {"type": "text_delta", "text": chunk}
+            self._event("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": delta})
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event(
+            "message_delta",
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                "usage": {"output_tokens": usage["output_tokens"]},
+            },
+        )
+        self._event("message_stop", {"type": "message_stop"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _event(self, name: str, payload: Dict[str, Any]) -> None:
+        data = f"event: {name}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+class FakeAnthropic(BackgroundServer):
+    """Stand-in for ``POST /v1/messages`` of the Anthropic API.
+
+    ``responder`` maps the prompt text to the reply text; by default the
+    canned answers of :data:`CANNED_RESPONSES` are used. ``"stream": true``
+    answers with server-sent events in ``chunk_chars`` pieces spread over
+    ``latency``, and an assistant prefill is continued. ``damage_rate`` of the
+    answers come back broken the way model output breaks: a stray ``}``, or
+    cut off at ``max_tokens``.
+    """
+
+    handler_class = _AnthropicHandler
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        responder: Callable[[str], str] = canned_reply,
+        damage_rate: float = 0.0,
+        chunk_chars: int = 16,
+        seed: int = 0,
+    ) -> None:
+        super().__init__()
+        self.latency = latency
+        self.responder = responder
+        self.damage_rate = damage_rate
+        self.chunk_chars = chunk_chars
+        self._random = random.Random(seed)
+
+    def damage(self, text: str) -> Tuple[str, str]:
+        """``(text, stop_reason)``, broken for ``damage_rate`` of the calls."""
+        with self._lock:
+            if not text or self._random.random() >= self.damage_rate:
+                return text, "end_turn"
+            commas = _structural_commas(text)
+            if commas and self._random.random() < 0.5:
+                at = self._random.choice(commas)
+                return text[:at] + "}" + text[at:], "end_turn"
+            return text[: self._random.randrange(len(text) // 4, len(text))], "max_tokens"
+
+
+# A one-page, blank Letter PDF
+FAKE_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+class _GotenbergHandler(QuietHandler):
+    def do_POST(self) -> None:
+        body = self.read_body()
+        self.service.count_request()
+        if self.path != "/forms/chromium/convert/html":
+            self.send_json(404, {"error": "unknown route"})
+            return
+        if b'filename="index.html"' not in body:
+            self.send_bytes(400, b"Invalid form data: no index.html", "text/plain")
+            return
+        with self.service.chromium:
+            time.sleep(_latency(self))
+        if self.service.should_fail():
+            self.send_bytes(503, b"Service Unavailable", "text/plain")
+            return
+        self.send_bytes(200, FAKE_PDF, "application/pdf")
+
+
+class FakeGotenberg(BackgroundServer):
+    """Stand-in for Gotenberg's ``/forms/chromium/convert/html`` route.
+
+    Renders take ``latency`` seconds with at most ``chromium`` running at once
+    (like Gotenberg's Chromium pool); ``failure_rate`` of the requests answer
+    503 so retry logic can be exercised.
+    """
+
+    handler_class = _GotenbergHandler
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        chromium: int = 6,
+        seed: int = 0,
+    ) -> None:
+        super().__init__()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.chromium = threading.BoundedSemaphore(chromium)
+        self._random = random.Random(seed)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+
+class _WebhookHandler(QuietHandler):
+    def do_POST(self) -> None:
+        body = json.loads(self.read_body() or b"{}")
+        self.service.count_request()
+        if not self.path.rstrip("/").endswith("/cover-letter-generator"):
+            self.send_json(404, {"code": 404, "message": "webhook not registered"})
+            return
+        if not body.get("jobDescription"):
+            self.send_json(500, {"message": "Job Description is required"})
+            return
+        key = body.get("key", 0)
+        service = self.service
+        if not service.admit():
+            self.send_json(503, {"message": "too many executions"})
+            return
+        try:
+            service.record_call(key)
+            with service.workers:
+                time.sleep(service.latency * (1 + service.jitter * (2 * service.uniform() - 1)))
+                failed = service.should_fail()
+                if not failed and service.pdf_dir is not None:
+                    for suffix in ("R", "CL"):
+                        (service.pdf_dir / f"{key}-{suffix}.pdf").write_bytes(FAKE_PDF)
+        finally:
+            service.release()
+        if failed:
+            self.send_json(500, {"message": "Workflow execution failed"})
+            return
+        self.send_json(200, {"success": True, "fileName": f"{key}-CL.pdf", "key": key})
+
+
+class FakeWebhook(BackgroundServer):
+    """Stand-in for the ``cover-letter-generator`` n8n webhook.
+
+    Each execution takes ``latency`` seconds (``jitter`` spreads it by that
+    fraction), at most ``workers`` run at once and up to ``queue_limit`` more
+    wait; beyond that the webhook answers 503. ``failure_rate`` of the
+    executions fail with 500. With ``pdf_dir``, successful executions write
+    ``KEY-R.pdf`` and ``KEY-CL.pdf`` there, like the workflow does.
+    """
+
+    handler_class = _WebhookHandler
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        workers: int = 5,
+        queue_limit: int = 5,
+        jitter: float = 0.2,
+        pdf_dir: Optional[Path] = None,
+        seed: int = 0,
+    ) -> None:
+        super().__init__()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.jitter = jitter
+        self.capacity = workers + queue_limit
+        self.workers = threading.BoundedSemaphore(workers)
+        self.pdf_dir = Path(pdf_dir) if pdf_dir else None
+        self.calls: Counter = Counter()
+        self.running = 0
+        self._random = random.Random(seed)
+
+    def admit(self) -> bool:
+        with self._lock:
+            if self.running >= self.capacity:
+                return False
+            self.running += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.running -= 1
+
+    def record_call(self, key: Any) -> None:
+        with self._lock:
+            self.calls[str(key)] += 1
+
+    def uniform(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
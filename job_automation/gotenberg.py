@@ -0,0 +1,234 @@
+"""Pooled, concurrent client for Gotenberg's HTML-to-PDF route.
+
+Every workflow builds its own multipart POST to
+``/forms/chromium/convert/html`` with the same Letter, zero-margin settings,
+and resume and cover letter render one after the other. This client keeps a
+pool of keep-alive connections, renders many documents concurrently through a
+bounded queue, retries 5xx answers and network errors with backoff, and
+streams each PDF straight to disk (no base64 round-trip). A document that
+still fails is reported in its result; the rest of the batch carries on.
+
+Usage::
+
+    python -m job_automation.gotenberg render resume.html -o 1-R.pdf
+    python -m job_automation.gotenberg batch "out/html/*.html" --out-dir out/pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import http.client
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple, Union
+
+from .httpclient import ConnectionPool
+
+DEFAULT_URL = os.environ.get("GOTENBERG_URL", "http://host.docker.internal:3000")
+CONVERT_HTML = "/forms/chromium/convert/html"
+
+# The page settings every workflow sends today
+LETTER_OPTIONS: Dict[str, str] = {
+    "paperWidth": "8.5",
+    "paperHeight": "11",
+    "landscape": "false",
+    "marginTop": "0",
+    "marginBottom": "0",
+    "marginLeft": "0",
+    "marginRight": "0",
+    "printBackground": "true",
+    "scale": "1",
+    "preferCssPageSize": "true",
+}
+
+# Timeouts, refused or reset connections, DNS and routing failures are all
+# OSErrors; any of them fails this document, never the batch
+_RETRYABLE_ERRORS = (OSError, http.client.HTTPException)
+
+
+class RenderError(Exception):
+    """Gotenberg refused the document or kept failing after all retries."""
+
+
+@dataclass
+class RenderJob:
+    html: Union[str, bytes]
+    output: Path
+    key: str = ""
+
+
+@dataclass
+class RenderResult:
+    job: RenderJob
+    ok: bool
+    status: int = 0
+    attempts: int = 0
+    seconds: float = 0.0
+    size: int = 0
+    error: str = ""
+
+
+def multipart_body(html: bytes, options: Dict[str, str]) -> Tuple[bytes, str]:
+    """Encode ``index.html`` plus form fields; returns ``(body, content_type)``."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in options.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="files"; filename="index.html"\r\n'
+        "Content-Type: text/html\r\n\r\n".encode()
+    )
+    parts.append(html)
+    parts.append(f"\r\n--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class GotenbergClient:
+    """Render HTML documents to PDF files through one Gotenberg instance."""
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        concurrency: int = 4,
+        timeout: float = 60.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        options: Optional[Dict[str, str]] = None,
+    ):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.options = dict(LETTER_OPTIONS if options is None else options)
+        self.pool = ConnectionPool(url, size=concurrency, timeout=timeout)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def __enter__(self) -> "GotenbergClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def render(self, html: Union[str, bytes], output, key: str = "") -> RenderResult:
+        """Render one document, raising :class:`RenderError` on failure."""
+        result = self.render_job(RenderJob(html, Path(output), key))
+        if not result.ok:
+            raise RenderError(f"{result.job.output}: {result.error}")
+        return result
+
+    def render_job(self, job: RenderJob) -> RenderResult:
+        """Render one job with retries; failures are reported, not raised."""
+        html = job.html.encode("utf-8") if isinstance(job.html, str) else job.html
+        body, content_type = multipart_body(html, self.options)
+        headers = {"Content-Type": content_type}
+        result = RenderResult(job, ok=False)
+        try:
+            job.output.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+            return result
+
+        started = time.perf_counter()
+        for attempt in range(1, self.retries + 2):
+            result.attempts = attempt
+            fd, tmp = tempfile.mkstemp(dir=job.output.parent, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as sink:
+                    response = self.pool.request("POST", CONVERT_HTML, body, headers, sink=sink)
+                result.status = response.status
+                if response.ok:
+                    os.replace(tmp, job.output)
+                    result.ok, result.size = True, response.streamed
+                    break
+                result.error = response.body.decode("utf-8", "replace")[:200]
+                if response.status < 500 and response.status != 429:
+                    break
+            except _RETRYABLE_ERRORS as exc:
+                result.status, result.error = 0, f"{type(exc).__name__}: {exc}"
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            if attempt <= self.retries:
+                time.sleep(self.backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def render_many(
+        self, jobs: Iterable[RenderJob], queue_size: Optional[int] = None
+    ) -> Iterator[RenderResult]:
+        """Render ``jobs`` concurrently, yielding results as they finish.
+
+        At most ``concurrency`` renders run and ``queue_size`` more wait in the
+        queue; ``jobs`` is only pulled from when a slot frees up, so a long
+        generator of documents is consumed at the pace Gotenberg can take.
+        """
+        limit = self.concurrency + (self.concurrency if queue_size is None else queue_size)
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for job in jobs:
+                while len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from (future.result() for future in done)
+                pending.add(pool.submit(self.render_job, job))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+
+
+def jobs_for(paths: Iterable[str], out_dir: Path) -> Iterator[RenderJob]:
+    """One job per HTML file: ``12-R.html`` renders to ``out_dir/12-R.pdf``."""
+    for path in paths:
+        source = Path(path)
+        yield RenderJob(source.read_bytes(), out_dir / (source.stem + ".pdf"), source.stem)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    sub = parser.add_subparsers(dest="command", required=True)
+    single = sub.add_parser("render", help="render one HTML file")
+    single.add_argument("html")
+    single.add_argument("-o", "--output", required=True)
+    batch = sub.add_parser("batch", help="render many HTML files concurrently")
+    batch.add_argument("patterns", nargs="+", help="HTML files or glob patterns")
+    batch.add_argument("--out-dir", required=True)
+    args = parser.parse_args(argv)
+
+    client = GotenbergClient(
+        args.url, concurrency=args.concurrency, timeout=args.timeout, retries=args.retries
+    )
+    with client:
+        if args.command == "render":
+            result = client.render(Path(args.html).read_bytes(), args.output)
+            print(f"{result.job.output} ({result.size} bytes, {result.seconds:.2f}s)")
+            return 0
+
+        paths = sorted(p for pattern in args.patterns for p in glob.glob(pattern))
+        failed = 0
+        started = time.perf_counter()
+        for result in client.render_many(jobs_for(paths, Path(args.out_dir))):
+            status = "ok" if result.ok else f"FAILED ({result.error})"
+            failed += not result.ok
+            print(f"{result.job.key}: {status} in {result.seconds:.2f}s, {result.attempts} attempt(s)")
+        elapsed = time.perf_counter() - started
+        print(f"{len(paths)} documents in {elapsed:.2f}s, {failed} failed", file=sys.stderr)
+        return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Keep-alive HTTP connection pool on top of ``http.client``.
+
+One pool serves one origin (scheme, host, port). Connections are reused across
+requests and threads; at most ``size`` are open at once, further callers wait.
+"""
+
+from __future__ import annotations
+
+import http.client
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+_CHUNK = 64 * 1024
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    # Bytes written to the ``sink`` passed to :meth:`ConnectionPool.request`
+    streamed: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections to ``url``."""
+
+    def __init__(self, url: str, size: int = 4, timeout: float = 60.0):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self.opened += 1
+            return cls(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        sink: Optional[BinaryIO] = None,
+    ) -> Response:
+        """Send one request and read the whole response.
+
+        With ``sink``, a 2xx body is copied to it in chunks instead of being
+        kept in memory. A request that fails on a reused (possibly stale)
+        keep-alive connection is retried once on a fresh one; other errors
+        propagate.
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            reused = conn.sock is not None
+            response: Optional[Response] = None
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers or {})
+                raw = conn.getresponse()
+                response = Response(
+                    raw.status, {k.lower(): v for k, v in raw.getheaders()}
+                )
+                if sink is not None and response.ok:
+                    while True:
+                        chunk = raw.read(_CHUNK)
+                        if not chunk:
+                            break
+                        sink.write(chunk)
+                        response.streamed += len(chunk)
+                else:
+                    response.body = raw.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self._release(conn, reusable=False)
+                if reused and attempt == 0 and (response is None or not response.streamed):
+                    continue
+                raise
+            except BaseException:
+                self._release(conn, reusable=False)
+                raise
+            self._release(conn, reusable=not raw.will_close)
+            return response
+        raise AssertionError("unreachable")
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send one request and hand out the unread response.
+
+        For bodies that are consumed as they arrive (server-sent events). The
+        connection is reused only if the body was read to the end; leaving
+        the block early closes it.
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            reused = conn.sock is not None
+            try:
+                conn.request(method, self.prefix + path, body=body, headers=headers or {})
+                raw = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self._release(conn, reusable=False)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                self._release(conn, reusable=False)
+                raise
+            try:
+                yield raw
+            except BaseException:
+                self._release(conn, reusable=False)
+                raise
+            self._release(conn, reusable=raw.isclosed() and not raw.will_close)
+            return
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
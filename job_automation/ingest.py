@@ -0,0 +1,700 @@
+"""Streaming ingest of crawled JDs into clean, deduplicated JSONL.
+
+The extraction skills write whole result sets at the end of a crawl, and the
+only structured parsing is the "Extract Info" node of
+``jd-to-excel-workflow.json``, which guesses title, company, location and
+salary from the first ten lines. This module reads postings one line at a
+time and writes one line per posting:
+
+* Fields missing from a record are extracted from its text with a rule set
+  compiled once per process. The rules cover ``position``, ``company``,
+  ``location``, ``salary_range``, and the responsibilities, required,
+  preferred and benefits lists under their headings.
+* ``salary_cad`` holds the salary as a numeric annual CAD range, which the
+  pre-filter checks against ``salary.min_salary``.
+* Records are validated against the field types of ``examples/sample-jd.json``
+  and need a position, a company and some JD text. Failures go to
+  ``--invalid`` with the reasons.
+* Postings seen before, in this run or an earlier one, are dropped. A posting
+  counts as seen when its normalized ``job_url`` or its body hash matches.
+  The seen set is a file of 8-byte fingerprints (:class:`FingerprintSet`) and
+  is not held in memory. It belongs to the output: ``-o out.jsonl`` keeps it
+  in ``out.seen.fpset`` and appends to ``out.jsonl``, and a posting only
+  joins the set once its line has been flushed to the output.
+
+Parsing, extraction and validation run in a process pool on batches of raw
+lines. At most ``2 * workers`` batches are in flight, so memory is the same
+for 500 postings or 500k.
+
+Usage::
+
+    python -m job_automation.ingest crawl.jsonl -o output/jds.jsonl \\
+        --invalid output/invalid.jsonl --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .records import iter_records, url_key
+from .text import tokens
+
+DEFAULT_SCHEMA = Path("examples/sample-jd.json")
+
+OK = "ok"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+
+REQUIRED = ("position", "company")
+BODY_FIELDS = ("description", "responsibilities", "requirements")
+# Raw-text fields used by crawlers and the n8n form
+_TEXT_FIELDS = ("description", "jobDescription", "text", "content", "body")
+
+# Fixed conversion rates to CAD; salaries only need to be compared with a floor
+CAD_RATES = {"CAD": 1.0, "USD": 1.37, "EUR": 1.50, "GBP": 1.75}
+HOURS_PER_YEAR = 2080
+_PERIODS = {"hour": HOURS_PER_YEAR, "day": 260, "week": 52, "month": 12, "year": 1}
+# Abbreviations and French period names
+_PERIOD_NAMES = {
+    "hr": "hour",
+    "h": "hour",
+    "heure": "hour",
+    "jour": "day",
+    "semaine": "week",
+    "mois": "month",
+    "yr": "year",
+    "annum": "year",
+    "année": "year",
+    "an": "year",
+}
+
+
+# -- extraction rules ---------------------------------------------------------
+
+# "Label: value" lines; one alternation so a JD is scanned once for all of them
+_LABEL_FIELDS = {
+    "job title": "position",
+    "position": "position",
+    "role": "position",
+    "title": "position",
+    "company": "company",
+    "company name": "company",
+    "employer": "company",
+    "organization": "company",
+    "organisation": "company",
+    "location": "location",
+    "job location": "location",
+    "work location": "location",
+    "based in": "location",
+    "salary": "salary_range",
+    "salary range": "salary_range",
+    "compensation": "salary_range",
+    "pay": "salary_range",
+    "pay range": "salary_range",
+    "base pay": "salary_range",
+    "posted": "posted_date",
+    "date posted": "posted_date",
+    "posted on": "posted_date",
+}
+_LABEL_LINE = re.compile(
+    r"^[ \t]*(" + "|".join(sorted(_LABEL_FIELDS, key=len, reverse=True)) + r")[ \t]*[:\-–][ \t]*(\S.*?)[ \t]*$",
+    re.I | re.M,
+)
+_TITLE_AT = re.compile(r"^(.{3,80}?)\s+(?:at|@|[-–|])\s+([A-Z][\w&.,' ]{1,60})$")
+_HIRING = re.compile(r"\b([A-Z][\w&.']*(?: [A-Z][\w&.']*){0,4}) is (?:hiring|seeking|looking for)\b")
+_ABOUT = re.compile(r"^about (?!(?:the|this|you|us|our|the role|the team)\b)([A-Z][\w&.,' ]{1,60}?)\s*:?$", re.I | re.M)
+_LEGAL_NAME = re.compile(r"^[A-Z][\w&.,' ]{1,80}\b(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Corporation|Limited|Company)$", re.M)
+_PROVINCES = r"ON|BC|QC|AB|MB|SK|NS|NB|NL|PE|YT|NT|NU|Ontario|British Columbia|Quebec|Alberta|Manitoba|Saskatchewan|Nova Scotia"
+_CITY = re.compile(
+    r"\b((?:[A-Z][a-zé]+[ -]){0,2}[A-Z][a-zé]+, (?:" + _PROVINCES + r"))\b(?:\s*\((Hybrid|Remote|On-?site)\))?"
+)
+_REMOTE = re.compile(r"\b(?:fully )?remote(?: \(?(?:canada|within canada|in canada)\)?)?", re.I)
+_POSTED = re.compile(r"\b(20\d\d-\d\d-\d\d)\b")
+
+_CURRENCY = r"(?:CA\$|C\$|US\$|USD|CAD|EUR|GBP|\$|€|£)"
+_AMOUNT = r"\d{1,3}(?:[,\s]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+# The currency can follow each amount, as in French postings ("80 000 $ à 95 000 $ par année")
+_SALARY = re.compile(
+    rf"(?P<cur1>{_CURRENCY})?\s?(?P<lo>{_AMOUNT})\s?(?P<k1>[kK])?(?:\s?(?P<post1>{_CURRENCY}))?"
+    rf"(?:\s*(?:-|–|—|to|à)\s*(?P<cur2>{_CURRENCY})?\s?(?P<hi>{_AMOUNT})\s?(?P<k2>[kK])?(?:\s?(?P<post2>{_CURRENCY}))?)?"
+    rf"(?:\s*(?P<code>CAD|USD|EUR|GBP))?"
+    r"(?:\s*(?:per|/|an|a|par)\s*(?P<period>hour|hr|day|week|month|year|yr|annum|heure|jour|semaine|mois|année|an|h)(?!\w))?",
+)
+_SALARY_CONTEXT = re.compile(r"salary|compensation|pay|\$|€|£|\bCAD\b|\bUSD\b|per hour|/hr|/hour|per year", re.I)
+_UP_TO = re.compile(r"\bup to\s*$", re.I)
+
+_BULLET = re.compile(r"^\s*(?:[-*•·▪◦●]|\d{1,2}[.)])\s+")
+_HEADINGS = [
+    ("preferred", re.compile(r"preferred|nice[ -]to[ -]have|bonus|assets?\b|good to have|pluses", re.I)),
+    ("benefits", re.compile(r"benefits|perks|what we offer|why (?:join|work)", re.I)),
+    (
+        "responsibilities",
+        re.compile(r"responsibilit|what you(?:'|’)?ll do|duties|your role|the role|key accountabilit|day to day", re.I),
+    ),
+    (
+        "required",
+        re.compile(
+            r"requirements|qualifications|required|must[ -]haves?|what you(?:'|’)?ll (?:need|bring)"
+            r"|what we(?:'|’)?re looking for|about you|who you are|skills",
+            re.I,
+        ),
+    ),
+]
+
+
+def _amount(text: str, thousands: Optional[str]) -> float:
+    value = float(re.sub(r"[,\s]", "", text))
+    return value * 1000 if thousands else value
+
+
+def parse_salary(text: str, default_currency: str = "CAD", bare: bool = False) -> Optional[Dict[str, Any]]:
+    """Annual CAD range of the first salary in ``text``, or ``None``.
+
+    ``"$70,000 - $90,000 CAD"`` and ``"70 000 $ - 90 000 $"`` give
+    ``{"min": 70000, "max": 90000, ...}``.
+    Hourly, daily, weekly and monthly pay is annualized. Amounts below 200
+    without a period are taken as hourly. ``"up to $90K"`` has no minimum.
+    A number needs a currency, ``K`` or a period unless ``bare`` is set (the
+    text is known to be a salary, e.g. the ``salary_range`` field).
+    """
+    if not text:
+        return None
+    for match in _SALARY.finditer(text):
+        symbols = [match.group(g) for g in ("code", "cur1", "cur2", "post1", "post2") if match.group(g)]
+        has_money = bool(symbols)
+        if not (bare or has_money or match.group("k1") or match.group("period")):
+            continue
+        low = _amount(match.group("lo"), match.group("k1"))
+        high = _amount(match.group("hi"), match.group("k2") or match.group("k1")) if match.group("hi") else low
+        if match.group("k2") and not match.group("k1") and low < 1000 <= high:
+            low *= 1000  # "$70 - 90K"
+        period = (match.group("period") or "").lower()
+        period = _PERIOD_NAMES.get(period, period)
+        if not period:
+            period = "hour" if high < 200 else "year"
+        if high < 10 or (period == "year" and high < 1000):
+            continue
+        # A currency code or a qualified dollar wins over a bare "$"
+        code = next((symbol for symbol in symbols if symbol != "$"), "$" if symbols else "").upper()
+        currency = {"CA$": "CAD", "C$": "CAD", "US$": "USD", "€": "EUR", "£": "GBP", "$": default_currency}.get(
+            code, code or default_currency
+        )
+        factor = _PERIODS[period] * CAD_RATES.get(currency, 1.0)
+        up_to = bool(_UP_TO.search(text[: match.start()]))
+        return {
+            "min": None if up_to else int(round(low * factor)),
+            "max": int(round(max(low, high) * factor)),
+            "currency": "CAD",
+            "source_currency": currency,
+            "period": period,
+        }
+    return None
+
+
+def _salary_line(text: str) -> str:
+    for line in text.split("\n"):
+        if _SALARY_CONTEXT.search(line) and parse_salary(line):
+            return line.strip()[:100]
+    return ""
+
+
+def _sections(text: str) -> Tuple[str, Dict[str, List[str]]]:
+    """Split JD text into intro paragraphs and bulleted lists under known headings."""
+    intro: List[str] = []
+    lists: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line or _LABEL_LINE.match(line):
+            continue
+        bullet = _BULLET.match(line)
+        if not bullet and len(line) <= 60 and (line.endswith(":") or line.istitle() or line.isupper()):
+            heading = next((name for name, pattern in _HEADINGS if pattern.search(line)), None)
+            if heading is not None:
+                current = heading
+                lists.setdefault(heading, [])
+                continue
+        if current is None:
+            intro.append(line)
+        else:
+            lists[current].append(line[bullet.end():] if bullet else line)
+    return "\n".join(intro), lists
+
+
+def _location(text: str) -> str:
+    match = _CITY.search(text)
+    if match:
+        return f"{match.group(1)} ({match.group(2)})" if match.group(2) else match.group(1)
+    match = _REMOTE.search(text)
+    if not match:
+        return ""
+    found = match.group(0).strip()
+    return found[0].upper() + found[1:]
+
+
+def extract(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Fill missing ``sample-jd.json`` fields from the record's text.
+
+    Returns the new record and the names of the extracted fields. Fields the
+    record already has are never overwritten.
+    """
+    out = dict(record)
+    filled: List[str] = []
+    text = next((str(record[f]) for f in _TEXT_FIELDS if isinstance(record.get(f), str) and record[f].strip()), "")
+    head = "\n".join(text.split("\n")[:15])
+
+    def fill(field: str, value: Any) -> None:
+        if value and not out.get(field):
+            out[field] = value
+            filled.append(field)
+
+    for match in _LABEL_LINE.finditer(text):
+        field = _LABEL_FIELDS[match.group(1).lower()]
+        # Only the salary may be stated far below the header
+        if field == "salary_range" or match.start() < len(head):
+            fill(field, match.group(2)[:200])
+    lines = [line.strip() for line in head.split("\n") if line.strip()]
+    first = lines[0] if lines else ""
+    if not out.get("position") and first and len(first) <= 80 and ":" not in first:
+        at = _TITLE_AT.match(first)
+        fill("position", at.group(1) if at else first)
+        if at:
+            fill("company", at.group(2).strip())
+    if not out.get("company"):
+        match = _LEGAL_NAME.search(head) or _HIRING.search(head) or _ABOUT.search(text)
+        if match:
+            fill("company", (match.group(1) if match.groups() else match.group(0)).strip())
+    if not out.get("location"):
+        fill("location", _location(head) or _location(text))
+    if not out.get("salary_range"):
+        fill("salary_range", _salary_line(text))
+    if not out.get("posted_date"):
+        match = _POSTED.search(head)
+        if match:
+            fill("posted_date", match.group(1))
+
+    if text and not (out.get("responsibilities") or out.get("requirements")):
+        intro, lists = _sections(text)
+        if lists:
+            if not record.get("description") or record.get("description") == text:
+                out["description"] = intro
+            fill("responsibilities", lists.get("responsibilities"))
+            requirements = {k: lists[k] for k in ("required", "preferred") if lists.get(k)}
+            fill("requirements", requirements)
+            fill("benefits", lists.get("benefits"))
+    if not out.get("description") and text:
+        out["description"] = text
+
+    salary = parse_salary(str(out.get("salary_range") or ""), bare=True)
+    if salary is not None:
+        out["salary_cad"] = salary
+    return out, filled
+
+
+# -- schema -----------------------------------------------------------------
+
+_KINDS = {str: "string", list: "list", dict: "object", int: "number", float: "number", bool: "boolean"}
+
+
+class Schema:
+    """Field types taken from a sample record (``examples/sample-jd.json``).
+
+    Nested objects keep their own field types (``requirements.required`` is a
+    list). Fields the sample does not have are passed through unchecked.
+    """
+
+    def __init__(self, sample: Dict[str, Any]):
+        self.sample = sample
+        self.fields = {name: self._kind(value) for name, value in sample.items()}
+
+    @classmethod
+    def from_file(cls, path) -> "Schema":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def _kind(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {name: self._kind(item) for name, item in value.items()}
+        return _KINDS.get(type(value), "string")
+
+    def coerce(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Fix shapes crawlers commonly produce: one string for a list, a list for ``requirements``."""
+        out = dict(record)
+        for name, kind in self.fields.items():
+            value = out.get(name)
+            if value is None:
+                continue
+            if kind == "list" and isinstance(value, str):
+                out[name] = [_BULLET.sub("", line).strip() for line in value.split("\n") if line.strip()]
+            elif isinstance(kind, dict) and isinstance(value, list):
+                out[name] = {"required": value} if "required" in kind else value
+            elif kind == "string" and isinstance(value, (int, float)):
+                out[name] = str(value)
+        return out
+
+    def errors(self, record: Dict[str, Any]) -> List[str]:
+        problems = [f"missing {name}" for name in REQUIRED if not str(record.get(name) or "").strip()]
+        if not any(record.get(name) for name in BODY_FIELDS):
+            problems.append("no JD text (description, responsibilities or requirements)")
+        problems += self._check(record, self.fields, "")
+        url = record.get("job_url")
+        if url and not re.match(r"https?://", str(url)):
+            problems.append(f"job_url is not an http(s) URL: {str(url)[:80]}")
+        posted = record.get("posted_date")
+        if posted:
+            try:
+                date.fromisoformat(str(posted))
+            except ValueError:
+                problems.append(f"posted_date is not YYYY-MM-DD: {posted}")
+        return problems
+
+    def _check(self, value: Dict[str, Any], fields: Dict[str, Any], prefix: str) -> List[str]:
+        problems = []
+        for name, kind in fields.items():
+            item = value.get(name)
+            if item is None or item == "":
+                continue
+            path = prefix + name
+            if isinstance(kind, dict):
+                if not isinstance(item, dict):
+                    problems.append(f"{path} should be an object")
+                else:
+                    problems += self._check(item, kind, path + ".")
+            elif kind == "list":
+                if not isinstance(item, list) or not all(isinstance(entry, str) for entry in item):
+                    problems.append(f"{path} should be a list of strings")
+            elif _KINDS.get(type(item)) != kind:
+                problems.append(f"{path} should be a {kind}")
+        return problems
+
+
+# -- on-disk dedupe set -----------------------------------------------------
+
+_MAGIC = b"JDFPSET1"
+# Written while the set is open; found on open, it means the last run died
+# before close() stored the count, so the slots are counted again
+_OPEN_MAGIC = b"JDFPSETo"
+_HEADER = struct.Struct("<8sQQ")
+_COUNT_SLICE = 1 << 16
+
+
+class FingerprintSet:
+    """An open-addressing hash set of 64-bit fingerprints in a memory-mapped file.
+
+    Each entry takes 8 bytes and the table is kept at most half full, so a
+    million postings (two fingerprints each) need 32 MB of disk. Only the pages
+    that lookups touch are resident. The file is doubled and rehashed when it
+    fills up. Slots are written through the map at once; the count in the
+    header is recovered from them if the process died without ``close``.
+    """
+
+    def __init__(self, path, capacity: int = 1 << 16):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size < _HEADER.size:
+            self._create(self.path, max(16, 1 << (capacity - 1).bit_length()))
+        self._open()
+
+    @staticmethod
+    def _create(path: Path, capacity: int) -> None:
+        with path.open("wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, capacity, 0))
+            handle.truncate(_HEADER.size + 8 * capacity)
+
+    def _open(self) -> None:
+        self._file = self.path.open("r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.capacity, self.count = _HEADER.unpack_from(self._map)
+        if magic not in (_MAGIC, _OPEN_MAGIC):
+            raise ValueError(f"{self.path} is not a fingerprint set")
+        self._slots = memoryview(self._map)[_HEADER.size:].cast("Q")
+        self._mask = self.capacity - 1
+        if magic == _OPEN_MAGIC:
+            self.count = self._recount()
+        _HEADER.pack_into(self._map, 0, _OPEN_MAGIC, self.capacity, self.count)
+
+    def _recount(self) -> int:
+        empty = 0
+        for start in range(0, self.capacity, _COUNT_SLICE):
+            empty += self._slots[start : start + _COUNT_SLICE].tolist().count(0)
+        return self.capacity - empty
+
+    def close(self) -> None:
+        _HEADER.pack_into(self._map, 0, _MAGIC, self.capacity, self.count)
+        self._slots.release()
+        self._map.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, fingerprint: int) -> bool:
+        slots, index = self._slots, fingerprint & self._mask
+        while True:
+            value = slots[index]
+            if value == fingerprint:
+                return True
+            if value == 0:
+                return False
+            index = (index + 1) & self._mask
+
+    def add(self, fingerprint: int) -> bool:
+        """Insert ``fingerprint`` (non-zero); False if it was already there."""
+        slots, index = self._slots, fingerprint & self._mask
+        while True:
+            value = slots[index]
+            if value == fingerprint:
+                return False
+            if value == 0:
+                slots[index] = fingerprint
+                self.count += 1
+                if 2 * self.count > self.capacity:
+                    self._grow()
+                return True
+            index = (index + 1) & self._mask
+
+    def _grow(self) -> None:
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        self._create(temporary, 2 * self.capacity)
+        with temporary.open("r+b") as handle, mmap.mmap(handle.fileno(), 0) as target:
+            slots = memoryview(target)[_HEADER.size:].cast("Q")
+            mask = 2 * self.capacity - 1
+            for value in self._slots:
+                if value:
+                    index = value & mask
+                    while slots[index]:
+                        index = (index + 1) & mask
+                    slots[index] = value
+            _HEADER.pack_into(target, 0, _MAGIC, 2 * self.capacity, self.count)
+            slots.release()
+        self.close()
+        os.replace(temporary, self.path)
+        self._open()
+
+
+def fingerprint(kind: str, value: str) -> int:
+    digest = hashlib.blake2b(f"{kind}\x1f{value}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def body_text(record: Dict[str, Any]) -> str:
+    """Description plus every list item, lowercased to bare word tokens."""
+    parts: List[str] = []
+    for name in BODY_FIELDS:
+        value = record.get(name)
+        if isinstance(value, dict):
+            value = list(itertools.chain.from_iterable(v if isinstance(v, list) else [v] for v in value.values()))
+        parts.extend(value if isinstance(value, list) else [value or ""])
+    return " ".join(tokens(" ".join(map(str, parts)).lower()))
+
+
+def fingerprints(record: Dict[str, Any]) -> List[int]:
+    keys = []
+    url = url_key(str(record.get("job_url") or ""))
+    if url:
+        keys.append(fingerprint("url", url))
+    body = body_text(record)
+    if body:
+        keys.append(fingerprint("body", body))
+    return keys
+
+
+# -- pipeline ---------------------------------------------------------------
+
+
+@dataclass
+class Outcome:
+    status: str  # OK or INVALID; DUPLICATE is decided in the parent
+    line: str  # output JSONL line, or the invalid report
+    keys: List[int]
+
+
+_worker_schema: Optional[Schema] = None
+
+
+def _init_worker(sample: Dict[str, Any]) -> None:
+    global _worker_schema
+    _worker_schema = Schema(sample)
+
+
+def process_line(line: str, schema: Schema) -> Outcome:
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("not a JSON object")
+    except ValueError as exc:
+        report = {"errors": [f"invalid JSON: {exc}"], "line": line[:200]}
+        return Outcome(INVALID, json.dumps(report, ensure_ascii=False), [])
+    record, filled = extract(schema.coerce(record))
+    errors = schema.errors(record)
+    if errors:
+        report = {"errors": errors, "job_url": record.get("job_url", ""), "record": record}
+        return Outcome(INVALID, json.dumps(report, ensure_ascii=False), [])
+    if filled:
+        record["extracted"] = filled
+    return Outcome(OK, json.dumps(record, ensure_ascii=False), fingerprints(record))
+
+
+def _process_batch(lines: List[str]) -> List[Outcome]:
+    assert _worker_schema is not None
+    return [process_line(line, _worker_schema) for line in lines]
+
+
+def iter_lines(path) -> Iterator[str]:
+    """Raw JSONL lines; CSV and JSON inputs are re-encoded one record at a time."""
+    suffix = Path(str(path)).suffix.lower()
+    if str(path) != "-" and suffix in (".csv", ".json"):
+        for record in iter_records(path):
+            yield json.dumps(record, ensure_ascii=False)
+        return
+    handle = sys.stdin if str(path) == "-" else open(path, encoding="utf-8")
+    try:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def ingest_stream(
+    lines: Iterable[str],
+    schema: Schema,
+    seen: Optional[FingerprintSet] = None,
+    workers: int = 1,
+    batch_size: int = 256,
+    flush: Optional[Callable[[], None]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield ``(status, line)`` in input order.
+
+    ``status`` is :data:`OK` (line is the clean record), :data:`DUPLICATE`
+    (the clean record of a posting already seen) or :data:`INVALID` (line is
+    a JSON report with the errors). Without ``seen`` nothing is deduplicated.
+
+    The fingerprints of a clean record are added to ``seen`` only after the
+    caller has taken the lines that follow it and ``flush`` has run, every
+    ``batch_size`` records and at the end. A run that dies in between leaves
+    those postings unseen, so the next run writes them again rather than
+    dropping them.
+    """
+    pending: Set[int] = set()
+
+    def commit() -> None:
+        if flush is not None:
+            flush()
+        for key in pending:
+            seen.add(key)
+        pending.clear()
+
+    for outcome in _outcomes(iter(lines), schema, workers, batch_size):
+        if outcome.status == OK and seen is not None and outcome.keys:
+            if any(key in seen or key in pending for key in outcome.keys):
+                yield DUPLICATE, outcome.line
+                continue
+            yield OK, outcome.line
+            pending.update(outcome.keys)
+            if len(pending) >= batch_size:
+                commit()
+            continue
+        yield outcome.status, outcome.line
+    if seen is not None:
+        commit()
+
+
+def _outcomes(lines: Iterator[str], schema: Schema, workers: int, batch_size: int) -> Iterator[Outcome]:
+    batches = iter(lambda: list(itertools.islice(lines, batch_size)), [])
+    if workers <= 1:
+        for batch in batches:
+            for line in batch:
+                yield process_line(line, schema)
+        return
+
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema.sample,)) as pool:
+        for batch in batches:
+            pending.append(pool.submit(_process_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("inputs", nargs="+", help="crawl output (.jsonl, .csv, .json or - for stdin)")
+    parser.add_argument("-o", "--output", help="clean JSONL (default: stdout)")
+    parser.add_argument("--invalid", help="write rejected records with their errors here")
+    parser.add_argument("--duplicates", help="write dropped duplicates here")
+    parser.add_argument("--schema", default=str(DEFAULT_SCHEMA), help="sample record defining the field types")
+    parser.add_argument(
+        "--seen", help="fingerprint file shared across runs (default: OUTPUT.seen.fpset, or this run only)"
+    )
+    parser.add_argument("--no-dedupe", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    schema = Schema.from_file(args.schema)
+    scratch = None
+    if args.no_dedupe:
+        seen_path = None
+    elif args.seen:
+        seen_path = Path(args.seen)
+    elif args.output:
+        seen_path = Path(args.output).with_suffix(".seen.fpset")
+    else:
+        scratch = tempfile.TemporaryDirectory()
+        seen_path = Path(scratch.name) / "seen.fpset"
+    seen = FingerprintSet(seen_path) if seen_path is not None else None
+    # A persistent seen set describes what the output already holds, so add to it
+    mode = "a" if seen is not None and scratch is None else "w"
+    out = open(args.output, mode, encoding="utf-8") if args.output else sys.stdout
+    sinks = {OK: out}
+    for status, path in ((INVALID, args.invalid), (DUPLICATE, args.duplicates)):
+        if path:
+            sinks[status] = open(path, "w", encoding="utf-8")
+    counts: Counter = Counter()
+    started = time.perf_counter()
+    try:
+        lines = itertools.chain.from_iterable(iter_lines(path) for path in args.inputs)
+        for status, line in ingest_stream(lines, schema, seen, args.workers, args.batch_size, out.flush):
+            counts[status] += 1
+            sink = sinks.get(status)
+            if sink is not None:
+                sink.write(line)
+                sink.write("\n")
+    finally:
+        for sink in sinks.values():
+            if sink is not sys.stdout:
+                sink.close()
+        if seen is not None:
+            seen.close()
+        if scratch is not None:
+            scratch.cleanup()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{total} records in {elapsed:.2f}s ({rate:,.0f}/sec): {json.dumps(dict(counts))}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
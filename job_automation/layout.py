@@ -0,0 +1,1087 @@
+"""Offline layout estimator for the resume and cover-letter templates.
+
+Predicts how a filled template will paginate without a Chromium render: the
+template CSS is parsed once (``@page`` size, fonts, sizes, margins, paddings,
+borders, ``line-height``), text is wrapped with per-font glyph-width tables and
+block heights are stacked with CSS margin collapsing. The report says whether
+the document fits on one page, which section runs over and by how much, and
+which bullets wrap onto a second line and by how many characters.
+
+The templates declare ``@import`` *after* the ``*`` rule, which makes browsers
+ignore it, so Gotenberg renders with its sans-serif fallback. Depending on the
+Chromium build and the fonts in the image that is Arial (or the
+metric-compatible Liberation Sans) or DejaVu Sans, about 13% wider; both are
+in :data:`FONTS`. ``layout_calibration record`` reads the font from the
+rendered PDFs, and ``width_scale`` absorbs what the tables miss (kerning).
+The default font, ``auto``, is the one of the committed reference renders.
+
+Usage::
+
+    python -m job_automation.layout check filled_resume.html
+    python -m job_automation.layout check templates/resume_template.html \\
+        --values resume_values.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Advance widths in 1/1000 em for ASCII 32..126 (Helvetica/Arial AFM metrics)
+_REGULAR = (
+    "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 "
+    "556 556 556 556 556 556 556 556 556 556 278 278 584 584 584 556 1015 "
+    "667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 611 "
+    "722 667 944 667 667 611 278 278 278 469 556 333 "
+    "556 556 500 556 556 278 556 556 222 222 500 222 833 556 556 556 556 333 500 278 "
+    "556 500 722 500 500 500 334 260 334 584"
+)
+_BOLD = (
+    "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 "
+    "556 556 556 556 556 556 556 556 556 556 333 333 584 584 584 611 975 "
+    "722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 667 611 "
+    "722 667 944 667 667 611 333 278 333 584 556 333 "
+    "556 611 556 611 556 333 611 611 278 278 556 278 889 611 611 611 611 389 556 333 "
+    "611 556 778 556 556 500 389 280 389 584"
+)
+_SPECIAL = {"–": 556, "—": 1000, "•": 350, "‘": 222, "’": 222,
+            "“": 333, "”": 333, "…": 1000, " ": 278}
+# DejaVu Sans 2.37 advance widths (hmtx, in 1/1000 em), same layout as above
+_DEJAVU_REGULAR = (
+    "318 401 460 838 636 950 780 275 390 390 500 838 318 361 318 337 "
+    "636 636 636 636 636 636 636 636 636 636 337 337 838 838 838 531 1000 "
+    "684 686 698 770 632 575 775 752 295 295 656 557 863 748 787 603 787 695 635 611 "
+    "732 684 989 685 611 685 390 337 390 838 500 500 "
+    "613 635 550 635 615 352 635 634 278 278 579 278 974 634 612 635 635 411 521 392 "
+    "634 592 818 592 592 525 636 337 636 838"
+)
+_DEJAVU_BOLD = (
+    "348 456 521 838 696 1002 872 306 457 457 523 838 380 415 380 365 "
+    "696 696 696 696 696 696 696 696 696 696 400 400 838 838 838 580 1000 "
+    "774 762 734 830 683 683 821 837 372 372 775 637 995 837 850 733 850 770 720 682 "
+    "812 774 1103 771 724 725 457 365 457 838 500 500 "
+    "675 716 593 716 678 435 716 712 343 343 665 343 1042 712 687 716 716 493 595 478 "
+    "712 652 924 645 652 582 712 365 712 838"
+)
+_DEJAVU_SPECIAL = {"–": 500, "—": 1000, "•": 590, "‘": 318, "’": 318,
+                   "“": 518, "”": 518, "…": 1000, "\u00a0": 318}
+
+# Glyph tables by name: (regular, bold, specials, width of other glyphs)
+FONTS = {
+    "arial": (_REGULAR, _BOLD, _SPECIAL, 556),
+    "dejavu": (_DEJAVU_REGULAR, _DEJAVU_BOLD, _DEJAVU_SPECIAL, 636),
+}
+# Font names Chromium embeds in its PDFs (``/BaseFont``), by table
+_FONT_NAMES = {
+    "arial": ("Arial", "Liberation", "Arimo", "Helvetica", "NimbusSans"),
+    "dejavu": ("DejaVuSans",),
+}
+
+PT_PER_UNIT = {"pt": 1.0, "px": 0.75, "in": 72.0, "cm": 72 / 2.54, "mm": 72 / 25.4, "pc": 12.0}
+PAGE_SIZES = {"letter": (612.0, 792.0), "legal": (612.0, 1008.0), "a4": (595.28, 841.89)}
+
+_BLOCK_TAGS = {
+    "html", "body", "div", "p", "h1", "h2", "h3", "h4", "h5", "h6", "header", "footer",
+    "section", "article", "main", "nav", "ul", "ol", "li", "table", "tr", "blockquote",
+}
+_SKIPPED_TAGS = {"head", "style", "script", "title", "meta", "link"}
+_VOID_TAGS = {"meta", "link", "br", "img", "hr", "input"}
+_INHERITED = ("font-size", "font-weight", "font-style", "line-height", "white-space", "text-align")
+_UA_STYLES = {
+    "h1": {"font-size": "2em", "font-weight": "bold", "margin": "0.67em 0"},
+    "h2": {"font-size": "1.5em", "font-weight": "bold", "margin": "0.83em 0"},
+    "h3": {"font-size": "1.17em", "font-weight": "bold", "margin": "1em 0"},
+    "p": {"margin": "1em 0"},
+    "ul": {"margin": "1em 0", "padding-left": "40px"},
+    "ol": {"margin": "1em 0", "padding-left": "40px"},
+    "body": {"margin": "8px", "font-size": "16px", "line-height": "1.15"},
+    "b": {"font-weight": "bold"},
+    "strong": {"font-weight": "bold"},
+    "th": {"font-weight": "bold"},
+    "em": {"font-style": "italic"},
+    "i": {"font-style": "italic"},
+}
+
+
+def _table(widths: str, other: int) -> Tuple[float, ...]:
+    values = [int(w) / 1000 for w in widths.split()]
+    return tuple([0.0] * 32 + values + [other / 1000])
+
+
+# Picks the glyph table of the committed reference renders (see layout_calibration)
+AUTO = "auto"
+CALIBRATION_DIR = Path(__file__).resolve().parent.parent / "calibration" / "layout"
+
+
+def font_for(names: Iterable[str]) -> Optional[str]:
+    """The :data:`FONTS` entry whose metrics match embedded font ``names``."""
+    for font, prefixes in _FONT_NAMES.items():
+        # Subsets are named like "AAAAAA+DejaVuSans-Bold"
+        if any(name.split("+")[-1].startswith(prefixes) for name in names):
+            return font
+    return None
+
+
+@lru_cache(maxsize=None)
+def default_font(directory: Path = CALIBRATION_DIR) -> str:
+    """The :data:`FONTS` entry of the reference renders in ``directory``.
+
+    Falls back to Arial when there are no references (an install without
+    the calibration set) or their font has no glyph table.
+    """
+    try:
+        references = json.loads((directory / "references.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return "arial"
+    return font_for(sorted({name for item in references for name in item.get("fonts", [])})) or "arial"
+
+
+class FontMetrics:
+    """Glyph-width tables with memoized word widths.
+
+    ``width`` costs a dict lookup for any word seen before, which is what
+    makes re-checking a handful of generated bullets take microseconds.
+    """
+
+    def __init__(self, width_scale: float = 1.0, font: str = AUTO):
+        font = default_font() if font == AUTO else font
+        regular, bold, special, other = FONTS[font]
+        self.font = font
+        self.width_scale = width_scale
+        self._tables = {False: _table(regular, other), True: _table(bold, other)}
+        self._special = {char: width / 1000 for char, width in special.items()}
+        self._cache: Dict[Tuple[str, bool], float] = {}
+
+    def em_width(self, text: str, bold: bool = False) -> float:
+        key = (text, bold)
+        cached = self._cache.get(key)
+        if cached is None:
+            table = self._tables[bold]
+            cached = 0.0
+            for char in text:
+                code = ord(char)
+                if code < 128:
+                    cached += table[code]
+                else:
+                    cached += self._special.get(char) or table[ord(_base_char(char))]
+            cached *= self.width_scale
+            if len(self._cache) < 200_000:
+                self._cache[key] = cached
+        return cached
+
+    def width(self, text: str, size: float, bold: bool = False) -> float:
+        """Width of ``text`` in points at ``size`` points."""
+        return self.em_width(text, bold) * size
+
+    def wrap(self, text: str, width: float, size: float, bold: bool = False) -> List[str]:
+        """Greedy word wrap of plain ``text`` into lines no wider than ``width``."""
+        lines: List[str] = []
+        current: List[str] = []
+        used = 0.0
+        space = self.width(" ", size, bold)
+        for word in text.split():
+            word_width = self.width(word, size, bold)
+            if current and used + space + word_width > width:
+                lines.append(" ".join(current))
+                current, used = [word], word_width
+            else:
+                used += (space if current else 0.0) + word_width
+                current.append(word)
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+
+@lru_cache(maxsize=4096)
+def _base_char(char: str) -> str:
+    base = unicodedata.normalize("NFKD", char)[:1]
+    return base if base and ord(base) < 128 else "o"
+
+
+# -- CSS ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _Compound:
+    tag: str = ""
+    classes: Tuple[str, ...] = ()
+    pseudo: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class _Selector:
+    # (combinator, compound) pairs, left to right; the first combinator is ""
+    parts: Tuple[Tuple[str, _Compound], ...]
+    pseudo_element: str
+    specificity: Tuple[int, int]
+
+
+@dataclass
+class _Rule:
+    selector: _Selector
+    declarations: Dict[str, str]
+    order: int
+
+
+@dataclass
+class Stylesheet:
+    rules: List[_Rule] = field(default_factory=list)
+    page: Dict[str, str] = field(default_factory=dict)
+    ignored_imports: List[str] = field(default_factory=list)
+
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_COMPOUND = re.compile(r"([a-z0-9*]*)((?:\.[\w-]+)*)((?::[\w-]+)*)((?:::[\w-]+)?)", re.I)
+
+
+def parse_css(css: str, media: str = "print") -> Stylesheet:
+    """Parse the subset of CSS the templates use.
+
+    ``@media`` blocks for ``media`` (and ``all``) are applied, others skipped;
+    ``@import`` rules that follow another rule are recorded as ignored, as a
+    browser would.
+    """
+    sheet = Stylesheet()
+    _parse_block(_COMMENT.sub("", css), sheet, media, [0])
+    return sheet
+
+
+def _parse_block(css: str, sheet: Stylesheet, media: str, order: List[int]) -> None:
+    position = 0
+    while position < len(css):
+        brace = css.find("{", position)
+        semicolon = css.find(";", position)
+        if brace == -1 and semicolon == -1:
+            break
+        prelude_end = brace if brace != -1 and (semicolon == -1 or brace < semicolon) else semicolon
+        prelude = css[position:prelude_end].strip()
+        if prelude_end == semicolon:
+            if prelude.startswith("@import"):
+                if order[0] or sheet.rules:
+                    sheet.ignored_imports.append(prelude)
+            position = semicolon + 1
+            continue
+
+        body_end = _matching_brace(css, brace)
+        body = css[brace + 1 : body_end]
+        position = body_end + 1
+        if prelude.startswith("@media"):
+            queries = prelude[len("@media") :].lower()
+            if media in queries or "all" in queries:
+                _parse_block(body, sheet, media, order)
+        elif prelude.startswith("@page"):
+            sheet.page.update(_declarations(body))
+        elif prelude.startswith("@"):
+            continue
+        else:
+            declarations = _declarations(body)
+            for text in prelude.split(","):
+                selector = _parse_selector(text.strip())
+                if selector is not None:
+                    sheet.rules.append(_Rule(selector, declarations, order[0]))
+            order[0] += 1
+
+
+def _matching_brace(css: str, start: int) -> int:
+    depth = 0
+    for index in range(start, len(css)):
+        if css[index] == "{":
+            depth += 1
+        elif css[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(css)
+
+
+def _declarations(body: str) -> Dict[str, str]:
+    result: Dict[str, str] = {}
+    for item in body.split(";"):
+        if ":" in item:
+            name, value = item.split(":", 1)
+            value = value.replace("!important", "").strip()
+            result.update(_expand(name.strip().lower(), value))
+    return result
+
+
+def _expand(name: str, value: str) -> Dict[str, str]:
+    """Expand the box shorthands into their four sides."""
+    sides = ("top", "right", "bottom", "left")
+    if name in ("margin", "padding"):
+        parts = value.split()
+        if not parts:
+            return {}
+        top, right, bottom, left = {
+            1: lambda p: (p[0],) * 4,
+            2: lambda p: (p[0], p[1], p[0], p[1]),
+            3: lambda p: (p[0], p[1], p[2], p[1]),
+        }.get(len(parts), lambda p: tuple(p[:4]))(parts)
+        return dict(zip((f"{name}-{s}" for s in sides), (top, right, bottom, left)))
+    if name == "border" or (name.startswith("border-") and name.count("-") == 1):
+        width = next((p for p in value.split() if _length_unit(p)), "0")
+        if value.strip() == "none":
+            width = "0"
+        targets = sides if name == "border" else (name.split("-", 1)[1],)
+        return {f"border-{side}-width": width for side in targets if side in sides}
+    return {name: value}
+
+
+def _length_unit(token: str) -> bool:
+    return bool(re.fullmatch(r"[\d.]+(pt|px|in|cm|mm|pc|em)?", token)) and token != "."
+
+
+def _parse_selector(text: str) -> Optional[_Selector]:
+    tokens = re.findall(r"[+>~]|[^\s+>~]+", text)
+    parts: List[Tuple[str, _Compound]] = []
+    combinator = ""
+    classes = tags = 0
+    pseudo_element = ""
+    for token in tokens:
+        if token in "+>~":
+            combinator = token
+            continue
+        match = _COMPOUND.fullmatch(token)
+        if match is None:
+            return None
+        tag, class_text, pseudo_text, element = match.groups()
+        compound = _Compound(
+            tag="" if tag == "*" else tag.lower(),
+            classes=tuple(c for c in class_text.split(".") if c),
+            pseudo=tuple(p for p in pseudo_text.split(":") if p),
+        )
+        if element:
+            pseudo_element = element.strip(":")
+        tags += bool(compound.tag) + bool(element)
+        classes += len(compound.classes) + len(compound.pseudo)
+        parts.append((combinator or " " if parts else "", compound))
+        combinator = ""
+    if not parts:
+        return None
+    return _Selector(tuple(parts), pseudo_element, (classes, tags))
+
+
+# -- HTML -----------------------------------------------------------------------
+
+
+@dataclass(eq=False)
+class Node:
+    tag: str
+    attrs: Dict[str, str] = field(default_factory=dict)
+    children: List["Node"] = field(default_factory=list)
+    text: str = ""
+    parent: Optional["Node"] = None
+    _signature: Optional[Tuple] = field(default=None, repr=False)
+
+    @property
+    def classes(self) -> Tuple[str, ...]:
+        return tuple(self.attrs.get("class", "").split())
+
+    def signature(self) -> Tuple:
+        """Everything the supported selectors can see of this element: tag,
+        classes, inline style, position among siblings, the previous sibling
+        and the ancestors. Equal signatures cascade equally."""
+        if self._signature is None:
+            siblings = self.element_siblings()
+            index = siblings.index(self)
+            previous = siblings[index - 1] if index else None
+            self._signature = (
+                self.tag,
+                self.attrs.get("class", ""),
+                self.attrs.get("style", ""),
+                index == 0,
+                index == len(siblings) - 1,
+                (previous.tag, previous.attrs.get("class", ""), index == 1) if previous else None,
+                self.parent.signature() if self.parent else None,
+            )
+        return self._signature
+
+    def element_siblings(self) -> List["Node"]:
+        return [c for c in self.parent.children if c.tag != "#text"] if self.parent else [self]
+
+    def text_content(self) -> str:
+        if self.tag == "#text":
+            return self.text
+        return "".join(child.text_content() for child in self.children)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.stack = [self.root]
+        self.skip = 0
+        self.css: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if self.skip or tag in _SKIPPED_TAGS:
+            if tag not in _VOID_TAGS:
+                self.skip += 1
+            return
+        node = Node(tag, {k: v or "" for k, v in attrs}, parent=self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in _VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.skip:
+            if tag in _SKIPPED_TAGS and tag not in _VOID_TAGS:
+                self.skip -= 1
+            return
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        if self.skip:
+            if self.lasttag == "style":
+                self.css.append(data)
+            return
+        self.stack[-1].children.append(Node("#text", text=data, parent=self.stack[-1]))
+
+
+def parse_html(html: str) -> Tuple[Node, str]:
+    """Return the body tree and the concatenated ``<style>`` contents."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root, "\n".join(builder.css)
+
+
+# -- style resolution -----------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Style:
+    font_size: float = 12.0
+    bold: bool = False
+    italic: bool = False
+    line_height: float = 1.15  # unitless factor
+    line_height_pt: Optional[float] = None  # set when line-height has a unit
+    white_space: str = "normal"
+    display: str = "inline"
+    margin: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    padding: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    border: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    break_inside_avoid: bool = False
+    first_letter_size: Optional[float] = None
+
+    @property
+    def line_box(self) -> float:
+        height = self.line_height_pt if self.line_height_pt is not None else self.font_size * self.line_height
+        # Chromium floors computed line heights to whole CSS pixels: 11pt at
+        # 1.25 is an 18px (13.5pt) line, not 13.75pt
+        return math.floor(height / PT_PER_UNIT["px"] + 1e-6) * PT_PER_UNIT["px"]
+
+
+def to_points(value: str, font_size: float, reference: float = 0.0) -> float:
+    value = value.strip().lower()
+    if value in ("", "auto", "0", "none", "normal"):
+        return 0.0
+    match = re.fullmatch(r"(-?[\d.]+)\s*([a-z%]*)", value)
+    if not match:
+        return 0.0
+    number, unit = float(match.group(1)), match.group(2)
+    if unit == "em" or unit == "rem":
+        return number * font_size
+    if unit == "%":
+        return number / 100 * reference
+    return number * PT_PER_UNIT.get(unit, 0.75)
+
+
+class _Cascade:
+    def __init__(self, sheet: Stylesheet):
+        self.sheet = sheet
+        self.rules = sorted(sheet.rules, key=lambda r: (r.selector.specificity, r.order))
+        self._styles: Dict[Tuple, Style] = {}
+
+    def style(self, node: Node, parent: Style) -> Style:
+        """Computed style of ``node``, shared by all nodes with its signature."""
+        key = (node.signature(), parent)
+        style = self._styles.get(key)
+        if style is None:
+            style = self._styles[key] = compute_style(node, parent, self)
+        return style
+
+    def matches(self, selector: _Selector, node: Node) -> bool:
+        return _match_from(selector.parts, len(selector.parts) - 1, node)
+
+    def declarations(self, node: Node) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Cascaded declarations for ``node`` and for its ``::first-letter``."""
+        own: Dict[str, str] = dict(_UA_STYLES.get(node.tag, {}))
+        for key, value in list(own.items()):
+            own.update(_expand(key, value))
+        first_letter: Dict[str, str] = {}
+        for rule in self.rules:
+            if self.matches(rule.selector, node):
+                target = first_letter if rule.selector.pseudo_element == "first-letter" else own
+                if not rule.selector.pseudo_element or target is first_letter:
+                    target.update(rule.declarations)
+        if "style" in node.attrs:
+            own.update(_declarations(node.attrs["style"]))
+        return own, first_letter
+
+
+def _match_compound(compound: _Compound, node: Node) -> bool:
+    if node.tag.startswith("#"):
+        return False
+    if compound.tag and compound.tag != node.tag:
+        return False
+    if compound.classes and not set(compound.classes) <= set(node.classes):
+        return False
+    for pseudo in compound.pseudo:
+        siblings = node.element_siblings()
+        if pseudo == "last-child" and siblings[-1] is not node:
+            return False
+        if pseudo == "first-child" and siblings[0] is not node:
+            return False
+        if pseudo not in ("last-child", "first-child"):
+            return False
+    return True
+
+
+def _match_from(parts: Sequence[Tuple[str, _Compound]], index: int, node: Node) -> bool:
+    combinator, compound = parts[index]
+    if not _match_compound(compound, node):
+        return False
+    if index == 0:
+        return True
+    if combinator == "+":
+        siblings = node.element_siblings()
+        position = siblings.index(node)
+        return position > 0 and _match_from(parts, index - 1, siblings[position - 1])
+    if combinator == ">":
+        return node.parent is not None and _match_from(parts, index - 1, node.parent)
+    ancestor = node.parent
+    while ancestor is not None:
+        if _match_from(parts, index - 1, ancestor):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+
+def compute_style(node: Node, parent: Style, cascade: _Cascade) -> Style:
+    declared, first_letter = cascade.declarations(node)
+    values = {
+        "font_size": parent.font_size,
+        "bold": parent.bold,
+        "italic": parent.italic,
+        "line_height": parent.line_height,
+        "line_height_pt": parent.line_height_pt,
+        "white_space": declared.get("white-space", parent.white_space),
+        "display": declared.get(
+            "display", "list-item" if node.tag == "li" else "block" if node.tag in _BLOCK_TAGS else "inline"
+        ),
+    }
+    if "font-size" in declared:
+        values["font_size"] = to_points(declared["font-size"], parent.font_size, parent.font_size)
+    size = values["font_size"]
+    if "font-weight" in declared:
+        weight = declared["font-weight"]
+        values["bold"] = weight in ("bold", "bolder") or (weight.isdigit() and int(weight) >= 600)
+    if "font-style" in declared:
+        values["italic"] = declared["font-style"] in ("italic", "oblique")
+    line_height = declared.get("line-height", "")
+    if re.fullmatch(r"[\d.]+", line_height):
+        values["line_height"], values["line_height_pt"] = float(line_height), None
+    elif line_height and line_height != "normal":
+        values["line_height_pt"] = to_points(line_height, size, size)
+    for name, prefix, suffix in (("margin", "margin-", ""), ("padding", "padding-", ""), ("border", "border-", "-width")):
+        values[name] = tuple(
+            to_points(declared.get(f"{prefix}{side}{suffix}", "0"), size)
+            for side in ("top", "right", "bottom", "left")
+        )
+    values["break_inside_avoid"] = "avoid" in (
+        declared.get("break-inside", "") + declared.get("page-break-inside", "")
+    )
+    if "font-size" in first_letter:
+        values["first_letter_size"] = to_points(first_letter["font-size"], size, size)
+    return Style(**values)
+
+
+# -- layout -----------------------------------------------------------------------
+
+
+@dataclass
+class TextBlock:
+    """One block of inline content after line wrapping."""
+
+    section: str
+    element: str  # e.g. "li" or "p.skills-line"
+    text: str
+    lines: int
+    top: float
+    height: float
+    overflow_chars: int  # characters after the first line
+
+
+@dataclass(frozen=True)
+class LineSlot:
+    """Width and font available to the text of one kind of element."""
+
+    width: float
+    font_size: float
+    bold: bool = False
+
+
+@dataclass
+class SectionReport:
+    name: str
+    top: float
+    bottom: float
+    lines: int
+
+
+@dataclass
+class LayoutReport:
+    page_width: float
+    page_height: float
+    content_height: float
+    pages: int
+    overflow_pt: float
+    overflow_section: str
+    overflow_lines: int
+    overflow_chars: int
+    sections: List[SectionReport]
+    wrapped: List[TextBlock]
+
+    @property
+    def fits(self) -> bool:
+        return self.pages <= 1
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), fits=self.fits)
+
+
+@dataclass
+class _Box:
+    height: float
+    margin_top: float
+    margin_bottom: float
+
+
+@dataclass
+class _Atom:
+    text: str
+    width: float
+    height: float  # line-box contribution
+    space_before: float  # width of the collapsible space before the atom
+    hard_break: bool = False
+
+
+class LayoutEngine:
+    """Lay out filled templates with a given set of font metrics."""
+
+    def __init__(self, width_scale: float = 1.0, font: str = AUTO):
+        self.metrics = FontMetrics(width_scale, font)
+        self._sheets: Dict[str, Tuple[Stylesheet, _Cascade]] = {}
+
+    def _cascade_for(self, css: str) -> Tuple[Stylesheet, _Cascade]:
+        cached = self._sheets.get(css)
+        if cached is None:
+            sheet = parse_css(css)
+            cached = (sheet, _Cascade(sheet))
+            self._sheets[css] = cached
+        return cached
+
+    def _layout(self, html: str) -> Tuple["_LayoutRun", float, float, float]:
+        """Lay ``html`` out; returns the run, page width, usable page height
+        and the height of the whole flow."""
+        root, css = parse_html(html)
+        sheet, cascade = self._cascade_for(css)
+        page_width, page_height = _page_size(sheet.page)
+        top, right, bottom, left = (
+            to_points(sheet.page.get(f"margin-{side}", "0"), 12.0) for side in ("top", "right", "bottom", "left")
+        )
+        run = _LayoutRun(self.metrics, cascade)
+        box = run.block(root, Style(display="block"), page_width - left - right, 0.0, "")
+        return run, page_width, page_height - top - bottom, box.margin_top + box.height + box.margin_bottom
+
+    def estimate(self, html: str) -> LayoutReport:
+        run, page_width, page_height, height = self._layout(html)
+        return self._report(run, page_width, page_height, height, run.paginate(height, page_height))
+
+    def slots(self, html: str) -> Dict[str, LineSlot]:
+        """Line slots of every text element in ``html``, keyed like
+        :attr:`TextBlock.element`; the first occurrence of each wins."""
+        return self._layout(html)[0].slots
+
+    def lines(self, text: str, slot: LineSlot) -> int:
+        """Number of lines ``text`` wraps to in ``slot``; microseconds per call."""
+        return len(self.metrics.wrap(text, slot.width, slot.font_size, slot.bold)) or 1
+
+    def _report(
+        self, run: "_LayoutRun", page_width: float, page_height: float, height: float, pages: int
+    ) -> LayoutReport:
+        sections: Dict[str, SectionReport] = {}
+        for block in run.blocks:
+            report = sections.setdefault(
+                block.section, SectionReport(block.section, block.top, block.top, 0)
+            )
+            report.bottom = round(max(report.bottom, block.top + block.height), 2)
+            report.lines += block.lines
+
+        overflow = max(0.0, height - page_height) if pages > 1 else 0.0
+        overflow_section = ""
+        overflow_lines = overflow_chars = 0
+        if overflow:
+            overflow_section = next(
+                (s.name for s in sections.values() if s.bottom > page_height), ""
+            )
+            # Lines (and their characters) that have to go, counted from the end
+            remaining = overflow
+            for block in reversed(run.blocks):
+                if remaining <= 0:
+                    break
+                per_line = block.height / max(block.lines, 1)
+                take = min(block.lines, math.ceil(remaining / per_line - 1e-6))
+                overflow_lines += take
+                overflow_chars += round(len(block.text) * take / max(block.lines, 1))
+                remaining -= take * per_line
+
+        return LayoutReport(
+            page_width=page_width,
+            page_height=page_height,
+            content_height=round(height, 2),
+            pages=pages,
+            overflow_pt=round(overflow, 2),
+            overflow_section=overflow_section,
+            overflow_lines=overflow_lines,
+            overflow_chars=overflow_chars,
+            sections=list(sections.values()),
+            wrapped=[b for b in run.blocks if b.lines > 1],
+        )
+
+
+class _LayoutRun:
+    """State of one layout pass: text blocks in flow order and break-avoid boxes."""
+
+    def __init__(self, metrics: FontMetrics, cascade: _Cascade):
+        self.metrics = metrics
+        self.cascade = cascade
+        self.blocks: List[TextBlock] = []
+        self.slots: Dict[str, LineSlot] = {}
+        self.unbreakable: List[Tuple[float, float]] = []
+
+    def block(self, node: Node, style: Style, width: float, top: float, section: str) -> _Box:
+        section = _section_name(node) or section
+        inner_width = width - sum(style.padding[1::2]) - sum(style.border[1::2])
+        lead = style.padding[0] + style.border[0]
+        trail = style.padding[2] + style.border[2]
+        margin_top, margin_bottom = style.margin[0], style.margin[2]
+
+        if style.display == "flex":
+            height = self.flex(node, style, inner_width, top + lead, section)
+            return self._finish(style, top, lead + height + trail, margin_top, margin_bottom)
+
+        cursor = 0.0
+        pending_margin: Optional[float] = None
+        first = True
+        for kind, items in _group_children(node, style, self.cascade):
+            if kind == "inline":
+                atoms = list(self.atoms(items, style))
+                if not any(a.text.strip() or a.hard_break for a in atoms):
+                    continue
+                if pending_margin is not None:
+                    cursor += pending_margin
+                    pending_margin = None
+                block = self.wrap(atoms, style, inner_width, top + lead + cursor, section, _label(node))
+                self.blocks.append(block)
+                self.slots.setdefault(block.element, LineSlot(inner_width, style.font_size, style.bold))
+                cursor += block.height
+                first = False
+                continue
+
+            child, child_style = items
+            child_top = top + lead + cursor + (pending_margin or 0.0)
+            child_box = self.block(child, child_style, inner_width, child_top, section)
+            if first and lead == 0:
+                margin_top = max(margin_top, child_box.margin_top)
+                # Parent and child share the collapsed margin; nothing inside
+            elif pending_margin is not None:
+                cursor += max(pending_margin, child_box.margin_top)
+            else:
+                cursor += child_box.margin_top
+            cursor += child_box.height
+            pending_margin = child_box.margin_bottom
+            first = False
+
+        if pending_margin is not None:
+            if trail == 0:
+                margin_bottom = max(margin_bottom, pending_margin)
+            else:
+                cursor += pending_margin
+        return self._finish(style, top, lead + cursor + trail, margin_top, margin_bottom)
+
+    def _finish(self, style: Style, top: float, height: float, margin_top: float, margin_bottom: float) -> _Box:
+        if style.break_inside_avoid:
+            self.unbreakable.append((top, height))
+        return _Box(height, margin_top, margin_bottom)
+
+    def flex(self, node: Node, style: Style, width: float, top: float, section: str) -> float:
+        """Single-line flex row (``.entry-header``): items share the width."""
+        items = []
+        for child in node.children:
+            if child.tag == "#text":
+                if child.text.strip():
+                    items.append((child, style))
+                continue
+            items.append((child, self.cascade.style(child, style)))
+        measured = []
+        for child, child_style in items:
+            atoms = list(self.atoms([(child, child_style)] if child.tag != "#text" else [(child, style)], style))
+            natural = sum(a.width + (a.space_before if i else 0.0) for i, a in enumerate(atoms))
+            measured.append((atoms, child_style, natural))
+        total = sum(natural for _, _, natural in measured)
+        blocks = []
+        for atoms, child_style, natural in measured:
+            available = width if total <= width else max(width - (total - natural), width * 0.3)
+            blocks.append(self.wrap(atoms, child_style, available, top, section, _label(node)))
+        if not blocks:
+            return 0.0
+        # The row is reported as one block, wrapping as much as its tallest item
+        tallest = max(blocks, key=lambda b: b.height)
+        text = " | ".join(b.text for b in blocks)
+        self.blocks.append(
+            TextBlock(section, _label(node), text, tallest.lines, tallest.top, tallest.height, tallest.overflow_chars)
+        )
+        return tallest.height
+
+    def atoms(self, items, block_style: Style) -> Iterator[_Atom]:
+        """Break inline content into unbreakable words with their widths."""
+        pending_space = 0.0
+        at_line_start = True
+        word_text = ""
+        word_width = word_height = 0.0
+        first_letter_done = block_style.first_letter_size is None
+
+        def flush():
+            nonlocal word_text, word_width, word_height, pending_space
+            if word_text:
+                atom = _Atom(word_text, word_width, word_height, pending_space)
+                word_text, word_width, word_height, pending_space = "", 0.0, 0.0, 0.0
+                return atom
+            return None
+
+        for text, style in _inline_runs(items, block_style, self.cascade):
+            if text == "\n" and style is None:
+                atom = flush()
+                if atom:
+                    yield atom
+                yield _Atom("", 0.0, block_style.line_box, 0.0, hard_break=True)
+                pending_space, at_line_start = 0.0, True
+                continue
+            preserve = style.white_space in ("pre", "pre-wrap", "pre-line")
+            pieces = re.split(r"(\n| +|\t)", text) if preserve else re.split(r"(\s+)", text)
+            for piece in pieces:
+                if not piece:
+                    continue
+                if piece == "\n" and preserve:
+                    atom = flush()
+                    if atom:
+                        yield atom
+                    yield _Atom("", 0.0, style.line_box, 0.0, hard_break=True)
+                    pending_space, at_line_start = 0.0, True
+                elif piece.isspace():
+                    atom = flush()
+                    if atom:
+                        yield atom
+                    space = self.metrics.width(" ", style.font_size, style.bold)
+                    if preserve:
+                        # Preserved spaces take room even at the start of a line
+                        yield _Atom(" " * len(piece.expandtabs(8)), space * len(piece.expandtabs(8)), style.line_box, 0.0)
+                    elif not at_line_start:
+                        pending_space = space
+                else:
+                    size = style.font_size
+                    height = style.line_box
+                    if not first_letter_done:
+                        first_letter_done = True
+                        big = block_style.first_letter_size or size
+                        word_width += self.metrics.width(piece[0], big, style.bold)
+                        word_height = max(word_height, height * big / size)
+                        piece_rest = piece[1:]
+                    else:
+                        piece_rest = piece
+                    word_text += piece
+                    word_width += self.metrics.width(piece_rest, size, style.bold)
+                    word_height = max(word_height, height)
+                    at_line_start = False
+        atom = flush()
+        if atom:
+            yield atom
+
+    def wrap(
+        self, atoms: List[_Atom], style: Style, width: float, top: float, section: str, element: str
+    ) -> TextBlock:
+        """Greedily fill line boxes of ``width`` with ``atoms``."""
+        strut = style.line_box
+        lines: List[List[_Atom]] = [[]]
+        used = 0.0
+        for atom in atoms:
+            if atom.hard_break:
+                lines.append([])
+                used = 0.0
+                continue
+            line = lines[-1]
+            advance = atom.width + (atom.space_before if line else 0.0)
+            if line and used + advance > width + 0.01:
+                lines.append([atom])
+                used = atom.width
+            else:
+                line.append(atom)
+                used += advance
+        if len(lines) > 1 and not lines[-1]:
+            lines.pop()
+        heights = [max([strut] + [a.height for a in line]) for line in lines]
+        height = sum(heights)
+
+        texts = [
+            "".join((" " if a.space_before and i else "") + a.text for i, a in enumerate(line)).strip()
+            for line in lines
+        ]
+        full = " ".join(t for t in texts if t)
+        return TextBlock(
+            section=section,
+            element=element,
+            text=full,
+            lines=len(lines),
+            top=round(top, 2),
+            height=height,
+            overflow_chars=len(full) - len(texts[0]) - 1 if len(lines) > 1 else 0,
+        )
+
+    def paginate(self, height: float, page_height: float) -> int:
+        """Page count, pushing ``break-inside: avoid`` boxes that straddle a
+        page boundary onto the next page."""
+        shift = 0.0
+        for top, box_height in sorted(self.unbreakable):
+            start = top + shift
+            end = start + box_height
+            boundary = (math.floor(start / page_height) + 1) * page_height
+            if end > boundary + 0.01 and box_height <= page_height:
+                shift += boundary - start
+        return max(1, math.ceil((height + shift) / page_height - 1e-6))
+
+
+def _label(node: Node) -> str:
+    return ".".join((node.tag,) + node.classes[:1])
+
+
+def _section_name(node: Node) -> str:
+    classes = node.classes
+    if node.tag == "header" or "header" in classes:
+        return "HEADER"
+    if "section" in classes:
+        for child in node.children:
+            if "section-title" in child.classes:
+                return child.text_content().strip().upper()
+        return "SECTION"
+    for name in ("date", "content"):
+        if name in classes:
+            return name.upper()
+    return ""
+
+
+def _group_children(node: Node, style: Style, cascade: _Cascade):
+    """Yield ``("inline", [(node, style), ...])`` runs and ``("block", (node, style))``."""
+    inline: List[Tuple[Node, Style]] = []
+    for child in node.children:
+        if child.tag == "#text":
+            inline.append((child, style))
+            continue
+        child_style = cascade.style(child, style)
+        if child_style.display in ("block", "list-item", "flex"):
+            if inline:
+                yield "inline", inline
+                inline = []
+            yield "block", (child, child_style)
+        elif child_style.display != "none":
+            inline.append((child, child_style))
+    if inline:
+        yield "inline", inline
+
+
+def _inline_runs(items, parent: Style, cascade: _Cascade) -> Iterator[Tuple[str, Optional[Style]]]:
+    for node, style in items:
+        if node.tag == "#text":
+            yield node.text, style
+        elif node.tag == "br":
+            yield "\n", None
+        else:
+            children = [
+                (child, style if child.tag == "#text" else cascade.style(child, style))
+                for child in node.children
+            ]
+            yield from _inline_runs(children, style, cascade)
+
+
+def _page_size(page: Dict[str, str]) -> Tuple[float, float]:
+    width, height = PAGE_SIZES["letter"]
+    words = page.get("size", "").lower().split()
+    lengths = [to_points(w, 12.0) for w in words if _length_unit(w)]
+    if len(lengths) == 2:
+        width, height = lengths
+    for word in words:
+        if word in PAGE_SIZES:
+            width, height = PAGE_SIZES[word]
+    if "landscape" in words:
+        width, height = height, width
+    return width, height
+
+
+def fill_template(template: str, values: Dict[str, str]) -> str:
+    """Replace ``{{KEY}}`` placeholders; unknown placeholders are left as is."""
+    return re.sub(
+        r"\{\{(\w+)\}\}", lambda m: str(values.get(m.group(1), m.group(0))), template
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="estimate the layout of a filled template")
+    check.add_argument("html")
+    check.add_argument("--values", help="JSON object of {{PLACEHOLDER}} values to fill in")
+    check.add_argument("--width-scale", type=float, default=1.0)
+    check.add_argument("--font", choices=[AUTO] + sorted(FONTS), default=AUTO,
+                       help="metrics of the font Gotenberg renders with; auto uses the committed calibration renders")
+    check.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    html = Path(args.html).read_text(encoding="utf-8")
+    if args.values:
+        html = fill_template(html, json.loads(Path(args.values).read_text(encoding="utf-8")))
+    engine = LayoutEngine(args.width_scale, args.font)
+    report = engine.estimate(html)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0 if report.fits else 1
+
+    print(
+        f"{report.pages} page(s), content {report.content_height:.1f}pt of {report.page_height:.0f}pt "
+        f"({engine.metrics.font} metrics)"
+    )
+    for section in report.sections:
+        print(f"  {section.name:<10} {section.top:7.1f} - {section.bottom:7.1f}pt  {section.lines} lines")
+    if not report.fits:
+        print(
+            f"overflow: {report.overflow_pt:.1f}pt in {report.overflow_section or '?'} "
+            f"-> trim {report.overflow_lines} line(s), about {report.overflow_chars} characters"
+        )
+    for block in report.wrapped:
+        print(f"  wraps ({block.lines} lines, +{block.overflow_chars} chars) [{block.section}] {block.text[:70]}")
+    return 0 if report.fits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Calibrate the layout estimator against real Gotenberg renders.
+
+A rendered PDF only tells us its page count, so the probes are built to turn
+layout questions into page counts:
+
+- wrap probes: the resume template with a projects section of ``K`` bullets of
+  exactly ``N`` characters, where ``K`` leaves a line of slack on page one. If
+  the bullets wrap, the document runs past page one.
+- height probes: ``K`` one-line bullets for ``K`` around the predicted page
+  capacity, which checks line heights, margins and paddings.
+
+``record`` renders the probes once and stores HTML, PDF, page count and the
+fonts Chromium embedded in a reference directory; ``check`` replays the
+predictions against it with the metrics of that font and ``fit`` searches the
+glyph-width scale that agrees best.
+
+Usage::
+
+    python -m job_automation.layout_calibration record calibration/layout --url http://localhost:3000
+    python -m job_automation.layout_calibration check calibration/layout
+    python -m job_automation.layout_calibration fit calibration/layout
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .gotenberg import DEFAULT_URL, GotenbergClient, RenderJob
+from .layout import FONTS, LayoutEngine, fill_template, font_for
+
+DEFAULT_TEMPLATE = Path("templates/resume_template.html")
+INDEX = "references.json"
+WRAP_LENGTHS = range(70, 122, 2)
+
+# Fixed filler for every placeholder except the probed section
+PROBE_VALUES: Dict[str, str] = {
+    "NAME": "Alex Chen",
+    "CONTACT_LINE": "Toronto, ON | 416-555-0100 | alex.chen@example.com | LinkedIn | GitHub",
+    "MASTER_COURSES": "Machine Learning; Distributed Systems; Cloud Computing",
+    "BACHELOR_COURSES": "Data Structures; Algorithms; Operating Systems",
+    "SKILLS_SECTION": (
+        '<p class="skills-line"><span class="skills-label">Languages:</span> Python, SQL, Java</p>'
+    ),
+}
+_WORDS = (
+    "Developed automated pipeline using Python and Airflow processing daily records "
+    "across warehouse tables while reducing manual reporting effort for analysts and "
+    "improving data quality checks with alerts"
+).split()
+
+
+@dataclass
+class Reference:
+    name: str
+    kind: str  # "wrap" or "height"
+    param: int  # characters per bullet, or number of bullets
+    bullets: int
+    pages: int = 0  # from the rendered PDF; 0 until recorded
+    fonts: List[str] = field(default_factory=list)  # embedded in the PDF
+    producer: str = ""  # e.g. "Skia/PDF m130", the Chromium version
+
+
+def line_of(length: int) -> str:
+    """A bullet of realistic words, exactly ``length`` characters long."""
+    words: List[str] = []
+    index = 0
+    while len(" ".join(words)) < length:
+        words.append(_WORDS[index % len(_WORDS)])
+        index += 1
+    text = " ".join(words)[:length]
+    return text[:-1] + "s" if text.endswith(" ") else text
+
+
+def probe_html(template: str, bullets: Sequence[str]) -> str:
+    items = "\n".join(f"<li>{text}</li>" for text in bullets)
+    project = (
+        '<div class="entry">\n<div class="entry-header">\n'
+        '<span class="entry-title">Calibration Probe</span>\n'
+        '<span class="entry-date">Jan 2025</span>\n</div>\n'
+        f"<ul>\n{items}\n</ul>\n</div>"
+    )
+    return fill_template(template, dict(PROBE_VALUES, PROJECTS_SECTION=project))
+
+
+def _capacity(engine: LayoutEngine, template: str) -> int:
+    """Most one-line bullets the predicted first page holds."""
+    count = 1
+    while engine.estimate(probe_html(template, ["Short bullet"] * (count + 1))).fits:
+        count += 1
+    return count
+
+
+def probes(template: str, engine: Optional[LayoutEngine] = None) -> Iterator[Reference]:
+    engine = engine or LayoutEngine()
+    capacity = _capacity(engine, template)
+    # One line of slack: a one-line bullet set fits, a wrapped one cannot
+    wrap_bullets = max(1, capacity - 1)
+    for length in WRAP_LENGTHS:
+        yield Reference(f"wrap-{length:03d}", "wrap", length, wrap_bullets)
+    for count in range(max(1, capacity - 3), capacity + 4):
+        yield Reference(f"height-{count:03d}", "height", count, count)
+
+
+def reference_html(template: str, reference: Reference) -> str:
+    if reference.kind == "wrap":
+        return probe_html(template, [line_of(reference.param)] * reference.bullets)
+    return probe_html(template, ["Short bullet"] * reference.bullets)
+
+
+def pdf_pages(data: bytes) -> int:
+    """Page count of a PDF without a PDF library (root ``/Count`` or page objects)."""
+    counts = [int(c) for c in re.findall(rb"/Count\s+(\d+)", data)]
+    if counts:
+        return max(counts)
+    return len(re.findall(rb"/Type\s*/Page\b(?!s)", data))
+
+
+def pdf_fonts(data: bytes) -> List[str]:
+    """Names of the fonts embedded in a PDF, subset prefixes included."""
+    names = re.findall(rb"/BaseFont\s*/([^\s/<>\[\]()]+)", data)
+    return sorted({name.decode("latin-1") for name in names})
+
+
+def pdf_producer(data: bytes) -> str:
+    match = re.search(rb"/Producer\s*\(([^)]*)\)", data)
+    return match.group(1).decode("latin-1") if match else ""
+
+
+def load(directory: Path) -> List[Reference]:
+    return [Reference(**item) for item in json.loads((directory / INDEX).read_text(encoding="utf-8"))]
+
+
+def record(directory: Path, template: str, client: GotenbergClient) -> List[Reference]:
+    """Render every probe and store HTML, PDF and page count in ``directory``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    references = {r.name: r for r in probes(template)}
+    jobs = []
+    for reference in references.values():
+        html = reference_html(template, reference)
+        (directory / f"{reference.name}.html").write_text(html, encoding="utf-8")
+        jobs.append(RenderJob(html, directory / f"{reference.name}.pdf", reference.name))
+    for result in client.render_many(jobs):
+        if not result.ok:
+            raise SystemExit(f"{result.job.key}: {result.error}")
+        data = result.job.output.read_bytes()
+        reference = references[result.job.key]
+        reference.pages = pdf_pages(data)
+        reference.fonts = pdf_fonts(data)
+        reference.producer = pdf_producer(data)
+    ordered = sorted(references.values(), key=lambda r: r.name)
+    (directory / INDEX).write_text(
+        json.dumps([vars(r) for r in ordered], indent=2) + "\n", encoding="utf-8"
+    )
+    return ordered
+
+
+@dataclass
+class CheckResult:
+    total: int
+    agreed: int
+    mismatches: List[str]
+    seconds_per_estimate: float
+
+    @property
+    def accuracy(self) -> float:
+        return self.agreed / self.total if self.total else 0.0
+
+
+def recorded_font(directory: Path) -> str:
+    """The :data:`~job_automation.layout.FONTS` entry of the recorded renders.
+
+    Raises ``ValueError`` when the renders used a font without a glyph table:
+    no width scale makes those predictions trustworthy.
+    """
+    names = sorted({name for r in load(directory) for name in r.fonts})
+    font = font_for(names)
+    if font is None:
+        raise ValueError(f"no glyph table for the recorded fonts {names or '(none found)'}")
+    return font
+
+
+def _agrees(reference: Reference, predicted: int) -> bool:
+    # A wrap probe only tells whether its bullets wrapped: one page or more.
+    # Wrapped bullets can push it onto a third page, which says nothing new.
+    if reference.kind == "wrap":
+        return (predicted > 1) == (reference.pages > 1)
+    return predicted == reference.pages
+
+
+def check(directory: Path, engine: LayoutEngine) -> CheckResult:
+    """Compare predicted page counts with the recorded renders."""
+    references = [r for r in load(directory) if r.pages]
+    mismatches = []
+    elapsed = 0.0
+    for reference in references:
+        html = (directory / f"{reference.name}.html").read_text(encoding="utf-8")
+        started = time.perf_counter()
+        predicted = engine.estimate(html).pages
+        elapsed += time.perf_counter() - started
+        if not _agrees(reference, predicted):
+            mismatches.append(f"{reference.name}: predicted {predicted}, rendered {reference.pages}")
+    return CheckResult(
+        len(references),
+        len(references) - len(mismatches),
+        mismatches,
+        elapsed / max(len(references), 1),
+    )
+
+
+def fit(directory: Path, font: str = "arial", low: float = 0.90, high: float = 1.10, step: float = 0.005) -> float:
+    """Glyph-width scale with the best agreement; ties go to the one nearest 1.0."""
+    best = (-1, 0.0, 1.0)
+    scale = low
+    while scale <= high + 1e-9:
+        agreed = check(directory, LayoutEngine(width_scale=scale, font=font)).agreed
+        candidate = (agreed, -abs(scale - 1.0), round(scale, 4))
+        best = max(best, candidate)
+        scale += step
+    return best[2]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="render the probes and store reference page counts")
+    rec.add_argument("directory")
+    rec.add_argument("--template", default=str(DEFAULT_TEMPLATE))
+    rec.add_argument("--url", default=DEFAULT_URL)
+    chk = sub.add_parser("check", help="compare predictions with stored renders")
+    chk.add_argument("directory")
+    chk.add_argument("--width-scale", type=float, default=1.0)
+    fitting = sub.add_parser("fit", help="find the best glyph-width scale")
+    fitting.add_argument("directory")
+    for command in (chk, fitting):
+        command.add_argument("--font", choices=["auto"] + sorted(FONTS), default="auto",
+                             help="glyph table; auto uses the font embedded in the renders")
+    args = parser.parse_args(argv)
+
+    directory = Path(args.directory)
+    if args.command == "record":
+        template = Path(args.template).read_text(encoding="utf-8")
+        with GotenbergClient(args.url) as client:
+            references = record(directory, template, client)
+        fonts = sorted({name for r in references for name in r.fonts})
+        print(f"recorded {len(references)} references in {directory} ({', '.join(fonts) or 'no fonts found'})")
+        return 0
+
+    try:
+        font = recorded_font(directory) if args.font == "auto" else args.font
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.command == "fit":
+        scale = fit(directory, font)
+        result = check(directory, LayoutEngine(width_scale=scale, font=font))
+        print(f"{font} width scale {scale}: {result.agreed}/{result.total} agree")
+        return 0
+
+    result = check(directory, LayoutEngine(width_scale=args.width_scale, font=font))
+    print(
+        f"{font}: {result.agreed}/{result.total} agree ({result.accuracy:.0%}), "
+        f"{result.seconds_per_estimate * 1e6:.0f}us per estimate"
+    )
+    for line in result.mismatches:
+        print(f"  {line}")
+    return 0 if not result.mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
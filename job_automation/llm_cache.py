@@ -0,0 +1,560 @@
+"""Content-addressed cache for the Claude calls of the generation workflows.
+
+``jd-resume-generator.json`` and ``cover-letter-generator.json`` re-run every
+LLM stage from scratch when a posting comes back (re-posted on another Workday
+tenant, resubmitted after a Gotenberg failure, ...). This module provides an
+Anthropic-compatible caching proxy: point the n8n Anthropic credential's base
+URL at it and every ``POST /v1/messages`` is answered from a SQLite cache when
+possible.
+
+* Exact hits are keyed on model, temperature, ``max_tokens``, system prompt,
+  the prompt template and the normalized text of the JD blocks:
+  ``<job_description>`` ("Analyze JD") and ``<job_analysis>`` ("Write Cover
+  Letter"), so whitespace or punctuation changes still hit.
+* Prompts that wrap the raw JD in ``<job_description>`` tags also get a
+  MinHash/LSH index, so a near-identical JD (same body, different boilerplate
+  or req ID) reuses the earlier analysis. ``<job_analysis>`` is derived from
+  the JD; two analyses that only look alike may still call for different
+  letters, so cover-letter calls get exact (normalized) hits only.
+* Entries expire after ``max_age`` seconds and the least recently used ones
+  are evicted once the cache grows past ``max_bytes``.
+
+Usage::
+
+    python -m job_automation.llm_cache serve --db .cache/llm.sqlite --port 8787
+    python -m job_automation.llm_cache stats --db .cache/llm.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .anthropic import prompt_text
+from .httpclient import ConnectionPool
+from .server import BackgroundServer, QuietHandler
+from .text import normalize, tokens
+
+DEFAULT_UPSTREAM = "https://api.anthropic.com"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+HIT = "HIT"
+NEAR = "NEAR"
+MISS = "MISS"
+BYPASS = "BYPASS"
+
+JD_PLACEHOLDER = "{{JOB_DESCRIPTION}}"
+# Prompt blocks normalized before keying; only the raw JD is near-matched
+JD_TAGS = ("job_description", "job_analysis")
+NEAR_DUPLICATE_TAG = "job_description"
+_JD_TAG = re.compile(r"(<(%s)>)(.*?)(</\2>)" % "|".join(JD_TAGS), re.S)
+_FORWARDED_HEADERS = ("x-api-key", "authorization", "anthropic-version", "anthropic-beta")
+_MERSENNE = (1 << 61) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    response BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    signature BLOB
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_created ON responses (created);
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    scope TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS minhash_lookup ON minhash_bands (scope, band, bucket);
+CREATE INDEX IF NOT EXISTS minhash_key ON minhash_bands (key);
+"""
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identity of one LLM request.
+
+    ``scope`` covers everything except the JD, so near-duplicate lookups only
+    ever compare JDs that went through the same template, model and settings.
+    """
+
+    key: str
+    scope: str
+    stage: str
+    jd: str = ""
+
+
+def request_key(body: Dict[str, Any], stage: str = "") -> CacheKey:
+    """Build the cache key of an Anthropic messages request body."""
+    jd_parts: List[str] = []
+    derived_parts: List[str] = []
+
+    def strip_jd(text: str) -> str:
+        def replace(match: "re.Match[str]") -> str:
+            parts = jd_parts if match.group(2) == NEAR_DUPLICATE_TAG else derived_parts
+            parts.append(match.group(3))
+            return match.group(1) + JD_PLACEHOLDER + match.group(4)
+
+        return _JD_TAG.sub(replace, text)
+
+    messages = []
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            content = strip_jd(content)
+        elif isinstance(content, list):
+            content = [
+                dict(block, text=strip_jd(block["text"])) if "text" in block else block
+                for block in content
+            ]
+        messages.append(dict(message, content=content))
+
+    template = json.dumps(
+        {
+            "model": body.get("model"),
+            "temperature": body.get("temperature", 1.0),
+            "max_tokens": body.get("max_tokens"),
+            "system": body.get("system"),
+            "tools": body.get("tools"),
+            "messages": messages,
+        },
+        sort_keys=True,
+    )
+    jd = normalize("\n".join(jd_parts))
+    derived = normalize("\n".join(derived_parts))
+    if not stage:
+        first_line = prompt_text({"messages": messages}).strip().split("\n", 1)[0]
+        stage = first_line[:60] or "unknown"
+    key = _digest(template, jd, derived) if derived else _digest(template, jd)
+    # A derived block is part of the scope, so near lookups never cross it
+    scope = _digest(template, derived) if derived else _digest(template)
+    return CacheKey(key=key, scope=scope, stage=stage, jd=jd)
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, banded for LSH lookups.
+
+    Tokens containing digits (req IDs, dates, salaries) are dropped before
+    shingling so they cannot make two copies of a posting look different.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle = shingle
+        seeds = [_hash64(f"{seed}:{i}") for i in range(2 * num_perm)]
+        self._perms = [
+            (seeds[2 * i] % (_MERSENNE - 1) + 1, seeds[2 * i + 1] % _MERSENNE)
+            for i in range(num_perm)
+        ]
+        self._format = f"<{num_perm}Q"
+
+    def shingles(self, normalized: str) -> set:
+        words = [word for word in tokens(normalized) if not any(c.isdigit() for c in word)]
+        if len(words) < self.shingle:
+            return {" ".join(words)} if words else set()
+        return {
+            " ".join(words[i : i + self.shingle]) for i in range(len(words) - self.shingle + 1)
+        }
+
+    def signature(self, normalized: str) -> Tuple[int, ...]:
+        hashes = [_hash64(s) for s in self.shingles(normalized)]
+        if not hashes:
+            return tuple([_MERSENNE] * self.num_perm)
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._perms)
+
+    def band_buckets(self, signature: Sequence[int]) -> List[int]:
+        """One signed 64-bit bucket id per band (SQLite INTEGER range)."""
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows : (band + 1) * self.rows]
+            bucket = _hash64(",".join(map(str, rows)))
+            buckets.append(bucket - (1 << 64) if bucket >= (1 << 63) else bucket)
+        return buckets
+
+    def pack(self, signature: Sequence[int]) -> bytes:
+        return struct.pack(self._format, *signature)
+
+    def unpack(self, blob: bytes) -> Tuple[int, ...]:
+        return struct.unpack(self._format, blob)
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    near_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    lookup_seconds: float = 0.0
+    upstream_seconds: float = 0.0
+    saved_seconds: float = 0.0
+    stages: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    def record(self, stage: str, outcome: str) -> None:
+        self.stages[stage][outcome] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            "avg_lookup_ms": 1000 * self.lookup_seconds / lookups if lookups else 0.0,
+            "avg_upstream_s": self.upstream_seconds / self.misses if self.misses else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+            "stages": {stage: dict(counts) for stage, counts in self.stages.items()},
+        }
+
+
+class ResponseCache:
+    """SQLite-backed response store with LRU/age eviction and a MinHash index."""
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+        near_threshold: float = 0.8,
+        hasher: Optional[MinHasher] = None,
+    ):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.near_threshold = near_threshold
+        self.hasher = hasher or MinHasher()
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        self._last_expiry = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def get(self, key: CacheKey) -> Tuple[Optional[bytes], str]:
+        """Return ``(response, HIT | NEAR | MISS)`` and update the counters."""
+        started = time.perf_counter()
+        with self._lock:
+            response, outcome, latency = self._lookup(key)
+            self.stats.lookup_seconds += time.perf_counter() - started
+            if outcome == HIT:
+                self.stats.hits += 1
+            elif outcome == NEAR:
+                self.stats.near_hits += 1
+            else:
+                self.stats.misses += 1
+            self.stats.saved_seconds += latency
+            self.stats.record(key.stage, outcome)
+        return response, outcome
+
+    def _lookup(self, key: CacheKey) -> Tuple[Optional[bytes], str, float]:
+        now = time.time()
+        row = self._db.execute(
+            "SELECT response, latency FROM responses WHERE key = ? AND created >= ?",
+            (key.key, now - self.max_age),
+        ).fetchone()
+        if row is not None:
+            self._touch(key.key, now)
+            return row[0], HIT, row[1]
+        if not key.jd:
+            return None, MISS, 0.0
+
+        signature = self.hasher.signature(key.jd)
+        best: Optional[Tuple[float, str]] = None
+        for candidate in self._candidates(key.scope, signature):
+            found = self._db.execute(
+                "SELECT signature FROM responses WHERE key = ? AND created >= ?",
+                (candidate, now - self.max_age),
+            ).fetchone()
+            if found is None or found[0] is None:
+                continue
+            score = self.hasher.similarity(signature, self.hasher.unpack(found[0]))
+            if score >= self.near_threshold and (best is None or score > best[0]):
+                best = (score, candidate)
+        if best is None:
+            return None, MISS, 0.0
+
+        response, latency = self._db.execute(
+            "SELECT response, latency FROM responses WHERE key = ?", (best[1],)
+        ).fetchone()
+        self._touch(best[1], now)
+        # Remember the exact key too, so the next lookup is a plain hit
+        self._store(key, response, latency, signature, now)
+        return response, NEAR, latency
+
+    def _candidates(self, scope: str, signature: Sequence[int]) -> Iterable[str]:
+        seen = set()
+        for band, bucket in enumerate(self.hasher.band_buckets(signature)):
+            for (candidate,) in self._db.execute(
+                "SELECT key FROM minhash_bands WHERE scope = ? AND band = ? AND bucket = ?",
+                (scope, band, bucket),
+            ):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+    def _touch(self, key: str, now: float) -> None:
+        self._db.execute(
+            "UPDATE responses SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key)
+        )
+
+    def put(self, key: CacheKey, response: bytes, latency: float) -> None:
+        """Store an upstream response that took ``latency`` seconds."""
+        with self._lock:
+            self.stats.upstream_seconds += latency
+            signature = self.hasher.signature(key.jd) if key.jd else None
+            self._store(key, response, latency, signature, time.time())
+            self.evict()
+
+    def _store(
+        self,
+        key: CacheKey,
+        response: bytes,
+        latency: float,
+        signature: Optional[Sequence[int]],
+        now: float,
+    ) -> None:
+        blob = self.hasher.pack(signature) if signature is not None else None
+        self._db.execute("BEGIN")
+        try:
+            old = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key.key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, scope, stage, response, size, latency, created, accessed, signature) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key.key, key.scope, key.stage, response, len(response), latency, now, now, blob),
+            )
+            self._db.execute("DELETE FROM minhash_bands WHERE key = ?", (key.key,))
+            if signature is not None:
+                self._db.executemany(
+                    "INSERT INTO minhash_bands (scope, band, bucket, key) VALUES (?, ?, ?, ?)",
+                    [
+                        (key.scope, band, bucket, key.key)
+                        for band, bucket in enumerate(self.hasher.band_buckets(signature))
+                    ],
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._total_bytes += len(response) - (old[0] if old else 0)
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones down to 90% of
+        ``max_bytes``. Returns the number of entries removed."""
+        with self._lock:
+            now = time.time()
+            doomed: List[Tuple[str, int]] = []
+            if now - self._last_expiry > 60:
+                self._last_expiry = now
+                doomed += self._db.execute(
+                    "SELECT key, size FROM responses WHERE created < ?", (now - self.max_age,)
+                ).fetchall()
+            excess = self._total_bytes - sum(size for _, size in doomed) - self.max_bytes
+            if excess > 0:
+                excess += self.max_bytes // 10
+                skip = {key for key, _ in doomed}
+                for key, size in self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed"
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    if key not in skip:
+                        doomed.append((key, size))
+                        excess -= size
+            if not doomed:
+                return 0
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k, _ in doomed])
+            self._db.executemany(
+                "DELETE FROM minhash_bands WHERE key = ?", [(k,) for k, _ in doomed]
+            )
+            self._db.execute("COMMIT")
+            self._total_bytes -= sum(size for _, size in doomed)
+            return len(doomed)
+
+    def summary(self) -> Dict[str, Any]:
+        """Entry counts, sizes and lifetime hits per stage, read from disk."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT stage, COUNT(*), SUM(size), SUM(hits) FROM responses GROUP BY stage"
+            ).fetchall()
+        return {
+            "entries": sum(r[1] for r in rows),
+            "bytes": sum(r[2] for r in rows),
+            "stages": {r[0]: {"entries": r[1], "bytes": r[2], "hits": r[3]} for r in rows},
+        }
+
+
+class _ProxyHandler(QuietHandler):
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            payload = dict(self.service.cache.stats.to_dict(), disk=self.service.cache.summary())
+            self.send_json(200, payload)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        raw = self.read_body()
+        headers = {"Content-Type": "application/json"}
+        headers.update(
+            {name: self.headers[name] for name in _FORWARDED_HEADERS if self.headers.get(name)}
+        )
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            body = None
+        if not self.path.startswith("/v1/messages") or not isinstance(body, dict) or body.get("stream"):
+            self.service.cache.stats.bypassed += 1
+            response = self.service.upstream.request("POST", self.path, raw, headers)
+            self._reply(
+                response.status, response.body, response.headers.get("content-type", ""), BYPASS
+            )
+            return
+
+        key = request_key(body, self.headers.get("x-cache-stage", ""))
+        status, data, outcome = self.service.fetch(key, self.path, raw, headers)
+        self._reply(status, data, "application/json", outcome)
+
+    def _reply(self, status: int, data: bytes, content_type: str, outcome: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Cache", outcome)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class CachingProxy(BackgroundServer):
+    """Anthropic-compatible HTTP proxy backed by a :class:`ResponseCache`.
+
+    Concurrent identical requests are collapsed: only the first goes upstream
+    and the others wait for its answer. Streaming requests and non-2xx
+    responses are passed through without caching.
+    """
+
+    handler_class = _ProxyHandler
+
+    def __init__(self, cache: ResponseCache, upstream: str = DEFAULT_UPSTREAM):
+        super().__init__()
+        self.cache = cache
+        self.upstream = ConnectionPool(upstream, size=32, timeout=600.0)
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+    def fetch(
+        self, key: CacheKey, path: str, raw: bytes, headers: Dict[str, str]
+    ) -> Tuple[int, bytes, str]:
+        while True:
+            response, outcome = self.cache.get(key)
+            if response is not None:
+                return 200, response, outcome
+            with self._inflight_lock:
+                waiter = self._inflight.get(key.key)
+                if waiter is None:
+                    self._inflight[key.key] = threading.Event()
+                    break
+            waiter.wait()
+            # The leader finished; its response is in the cache unless it failed
+
+        try:
+            started = time.perf_counter()
+            response = self.upstream.request("POST", path, raw, headers)
+            if response.ok:
+                self.cache.put(key, response.body, time.perf_counter() - started)
+            return response.status, response.body, MISS
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key.key).set()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the caching proxy")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8787)
+    serve.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+    serve.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20)
+    serve.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE / 86400)
+    serve.add_argument("--near-threshold", type=float, default=0.8)
+
+    stats = sub.add_parser("stats", help="print what is stored in the cache")
+    clear = sub.add_parser("clear", help="delete every cached response")
+    for command in (serve, stats, clear):
+        command.add_argument("--db", default=".cache/llm-cache.sqlite")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        cache = ResponseCache(
+            args.db,
+            max_bytes=int(args.max_mb * 2**20),
+            max_age=args.max_age_days * 86400,
+            near_threshold=args.near_threshold,
+        )
+        proxy = CachingProxy(cache, args.upstream)
+        print(f"LLM cache on http://{args.host}:{args.port} -> {args.upstream}", file=sys.stderr)
+        proxy.serve_forever(args.port, args.host)
+        cache.close()
+        return 0
+
+    cache = ResponseCache(args.db)
+    try:
+        if args.command == "clear":
+            cache.max_bytes = 0
+            cache.evict()
+        print(json.dumps(cache.summary(), indent=2))
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
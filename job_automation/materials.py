@@ -0,0 +1,480 @@
+"""BM25 index over the candidate's materials for per-JD shortlists.
+
+``jd-resume-generator.json`` reads ``relevant_project/*.md``,
+``relevant_skills.md``, ``edu_master_course.md`` and ``edu_bech_course.md`` in
+full for every JD and pastes them into the prompts, so prompt size grows with
+the project library. This module chunks those files once (a project file is
+one chunk, course and skill files are split into their list items), keeps the
+term counts in a JSON store refreshed by mtime/size and content hash, and
+scores chunks against the ``top_10_skills`` of "Parse JD Analysis" with BM25
+over NumPy posting arrays. The prompts then only see the top-k chunks.
+
+Usage::
+
+    python -m job_automation.materials --data ~/.n8n-files/data refresh
+    python -m job_automation.materials --data ~/.n8n-files/data query --skills analysis.json
+    python -m job_automation.materials --data ~/.n8n-files/data serve --port 8788
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .server import BackgroundServer, QuietHandler
+from .text import normalize, tokens
+
+PROJECTS = "projects"
+MASTER_COURSES = "master_courses"
+BACHELOR_COURSES = "bachelor_courses"
+SKILLS = "skills"
+
+# Kind -> glob relative to the data directory, as read by the workflow
+SOURCES: Dict[str, str] = {
+    PROJECTS: "relevant_project/*.md",
+    MASTER_COURSES: "edu_master_course.md",
+    BACHELOR_COURSES: "edu_bech_course.md",
+    SKILLS: "relevant_skills.md",
+}
+# Shortlist sizes; projects keep a margin over the 3 the LLM has to pick
+DEFAULT_K: Dict[str, int] = {PROJECTS: 6, MASTER_COURSES: 10, BACHELOR_COURSES: 10, SKILLS: 25}
+# Prompt fields of the "Process ..." nodes each kind replaces
+PROMPT_FIELDS: Dict[str, str] = {
+    PROJECTS: "projectsContent",
+    MASTER_COURSES: "masterCoursesContent",
+    BACHELOR_COURSES: "bachelorCoursesContent",
+    SKILLS: "skillsContent",
+}
+DEFAULT_STORE = Path(".cache/materials-index.json")
+STORE_VERSION = 1
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+_MARKUP = re.compile(r"\*\*|__|`|\[([^\]]*)\]\([^)]*\)")
+
+
+@dataclass
+class Chunk:
+    kind: str
+    name: str  # project file name, or the item text
+    text: str
+    source: str
+    terms: Dict[str, int] = field(default_factory=dict)
+    length: int = 0
+
+
+@dataclass
+class Hit:
+    kind: str
+    name: str
+    score: float
+    text: str
+    source: str
+    matched: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RefreshStats:
+    unchanged: int = 0
+    touched: int = 0  # mtime changed, content hash did not
+    indexed: int = 0
+    removed: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.touched or self.indexed or self.removed)
+
+
+def _stem(token: str) -> str:
+    """Fold the plural/-ing forms that JD wording and notes mix freely."""
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Stemmed unigrams plus adjacent bigrams ("machine_learning")."""
+    words = [_stem(t) for t in tokens(normalize(text))]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+def _clean(text: str) -> str:
+    return " ".join(_MARKUP.sub(lambda m: m.group(1) or "", text).split())
+
+
+def chunk_markdown(text: str, kind: str, source: str) -> List[Chunk]:
+    """Split a material file into retrievable chunks.
+
+    Project files stay whole: the LLM needs the full write-up and the file
+    name is the project's key (``[FILE: name]`` in the workflow). Course and
+    skill files are split into list items and paragraphs; ``text`` keeps the
+    heading ("Tools: Docker") for the prompt, ``name`` is the bare item.
+    """
+    if kind == PROJECTS:
+        return [Chunk(kind, Path(source).stem, text.strip(), source)]
+
+    chunks: List[Chunk] = []
+    heading = ""
+    paragraph: List[str] = []
+
+    def add(body: str) -> None:
+        name = _clean(body)
+        if name:
+            chunks.append(Chunk(kind, name, f"{heading}: {name}" if heading else name, source))
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        heading_match = _HEADING.match(stripped)
+        item_match = _ITEM.match(line)
+        if not stripped or heading_match or item_match:
+            if paragraph:
+                add(" ".join(paragraph))
+                paragraph = []
+            if heading_match:
+                heading = _clean(heading_match.group(1))
+            elif item_match:
+                add(item_match.group(1))
+        else:
+            paragraph.append(stripped)
+    if paragraph:
+        add(" ".join(paragraph))
+    return chunks
+
+
+def skill_list(payload: Any) -> List[Any]:
+    """``top_10_skills`` from a "Parse JD Analysis" item, an "Analyze JD"
+    answer, or the list itself."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        if "top_10_skills" in payload:
+            return payload["top_10_skills"] or []
+        for key in ("jdAnalysis", "json"):
+            if isinstance(payload.get(key), dict):
+                return skill_list(payload[key])
+    return []
+
+
+def skill_query(skills: Sequence[Any]) -> List[Tuple[str, List[str], float]]:
+    """``(label, terms, weight)`` per skill; weights decay with the rank.
+
+    Items are strings or ``{"skill": ..., "jd_keywords": [...]}`` objects as
+    returned by "Analyze JD".
+    """
+    query = []
+    for index, item in enumerate(skills):
+        if isinstance(item, dict):
+            label = str(item.get("skill", ""))
+            text = " ".join([label] + [str(k) for k in item.get("jd_keywords") or []])
+        else:
+            label = text = str(item)
+        terms = sorted(set(analyze(text)))
+        if terms:
+            query.append((label, terms, max(0.5, 1.0 - 0.05 * index)))
+    return query
+
+
+class _KindIndex:
+    """BM25 postings for one kind of material (own length and IDF statistics)."""
+
+    def __init__(self, chunks: List[Chunk], k1: float, b: float):
+        self.chunks = chunks
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc, chunk in enumerate(chunks):
+            for term, count in chunk.terms.items():
+                postings.setdefault(term, []).append((doc, count))
+
+        lengths = np.array([c.length for c in chunks], dtype=np.float32)
+        average = float(lengths.mean()) if len(chunks) else 1.0
+        self.vocabulary: Dict[str, int] = {}
+        offsets = [0]
+        docs: List[int] = []
+        counts: List[int] = []
+        dfs: List[int] = []
+        for term, entries in postings.items():
+            self.vocabulary[term] = len(offsets) - 1
+            docs.extend(d for d, _ in entries)
+            counts.extend(c for _, c in entries)
+            dfs.append(len(entries))
+            offsets.append(len(docs))
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.docs = np.array(docs, dtype=np.int32)
+        tf = np.array(counts, dtype=np.float32)
+        df = np.repeat(np.array(dfs, dtype=np.float32), np.diff(self.offsets))
+        idf = np.log1p((len(chunks) - df + 0.5) / (df + 0.5))
+        norm = k1 * (1 - b + b * lengths[self.docs] / max(average, 1e-9))
+        # Per-posting BM25 contribution; a query is a sum of slices of this
+        self.weights = (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+    def scores(self, query: List[Tuple[str, List[str], float]]) -> np.ndarray:
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        weights: Counter = Counter()
+        for _, terms, weight in query:
+            for term in terms:
+                weights[term] += weight
+        for term, weight in weights.items():
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                scores[self.docs[start:end]] += weight * self.weights[start:end]
+        return scores
+
+    def top(self, query: List[Tuple[str, List[str], float]], k: int, pad: bool = False) -> List[Hit]:
+        """Best ``k`` chunks; unmatched chunks only fill up the list with ``pad``."""
+        if not self.chunks or k <= 0:
+            return []
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        # Highest score first; ties keep file order so results are stable
+        best = best[np.lexsort((best, -scores[best]))]
+        hits = []
+        for doc in best:
+            if not pad and scores[doc] <= 0:
+                break
+            chunk = self.chunks[doc]
+            matched = [label for label, terms, _ in query if any(t in chunk.terms for t in terms)]
+            hits.append(Hit(chunk.kind, chunk.name, round(float(scores[doc]), 4), chunk.text, chunk.source, matched))
+        return hits
+
+
+class MaterialsIndex:
+    """Chunked, incrementally refreshed index of one n8n data directory."""
+
+    def __init__(
+        self,
+        data_dir,
+        store: Optional[Path] = DEFAULT_STORE,
+        sources: Optional[Dict[str, str]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.data_dir = Path(data_dir)
+        self.store = Path(store) if store else None
+        self.sources = dict(SOURCES if sources is None else sources)
+        self.k1, self.b = k1, b
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Optional[Dict[str, _KindIndex]] = None
+        self._lock = threading.Lock()
+        if self.store and self.store.exists():
+            saved = json.loads(self.store.read_text(encoding="utf-8"))
+            if saved.get("version") == STORE_VERSION and saved.get("data_dir") == str(self.data_dir.resolve()):
+                self._files = saved["files"]
+
+    def refresh(self) -> RefreshStats:
+        """Re-chunk only files whose content changed since the last refresh.
+
+        Unchanged mtime and size skip the file without reading it; otherwise
+        the SHA-256 decides whether the cached chunks are still valid.
+        """
+        with self._lock:
+            stats = RefreshStats()
+            seen = set()
+            for kind, pattern in self.sources.items():
+                for path in sorted(glob.glob(str(self.data_dir / pattern))):
+                    relative = os.path.relpath(path, self.data_dir)
+                    seen.add(relative)
+                    self._refresh_file(kind, Path(path), relative, stats)
+            for relative in set(self._files) - seen:
+                del self._files[relative]
+                stats.removed += 1
+            if stats.changed:
+                self._indexes = None
+                self._save()
+            return stats
+
+    def _refresh_file(self, kind: str, path: Path, relative: str, stats: RefreshStats) -> None:
+        stat = path.stat()
+        entry = self._files.get(relative)
+        if entry and entry["kind"] == kind and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            stats.unchanged += 1
+            return
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["kind"] == kind and entry["sha256"] == digest:
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            stats.touched += 1
+            return
+        chunks = []
+        for chunk in chunk_markdown(data.decode("utf-8", "replace"), kind, relative):
+            # Items are indexed without their heading: "Data & BI" must not
+            # make every item below it match "Power BI"
+            terms = analyze(chunk.name + "\n" + chunk.text if kind == PROJECTS else chunk.name)
+            chunks.append({"name": chunk.name, "text": chunk.text, "terms": dict(Counter(terms)), "length": len(terms)})
+        self._files[relative] = {
+            "kind": kind,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "chunks": chunks,
+        }
+        stats.indexed += 1
+
+    def _save(self) -> None:
+        if not self.store:
+            return
+        self.store.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.store.with_suffix(".tmp")
+        payload = {"version": STORE_VERSION, "data_dir": str(self.data_dir.resolve()), "files": self._files}
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self.store)
+
+    def _kind_indexes(self) -> Dict[str, _KindIndex]:
+        with self._lock:
+            if self._indexes is None:
+                grouped: Dict[str, List[Chunk]] = {kind: [] for kind in self.sources}
+                for relative in sorted(self._files):
+                    entry = self._files[relative]
+                    for item in entry["chunks"]:
+                        grouped.setdefault(entry["kind"], []).append(
+                            Chunk(entry["kind"], item["name"], item["text"], relative, item["terms"], item["length"])
+                        )
+                self._indexes = {kind: _KindIndex(chunks, self.k1, self.b) for kind, chunks in grouped.items()}
+            return self._indexes
+
+    def __len__(self) -> int:
+        return sum(len(entry["chunks"]) for entry in self._files.values())
+
+    def search(self, skills: Sequence[Any], kind: str, k: int = 10) -> List[Hit]:
+        """Top ``k`` chunks of ``kind`` for ``top_10_skills``, best first."""
+        index = self._kind_indexes().get(kind)
+        return index.top(skill_query(skills), k, pad=kind == PROJECTS) if index else []
+
+    def shortlist(self, skills: Sequence[Any], k: Optional[Dict[str, int]] = None) -> Dict[str, List[Hit]]:
+        limits = dict(DEFAULT_K, **(k or {}))
+        query = skill_query(skills)
+        hits = {}
+        for kind, index in self._kind_indexes().items():
+            # Projects are padded: "Select Top 3 Projects" must always get three
+            hits[kind] = index.top(query, limits.get(kind, 10), pad=kind == PROJECTS)
+            if not hits[kind] and kind in (MASTER_COURSES, BACHELOR_COURSES):
+                # No course names a skill: send the whole list, as the
+                # workflow does today, rather than an empty degree
+                hits[kind] = index.top(query, len(index.chunks), pad=True)
+        return hits
+
+    def prompt_fields(self, skills: Sequence[Any], k: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Drop-in values for the "Process ..." nodes, built from the shortlist.
+
+        Projects keep the workflow's ``[FILE: name]`` markers and
+        ``projectsMap`` so "Parse Selected Projects" works unchanged.
+        """
+        hits = self.shortlist(skills, k)
+        fields: Dict[str, Any] = {}
+        for kind, field_name in PROMPT_FIELDS.items():
+            selected = hits.get(kind, [])
+            if kind == PROJECTS:
+                fields[field_name] = "".join(f"[FILE: {h.name}]\n{h.text}\n\n" for h in selected)
+                fields["projectsMap"] = {h.name: h.text for h in selected}
+            elif kind == SKILLS:
+                fields[field_name] = "\n".join(f"- {h.text}" for h in selected)
+            else:
+                # The course prompts ask for names exactly as listed
+                fields[field_name] = "\n".join(f"- {h.name}" for h in selected)
+        fields["shortlist"] = {kind: [h.to_dict() for h in selected] for kind, selected in hits.items()}
+        return fields
+
+
+def parse_limits(value: Any) -> Optional[Dict[str, int]]:
+    """Validate a ``{"kind": k}`` object; raises ``ValueError`` otherwise."""
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise ValueError(f"k must be an object of per-kind limits like {json.dumps(DEFAULT_K)}")
+    for kind, k in value.items():
+        if kind not in SOURCES:
+            raise ValueError(f"unknown kind {kind!r} in k (expected one of {', '.join(SOURCES)})")
+        if isinstance(k, bool) or not isinstance(k, int) or k < 0:
+            raise ValueError(f"k[{kind!r}] must be a non-negative integer, got {k!r}")
+    return value
+
+
+class _ShortlistHandler(QuietHandler):
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/shortlist":
+            self.send_json(404, {"error": "not found"})
+            return
+        try:
+            payload = json.loads(self.read_body() or b"{}")
+        except ValueError as exc:
+            self.send_json(400, {"error": f"invalid JSON: {exc}"})
+            return
+        try:
+            limits = parse_limits(payload.get("k") if isinstance(payload, dict) else None)
+        except ValueError as exc:
+            self.send_json(400, {"error": str(exc)})
+            return
+        self.service.count_request()
+        index = self.service.index
+        index.refresh()
+        self.send_json(200, index.prompt_fields(skill_list(payload), limits))
+
+
+class ShortlistServer(BackgroundServer):
+    """``POST /shortlist`` with a "Parse JD Analysis" item (or ``top_10_skills``)
+    returns the shortlisted prompt fields; files are re-checked per request."""
+
+    handler_class = _ShortlistHandler
+
+    def __init__(self, index: MaterialsIndex):
+        super().__init__()
+        self.index = index
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data", default=".", help="directory holding relevant_project/ and the .md files")
+    parser.add_argument("--store", default=str(DEFAULT_STORE))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="re-chunk changed files")
+    query = sub.add_parser("query", help="shortlist materials for a JD analysis")
+    query.add_argument("--skills", required=True, help="JSON file: Parse JD Analysis output or a skill list")
+    query.add_argument("-k", type=int, help="results per kind (default: per-kind defaults)")
+    query.add_argument("--json", action="store_true", help="print the prompt fields as JSON")
+    serve = sub.add_parser("serve", help="serve POST /shortlist")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8788)
+    args = parser.parse_args(argv)
+
+    index = MaterialsIndex(args.data, Path(args.store))
+    stats = index.refresh()
+    if args.command == "refresh":
+        print(f"{len(index)} chunks: {asdict(stats)}")
+        return 0
+    if args.command == "serve":
+        print(f"shortlist server on http://{args.host}:{args.port}/shortlist", file=sys.stderr)
+        ShortlistServer(index).serve_forever(args.port, args.host)
+        return 0
+
+    skills = skill_list(json.loads(Path(args.skills).read_text(encoding="utf-8")))
+    limits = {kind: args.k for kind in SOURCES} if args.k else None
+    if args.json:
+        print(json.dumps(index.prompt_fields(skills, limits), indent=2))
+        return 0
+    for kind, hits in index.shortlist(skills, limits).items():
+        print(f"{kind}:")
+        for hit in hits:
+            print(f"  {hit.score:7.3f}  {hit.name[:60]:<60}  {', '.join(hit.matched)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
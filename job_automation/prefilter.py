@@ -0,0 +1,412 @@
+"""Deterministic pre-filter for ``/batch-jd-processor``.
+
+Most JDs in a nightly run are settled by ``filter-criteria.yaml`` alone: a
+``job_scope.reject_if_contains`` phrase, a required PhD, a city outside the
+``location`` list, a ``5+ years`` requirement above ``experience.max_years`` or
+a salary range topping out below ``salary.min_salary``.
+This module compiles the criteria once into a single phrase matcher and
+classifies every JD as
+
+* ``REJECT`` - a hard rule fired (the rule and matched text are reported),
+* ``PASS`` - every hard rule was checked and positively satisfied,
+* ``NEEDS_LLM`` - something could not be decided from text alone.
+
+Only ``NEEDS_LLM`` rows need to go to the Claude sub-agents.
+
+Usage::
+
+    python -m job_automation.prefilter --criteria examples/filter-criteria.yaml \\
+        jds.jsonl -o decisions.jsonl --llm-queue needs_llm.jsonl --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import yaml
+
+from .ingest import CAD_RATES, parse_salary
+from .records import iter_records, write_jsonl
+from .text import flatten, normalize, tokens
+
+PASS = "PASS"
+REJECT = "REJECT"
+NEEDS_LLM = "NEEDS_LLM"
+
+REJECT_PHRASE = "job_scope.reject_if_contains"
+REJECT_EDUCATION = "education.reject_if_requires"
+REQUIRED_SKILL = "required_skills"
+LOCATION = "location"
+MAX_YEARS = "experience.max_years"
+MIN_SALARY = "salary.min_salary"
+
+# Location entries that describe an arrangement rather than a place; they never
+# accept a JD on their own, the city (or "Remote (Canada)") has to match.
+_ARRANGEMENT_ONLY = {"hybrid", "remote", "on site", "onsite", "in office"}
+_PREFERENCE_MARKERS = re.compile(
+    r"\b(prefer\w*|asset|nice to have|bonus|plus|ideally|desirable|advantage)\b"
+)
+# A required degree in a sentence like "we do not require a PhD" or "PhD or
+# equivalent experience" is no hard requirement, and neither is "no cold
+# calling involved"; the sub-agent reads those
+_HEDGED_REQUIREMENT = re.compile(
+    r"\b(not|no|nor|without|never|don t|doesn t|isn t|aren t|or equivalent|or comparable|or similar)\b"
+)
+# "Master s degree or PhD": the phrase is one of several accepted options
+_ALTERNATIVE_BEFORE = re.compile(r"\bor $")
+_ALTERNATIVE_AFTER = re.compile(r" or\b")
+# Skills that are also ordinary words or letters ("R&D", "you will excel in")
+# only count when written exactly as configured, in the original text
+_COMMON_WORD_SKILLS = frozenset({"access", "excel", "go", "outlook", "spark", "swift", "teams", "word"})
+_YEARS = re.compile(
+    r"\b(?:at least |minimum |minimum of |min )?(\d{1,2})(?:\+|-(\d{1,2}))? (?:years?|yrs?)\b"
+)
+_SEGMENT_SPLIT = re.compile(r"[.;!?]\s+|\n+")
+
+
+@dataclass
+class Decision:
+    verdict: str
+    rule: str = ""
+    matched: str = ""
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+class _Document:
+    """A JD normalized once, one sentence per line.
+
+    Structured ``requirements.preferred`` items are always "preferred"; other
+    sentences are judged by their wording ("... is an asset").
+    """
+
+    def __init__(self, record: Dict[str, Any]):
+        requirements = record.get("requirements")
+        preferred_items: List[str] = []
+        if isinstance(requirements, dict):
+            preferred_items = list(flatten(requirements.get("preferred")))
+            required_items = [v for k, v in requirements.items() if k != "preferred"]
+        else:
+            required_items = [requirements]
+        fields = [record.get("position"), record.get("description")]
+        fields += [record.get("responsibilities"), required_items]
+
+        preferred = normalize("\n".join(preferred_items), keep_lines=True)
+        rest = "\n".join(_SEGMENT_SPLIT.sub("\n", text) for text in flatten(fields))
+        self.text = "\n".join(filter(None, [preferred, normalize(rest, keep_lines=True)]))
+        self._fields = [preferred_items, fields]
+
+        self.line_starts = [0]
+        self.line_starts += [m.end() for m in re.finditer("\n", self.text)]
+        self.preferred = set(range(preferred.count("\n") + 1 if preferred else 0))
+        self.preferred.update(
+            self.line_of(m.start()) for m in _PREFERENCE_MARKERS.finditer(self.text)
+        )
+
+    def raw(self) -> str:
+        """The JD as written, for the few matches where case matters."""
+        return "\n".join(flatten(self._fields))
+
+    def line_of(self, position: int) -> int:
+        return bisect_right(self.line_starts, position) - 1
+
+    def line(self, index: int) -> str:
+        return self.text[self.line_starts[index] : self._line_end(index)]
+
+    def hedged(self, start: int, end: int, alternatives: bool = True) -> bool:
+        """Whether the phrase at ``start:end`` is negated or one of alternatives."""
+        index = self.line_of(start)
+        if _HEDGED_REQUIREMENT.search(self.line(index)):
+            return True
+        if not alternatives:
+            return False
+        before = self.text[self.line_starts[index] : start]
+        after = self.text[end : self._line_end(index)]
+        return bool(_ALTERNATIVE_BEFORE.search(before) or _ALTERNATIVE_AFTER.match(after))
+
+    def _line_end(self, index: int) -> Optional[int]:
+        return self.line_starts[index + 1] - 1 if index + 1 < len(self.line_starts) else None
+
+
+class PhraseMatcher:
+    """Match many normalized phrases in one pass.
+
+    All phrases are compiled into one alternation (longest first, anchored on
+    token boundaries), so the cost per JD does not grow with the number of
+    rules the way a loop of ``in`` checks does.
+    """
+
+    def __init__(self, rules: Dict[str, Sequence[str]]):
+        self._rules: Dict[str, List[Tuple[str, str]]] = {}
+        for rule, phrases in rules.items():
+            for phrase in phrases:
+                key = normalize(phrase)
+                if key:
+                    self._rules.setdefault(key, []).append((rule, phrase))
+        alternation = "|".join(
+            re.escape(key) for key in sorted(self._rules, key=len, reverse=True)
+        )
+        self._pattern = (
+            re.compile(r"(?<![a-z0-9+])(?:" + alternation + r")(?![a-z0-9+])")
+            if alternation
+            else None
+        )
+
+    def finditer(self, normalized: str) -> Iterator[Tuple[str, str, int, int]]:
+        """Yield ``(rule, original phrase, start, end)`` for every hit."""
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(normalized):
+            for rule, phrase in self._rules[match.group(0)]:
+                yield rule, phrase, match.start(), match.end()
+
+
+class CompiledCriteria:
+    """``filter-criteria.yaml`` compiled for repeated classification."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        job_scope = config.get("job_scope") or {}
+        education = config.get("education") or {}
+        experience = config.get("experience") or {}
+
+        skills = list(flatten(config.get("required_skills")))
+        exact = [skill for skill in skills if _is_common_word(skill)]
+        self.matcher = PhraseMatcher(
+            {
+                REJECT_PHRASE: job_scope.get("reject_if_contains") or [],
+                REJECT_EDUCATION: education.get("reject_if_requires") or [],
+                REQUIRED_SKILL: [skill for skill in skills if skill not in exact],
+            }
+        )
+        self.exact_skills = (
+            re.compile(
+                r"(?<![\w&+#])(?:"
+                + "|".join(re.escape(skill.strip()) for skill in sorted(exact, key=len, reverse=True))
+                + r")(?![\w&+#])"
+            )
+            if exact
+            else None
+        )
+        self.max_years: Optional[int] = experience.get("max_years")
+        salary = config.get("salary") or {}
+        self.min_salary: Optional[float] = None
+        if salary.get("min_salary") is not None:
+            rate = CAD_RATES.get(str(salary.get("currency") or "CAD").upper(), 1.0)
+            self.min_salary = float(salary["min_salary"]) * rate
+        self.locations: List[Tuple[str, frozenset]] = []
+        for entry in config.get("location") or []:
+            norm = normalize(entry)
+            if not norm or norm in _ARRANGEMENT_ONLY:
+                continue
+            place = normalize(entry.split(",")[0])
+            self.locations.append((entry, frozenset(tokens(place))))
+
+    @classmethod
+    def from_file(cls, path) -> "CompiledCriteria":
+        with open(path, encoding="utf-8") as handle:
+            return cls(yaml.safe_load(handle) or {})
+
+    def classify(self, record: Dict[str, Any]) -> Decision:
+        document = _Document(record)
+        unknown: List[str] = []
+        skill = ""
+
+        for rule, phrase, start, end in self.matcher.finditer(document.text):
+            if rule == REJECT_PHRASE:
+                # "cold calling or door-to-door" rejects either way
+                if not document.hedged(start, end, alternatives=False):
+                    return Decision(REJECT, rule, phrase, f"JD contains '{phrase}'")
+                hedged = f"'{phrase}' negated"
+            elif rule == REJECT_EDUCATION and document.line_of(start) not in document.preferred:
+                if not document.hedged(start, end):
+                    return Decision(REJECT, rule, phrase, f"JD requires {phrase}")
+                hedged = f"{phrase} requirement negated or with an alternative"
+            else:
+                skill = skill or (phrase if rule == REQUIRED_SKILL else "")
+                continue
+            if hedged not in unknown:
+                unknown.append(hedged)
+
+        if not skill and self.exact_skills is not None:
+            match = self.exact_skills.search(document.raw())
+            skill = match.group(0) if match else ""
+
+        years = _required_years(document)
+        if years is not None and self.max_years is not None and years > self.max_years:
+            return Decision(
+                REJECT,
+                MAX_YEARS,
+                f"{years}+ years",
+                f"requires {years}+ years, max is {self.max_years}",
+            )
+
+        salary = record.get("salary_cad") or parse_salary(str(record.get("salary_range") or ""), bare=True)
+        if salary and self.min_salary is not None and salary["max"] < self.min_salary:
+            return Decision(
+                REJECT,
+                MIN_SALARY,
+                str(record.get("salary_range") or ""),
+                f"pays at most {salary['max']:,} CAD/year, minimum is {self.min_salary:,.0f}",
+            )
+
+        location_decision = self._check_location(record)
+        if location_decision is not None:
+            if location_decision.verdict == REJECT:
+                return location_decision
+            unknown.append(location_decision.reason)
+
+        if not skill:
+            unknown.append("no required skill mentioned verbatim")
+
+        if unknown:
+            return Decision(NEEDS_LLM, reason="; ".join(unknown))
+        return Decision(PASS, REQUIRED_SKILL, skill, f"all hard criteria satisfied; names {skill}")
+
+    def _check_location(self, record: Dict[str, Any]) -> Optional[Decision]:
+        if not self.locations:
+            return None
+        raw = " ".join(flatten(record.get("location")))
+        found = set(tokens(normalize(raw)))
+        if not found:
+            return Decision(NEEDS_LLM, LOCATION, reason="location not stated")
+        for _, wanted in self.locations:
+            if wanted <= found:
+                return None
+        if "remote" in found:
+            return Decision(NEEDS_LLM, LOCATION, raw, f"remote location '{raw}' unclear")
+        return Decision(REJECT, LOCATION, raw, f"location '{raw}' not in accepted list")
+
+
+def _is_common_word(skill: str) -> bool:
+    key = normalize(skill)
+    return len(key) <= 2 or key in _COMMON_WORD_SKILLS
+
+
+def _required_years(document: _Document) -> Optional[int]:
+    """Largest minimum-years requirement stated in a non-preferred sentence."""
+    required = None
+    for match in _YEARS.finditer(document.text):
+        line = document.line_of(match.start())
+        if line in document.preferred or "experience" not in document.line(line):
+            continue
+        years = int(match.group(1))
+        required = years if required is None else max(required, years)
+    return required
+
+
+# -- process pool -----------------------------------------------------------
+
+_worker_criteria: Optional[CompiledCriteria] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    global _worker_criteria
+    _worker_criteria = CompiledCriteria(config)
+
+
+def _classify_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    assert _worker_criteria is not None
+    return [_worker_criteria.classify(record).to_dict() for record in batch]
+
+
+def classify_stream(
+    records: Iterable[Dict[str, Any]],
+    criteria: CompiledCriteria,
+    workers: int = 1,
+    batch_size: int = 256,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, str]]]:
+    """Yield ``(record, decision)`` pairs in input order.
+
+    With ``workers > 1`` batches are classified in a process pool, each worker
+    compiling the criteria once. At most ``2 * workers`` batches are in flight,
+    so memory stays bounded however long the input is.
+    """
+    records = iter(records)
+    batches = iter(lambda: list(itertools.islice(records, batch_size)), [])
+    if workers <= 1:
+        for batch in batches:
+            for record in batch:
+                yield record, criteria.classify(record).to_dict()
+        return
+
+    pending: deque = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(criteria.config,)
+    ) as pool:
+        for batch in batches:
+            pending.append((batch, pool.submit(_classify_batch, batch)))
+            if len(pending) >= 2 * workers:
+                yield from _drain_one(pending)
+        while pending:
+            yield from _drain_one(pending)
+
+
+def _drain_one(pending: deque) -> Iterator[Tuple[Dict[str, Any], Dict[str, str]]]:
+    batch, future = pending.popleft()
+    yield from zip(batch, future.result())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JD records (.jsonl, .csv, .json or - for stdin)")
+    parser.add_argument("--criteria", default="examples/filter-criteria.yaml")
+    parser.add_argument("-o", "--output", help="decisions JSONL (default: stdout)")
+    parser.add_argument("--llm-queue", help="write full NEEDS_LLM records here")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    criteria = CompiledCriteria.from_file(args.criteria)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    queue = open(args.llm_queue, "w", encoding="utf-8") if args.llm_queue else None
+    counts: Counter = Counter()
+    started = time.perf_counter()
+    try:
+        stream = classify_stream(
+            iter_records(args.input), criteria, args.workers, args.batch_size
+        )
+        for index, (record, decision) in enumerate(stream):
+            counts[decision["verdict"]] += 1
+            row = {
+                "index": index,
+                "job_url": record.get("job_url", ""),
+                "position": record.get("position", ""),
+                "company": record.get("company", ""),
+                **decision,
+            }
+            write_jsonl([row], out)
+            if queue is not None and decision["verdict"] == NEEDS_LLM:
+                write_jsonl([record], queue)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if queue is not None:
+            queue.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    rate = total / elapsed if elapsed else 0.0
+    print(
+        f"{total} JDs in {elapsed:.2f}s ({rate:,.0f} JDs/sec): "
+        + json.dumps(dict(counts)),
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Streaming readers and writers for JD records.
+
+Records follow the shape of ``examples/sample-jd.json``. JSONL and CSV inputs
+are read one row at a time so a nightly crawl never has to fit in memory; a
+plain ``.json`` file (a single record or a list) is accepted for convenience.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import sys
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+PathLike = Union[str, Path]
+
+# CSV exports from the extraction skills store list fields as JSON strings
+_JSON_COLUMNS = ("responsibilities", "requirements", "benefits")
+_HEADER_FIELDS = (
+    ("Position", "position"),
+    ("Company", "company"),
+    ("Location", "location"),
+    ("Salary", "salary_range"),
+    ("URL", "job_url"),
+)
+# Query parameters that identify a visit, not a posting
+_TRACKING = re.compile(r"^(utm_\w+|ref|refid|trk\w*|source|src|gh_src|lever-\w+|trackingid|fbclid|gclid)$", re.I)
+_LINKEDIN_JOB = re.compile(r"(?:currentjobid=|/jobs/view/(?:[^/?#]*-)?)(\d+)", re.I)
+
+
+def _decode_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    record: Dict[str, Any] = dict(row)
+    for column in _JSON_COLUMNS:
+        value = record.get(column)
+        if isinstance(value, str) and value[:1] in "[{":
+            try:
+                record[column] = json.loads(value)
+            except ValueError:
+                pass
+    return record
+
+
+def iter_records(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """Yield JD records from a ``.jsonl``, ``.csv`` or ``.json`` file.
+
+    ``-`` reads JSONL from stdin. Blank JSONL lines are skipped.
+    """
+    if str(path) == "-":
+        yield from _iter_jsonl(sys.stdin)
+        return
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as handle:
+            for row in csv.DictReader(handle):
+                yield _decode_csv_row(row)
+    elif suffix == ".json":
+        with path.open(encoding="utf-8") as handle:
+            data = json.load(handle)
+        yield from data if isinstance(data, list) else [data]
+    else:
+        with path.open(encoding="utf-8") as handle:
+            yield from _iter_jsonl(handle)
+
+
+def _iter_jsonl(handle: IO[str]) -> Iterator[Dict[str, Any]]:
+    for line in handle:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], handle: IO[str]) -> int:
+    """Write ``records`` to an open text handle, one JSON object per line."""
+    count = 0
+    for record in records:
+        handle.write(json.dumps(record, ensure_ascii=False))
+        handle.write("\n")
+        count += 1
+    return count
+
+
+def job_description(record: Dict[str, Any]) -> str:
+    """Plain-text JD for the generation webhooks (``{"jobDescription": ...}``).
+
+    A record that already carries ``jobDescription`` is passed through;
+    otherwise the ``sample-jd.json`` fields are laid out as labelled sections.
+    """
+    if record.get("jobDescription"):
+        return str(record["jobDescription"])
+    lines = []
+    for label, field in _HEADER_FIELDS:
+        if record.get(field):
+            lines.append(f"{label}: {record[field]}")
+    if record.get("description"):
+        lines += ["", str(record["description"])]
+    requirements = record.get("requirements") or {}
+    sections = [
+        ("Responsibilities", record.get("responsibilities")),
+        ("Required", requirements.get("required") if isinstance(requirements, dict) else requirements),
+        ("Preferred", requirements.get("preferred") if isinstance(requirements, dict) else None),
+        ("Benefits", record.get("benefits")),
+    ]
+    for title, items in sections:
+        if items:
+            lines += ["", f"{title}:"] + [f"- {item}" for item in (items if isinstance(items, list) else [items])]
+    return "\n".join(lines)
+
+
+def url_key(url: str) -> str:
+    """Normalize a job URL: no scheme, ``www.``, fragment, trailing slash or tracking parameters."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url if "//" in url else "//" + url)
+    host = parts.netloc.lower().rsplit("@", 1)[-1]
+    host = host[4:] if host.startswith("www.") else host
+    if host.endswith("linkedin.com"):
+        match = _LINKEDIN_JOB.search(url)
+        if match:
+            return f"linkedin.com/jobs/view/{match.group(1)}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING.match(k))
+    key = host + (parts.path.rstrip("/") or "")
+    return key + ("?" + urlencode(query) if query else "")
@@ -0,0 +1,94 @@
+"""Minimal threaded HTTP server plumbing shared by the services and fakes."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+class BackgroundServer:
+    """Run a ``ThreadingHTTPServer`` on a daemon thread.
+
+    Subclasses set ``handler_class``; each handler instance reaches the owning
+    object through ``self.service``. ``port=0`` picks a free port.
+    """
+
+    handler_class: type
+
+    def __init__(self) -> None:
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def start(self, port: int = 0, host: str = "127.0.0.1") -> "BackgroundServer":
+        handler = type("Handler", (self.handler_class,), {"service": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def serve_forever(self, port: int, host: str = "127.0.0.1") -> None:
+        """Serve in the foreground until interrupted (used by the CLIs)."""
+        self.start(port, host)
+        try:
+            assert self._thread is not None
+            while self._thread.is_alive():
+                self._thread.join(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler without per-request logging."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle plus the
+    # client's delayed ACK adds ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+    service: Any
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_bytes(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, payload: Any) -> None:
+        self.send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json")
@@ -0,0 +1,694 @@
+"""Streaming structured output for the JSON answers of the generation chain.
+
+Every "Parse ..." node of ``jd-resume-generator.json`` and
+``cover-letter-generator.json`` waits for the whole answer, runs
+``content.match(/\\{[\\s\\S]*\\}/)`` and ``JSON.parse``, and on any stray brace
+falls back to empty results (``top_10_skills: []``), which costs a full
+re-run. This module reads the answer as a ``"stream": true`` Messages API
+response instead:
+
+* :class:`JsonStream` parses the JSON object incrementally. Prose or a
+  markdown fence before it and anything after it are ignored. Each top-level
+  field, and each element of a top-level list, is reported and checked
+  against the stage's :class:`OutputSchema` as soon as it closes. The ranked
+  skills of "Analyze JD" are usable while the model is still writing.
+* A syntax error, a bad element, a cut-off answer or a missing required field
+  stops the stream. The call is repeated with the valid prefix (up to the
+  last good field or element) as an assistant prefill, so only the broken
+  tail is generated again. The prefix stops one field or element short of the
+  failure, because a stray ``}`` closes an element early and leaves it valid
+  but cut. A tail retry that fails is followed by a run of the whole prompt,
+  and ``max_repairs`` counts those runs like the re-runs of today, so the
+  tail retries only ever add chances.
+* Numbers the model quoted (``"rank": "1"``) are read as numbers where the
+  schema expects one, rather than failing the element.
+
+Usage::
+
+    python -m job_automation.structured call prompt.txt --schema jd_analysis
+    python -m job_automation.structured parse answer.txt --schema impact
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .anthropic import prompt_text, sse_events
+from .httpclient import ConnectionPool
+
+DEFAULT_URL = os.environ.get("ANTHROPIC_BASE_URL", "https://api.anthropic.com")
+DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+API_VERSION = "2023-06-01"
+
+_KINDS = {str: "string", list: "list", dict: "object", int: "number", float: "number", bool: "boolean"}
+
+# Outside strings: a structural character, the start of a string, or a scalar
+_TOKEN = re.compile(r'\s*(?:([{}\[\]:,])|(")|([^\s{}\[\]:,"]+))?')
+_STRING_END = re.compile(r'["\\]')
+_TRAILING = re.compile(r"\s*(\S)?")
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_QUOTED_NUMBER = re.compile(r"\s*-?\d+(\.\d+)?\s*")
+
+# Parser states of the innermost open object or array
+_KEY_OR_END = "key_or_end"
+_KEY = "key"
+_IN_KEY = "in_key"
+_COLON = "colon"
+_VALUE = "value"
+_VALUE_OR_END = "value_or_end"
+_COMMA_OR_END = "comma_or_end"
+
+_NETWORK_ERRORS = (OSError, http.client.HTTPException)
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """Expected JSON answer of one stage.
+
+    ``fields`` and ``elements`` map names to kinds (``string``, ``number``,
+    ``list``, ``object``, ``boolean``). ``elements`` gives the kind of the
+    entries of a list field, or the keys of its object entries; a ``?`` suffix
+    makes a key optional. A required list must not be empty.
+    """
+
+    name: str
+    marker: str
+    fields: Dict[str, str]
+    required: Tuple[str, ...]
+    elements: Dict[str, Any] = field(default_factory=dict)
+
+    def coerce(self, name: str, value: Any, element: bool = False) -> Any:
+        """``value`` of field ``name`` (or one of its elements) with quoted
+        numbers turned into numbers where the schema expects a number."""
+        if not element:
+            if self.fields.get(name) == "number":
+                return _number(value)
+            if isinstance(value, list) and name in self.elements:
+                return [self.coerce(name, item, element=True) for item in value]
+            return value
+        spec = self.elements.get(name)
+        if spec == "number":
+            return _number(value)
+        if isinstance(spec, dict) and isinstance(value, dict):
+            return {k: _number(v) if spec.get(k, "").rstrip("?") == "number" else v for k, v in value.items()}
+        return value
+
+    def field_error(self, name: str, value: Any) -> Optional[str]:
+        kind = self.fields.get(name)
+        if kind and value is not None and _KINDS.get(type(value)) != kind:
+            return f"{name} should be a {kind}"
+        if name in self.required and value in ([], {}, "", None):
+            return f"{name} is empty"
+        return None
+
+    def element_error(self, name: str, index: int, value: Any) -> Optional[str]:
+        spec = self.elements.get(name)
+        where = f"{name}[{index}]"
+        if spec is None:
+            return None
+        if isinstance(spec, str):
+            if _KINDS.get(type(value)) != spec or value == "":
+                return f"{where} should be a non-empty {spec}"
+            return None
+        if not isinstance(value, dict):
+            return f"{where} should be an object"
+        for key, kind in spec.items():
+            optional = kind.endswith("?")
+            item = value.get(key)
+            if item is None:
+                if not optional:
+                    return f"{where} has no {key}"
+            elif _KINDS.get(type(item)) != kind.rstrip("?"):
+                return f"{where}.{key} should be a {kind.rstrip('?')}"
+        return None
+
+    def missing(self, fields: Dict[str, Any]) -> List[str]:
+        return [name for name in self.required if name not in fields]
+
+
+def _number(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    match = _QUOTED_NUMBER.fullmatch(value)
+    if match is None:
+        return value
+    return float(value) if match.group(1) else int(value)
+
+
+# One per "Parse ..." node; the marker is a key only that stage's prompt asks for
+SCHEMAS: Dict[str, OutputSchema] = {
+    schema.name: schema
+    for schema in (
+        OutputSchema(
+            "cover_letter",
+            "cover_letter_text",
+            {"cover_letter_text": "string", "key_points_highlighted": "list", "tone_analysis": "string"},
+            ("cover_letter_text",),
+            {"key_points_highlighted": "string"},
+        ),
+        OutputSchema(
+            "impact",
+            "impact_sentences",
+            {
+                "project_title": "string",
+                "project_date": "string",
+                "original_name": "string",
+                "matched_skill": "string",
+                "impact_sentences": "list",
+                "technologies_used": "list",
+            },
+            ("project_title", "impact_sentences"),
+            {"impact_sentences": "string", "technologies_used": "string"},
+        ),
+        OutputSchema(
+            "projects",
+            "selected_projects",
+            {"selected_projects": "list"},
+            ("selected_projects",),
+            {"selected_projects": {"file_name": "string", "matched_skill": "string?", "relevance_reason": "string?"}},
+        ),
+        OutputSchema(
+            "skills",
+            "skills_by_category",
+            {"skills_by_category": "object"},
+            ("skills_by_category",),
+        ),
+        OutputSchema(
+            "courses",
+            "selected_courses",
+            {"selected_courses": "list"},
+            ("selected_courses",),
+            {"selected_courses": "string"},
+        ),
+        OutputSchema(
+            "jd_analysis",
+            "top_10_skills",
+            {"top_10_skills": "list", "job_title": "string", "company_focus": "string"},
+            ("top_10_skills",),
+            {
+                "top_10_skills": {
+                    "rank": "number",
+                    "skill": "string",
+                    "category": "string?",
+                    "jd_keywords": "list?",
+                }
+            },
+        ),
+    )
+}
+
+
+def schema_for(prompt: str) -> Optional[OutputSchema]:
+    """The schema whose marker the prompt asks for, most specific first."""
+    return next((schema for schema in SCHEMAS.values() if schema.marker in prompt), None)
+
+
+class StreamError(ValueError):
+    """The answer broke: bad JSON, a value off-schema, or cut off."""
+
+
+class StructuredOutputError(Exception):
+    """No valid answer after all tail retries; ``partial`` has what was valid."""
+
+    def __init__(self, message: str, partial: Dict[str, Any]):
+        super().__init__(message)
+        self.partial = partial
+
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+@dataclass
+class Event:
+    """A top-level field (``path == (name,)``) or list element (``(name, index)``)."""
+
+    kind: str
+    path: Tuple[Any, ...]
+    value: Any
+    # Seconds since the call started
+    at: float = 0.0
+    # Replaces a value reported earlier under the same path: a re-run of the
+    # whole prompt wrote that element differently
+    revised: bool = False
+
+
+@dataclass
+class _Frame:
+    kind: str
+    start: int
+    state: str
+    key: str = ""
+    count: int = 0
+
+
+class JsonStream:
+    """Incremental parser for the one JSON object of a model answer."""
+
+    def __init__(self, schema: Optional[OutputSchema] = None):
+        self.schema = schema
+        # The answer from its first "{" on
+        self.buffer = ""
+        # End of the last valid field or element, and of the one before it:
+        # a retry picks up at the latter
+        self.checkpoint = 0
+        self.previous = 0
+        self.done = False
+        self.fields: Dict[str, Any] = {}
+        self.elements: Dict[str, List[Any]] = {}
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._string: Optional[int] = None
+        self._end = 0
+        self._settled = False
+
+    def feed(self, text: str) -> List[Event]:
+        """Parse more of the answer; returns the fields and elements it closed.
+
+        Raises :class:`StreamError` at the first problem.
+        """
+        if self._settled:
+            return []
+        if not self.buffer:
+            start = text.find("{")
+            if start < 0:
+                return []
+            text = text[start:]
+        self.buffer += text
+        events: List[Event] = []
+        if not self.done:
+            self._scan(events)
+        if self.done:
+            self._check_trailing()
+        return events
+
+    def close(self) -> Dict[str, Any]:
+        """The parsed object, once the answer is complete."""
+        if not self.done:
+            raise StreamError("answer ended before the JSON object was closed")
+        return dict(self.fields)
+
+    def partial(self) -> Dict[str, Any]:
+        """Every field and list element that closed valid so far."""
+        return {**self.elements, **self.fields}
+
+    def _scan(self, events: List[Event]) -> None:
+        buffer, pos, end = self.buffer, self._pos, len(self.buffer)
+        while pos < end and not self.done:
+            if self._string is not None:
+                match = _STRING_END.search(buffer, pos)
+                if match is None:
+                    pos = end
+                elif match.group() == "\\":
+                    if match.end() >= end:
+                        # Escape split across chunks
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                else:
+                    pos = match.end()
+                    start, self._string = self._string, None
+                    self._close_string(start, pos, events)
+                continue
+            match = _TOKEN.match(buffer, pos)
+            structural, quote, scalar = match.groups()
+            if structural:
+                self._structural(structural, match.start(1), match.end(), events)
+            elif quote:
+                self._open_string(match.start(2))
+            elif scalar:
+                if match.end() == end:
+                    # May continue in the next chunk
+                    pos = match.start(3)
+                    break
+                self._scalar(scalar, match.start(3), match.end(), events)
+            pos = match.end()
+        self._pos = pos
+
+    def _check_trailing(self) -> None:
+        # A stray "}" can close the object early; the real rest then follows
+        match = _TRAILING.match(self.buffer, self._end)
+        if match.group(1) is None:
+            return
+        self._settled = True
+        if match.group(1) in ',"':
+            raise self._fail("the object closed early (stray '}'?)", self._end - 1)
+
+    def _expects_value(self) -> bool:
+        return not self._stack or self._stack[-1].state in (_VALUE, _VALUE_OR_END)
+
+    def _fail(self, message: str, offset: int) -> StreamError:
+        context = self.buffer[max(0, offset - 30): offset + 10]
+        return StreamError(f"{message} at offset {offset} (...{context!r})")
+
+    def _structural(self, char: str, start: int, end: int, events: List[Event]) -> None:
+        top = self._stack[-1] if self._stack else None
+        if char in "{[":
+            if not self._expects_value():
+                raise self._fail(f"unexpected {char!r}", start)
+            self._stack.append(_Frame(char, start, _KEY_OR_END if char == "{" else _VALUE_OR_END))
+        elif char == "}":
+            if top is None or top.kind != "{" or top.state not in (_KEY_OR_END, _COMMA_OR_END):
+                raise self._fail("unexpected '}'", start)
+            self._stack.pop()
+            self._close_value(top.start, end, events)
+        elif char == "]":
+            if top is None or top.kind != "[" or top.state not in (_VALUE_OR_END, _COMMA_OR_END):
+                raise self._fail("unexpected ']'", start)
+            self._stack.pop()
+            self._close_value(top.start, end, events)
+        elif char == ":":
+            if top is None or top.state != _COLON:
+                raise self._fail("unexpected ':'", start)
+            top.state = _VALUE
+        else:
+            if top is None or top.state != _COMMA_OR_END:
+                raise self._fail("unexpected ','", start)
+            top.state = _KEY if top.kind == "{" else _VALUE
+
+    def _open_string(self, start: int) -> None:
+        top = self._stack[-1] if self._stack else None
+        if top is not None and top.kind == "{" and top.state in (_KEY_OR_END, _KEY):
+            top.state = _IN_KEY
+        elif not self._expects_value():
+            raise self._fail("unexpected string", start)
+        self._string = start
+
+    def _close_string(self, start: int, end: int, events: List[Event]) -> None:
+        top = self._stack[-1]
+        if top.state == _IN_KEY:
+            top.key = self._load(start, end)
+            top.state = _COLON
+        else:
+            self._close_value(start, end, events)
+
+    def _scalar(self, text: str, start: int, end: int, events: List[Event]) -> None:
+        if not self._stack or not self._expects_value() or not _SCALAR.fullmatch(text):
+            raise self._fail(f"unexpected {text[:20]!r}", start)
+        self._close_value(start, end, events)
+
+    def _load(self, start: int, end: int) -> Any:
+        try:
+            return json.loads(self.buffer[start:end])
+        except ValueError as exc:
+            raise self._fail(f"invalid JSON value ({exc.msg})", start + exc.pos) from None
+
+    def _close_value(self, start: int, end: int, events: List[Event]) -> None:
+        if not self._stack:
+            missing = self.schema.missing(self.fields) if self.schema else []
+            if missing:
+                raise self._fail(f"missing {', '.join(missing)}", start)
+            self.done = True
+            self._end = end
+            return
+        parent = self._stack[-1]
+        parent.state = _COMMA_OR_END
+        depth = len(self._stack)
+        if depth == 1:
+            value = self._load(start, end)
+            if self.schema:
+                value = self.schema.coerce(parent.key, value)
+            error = self.schema.field_error(parent.key, value) if self.schema else None
+            if error:
+                raise self._fail(error, start)
+            self.fields[parent.key] = value
+            events.append(Event("field", (parent.key,), value))
+            self.previous, self.checkpoint = self.checkpoint, end
+        elif depth == 2 and parent.kind == "[" and self._stack[0].kind == "{":
+            name, index = self._stack[0].key, parent.count
+            value = self._load(start, end)
+            if self.schema:
+                value = self.schema.coerce(name, value, element=True)
+            error = self.schema.element_error(name, index, value) if self.schema else None
+            if error:
+                raise self._fail(error, start)
+            self.elements.setdefault(name, []).append(value)
+            events.append(Event("element", (name, index), value))
+            self.previous, self.checkpoint = self.checkpoint, end
+        if parent.kind == "[":
+            parent.count += 1
+
+
+class MessagesClient:
+    """``POST /v1/messages`` with ``"stream": true``, yielding the text deltas."""
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        api_key: Optional[str] = None,
+        size: int = 4,
+        timeout: float = 600.0,
+    ):
+        self.pool = ConnectionPool(url, size=size, timeout=timeout)
+        self.headers = {"Content-Type": "application/json", "anthropic-version": API_VERSION}
+        key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if key:
+            self.headers["x-api-key"] = key
+        self.usage: Dict[str, int] = {"input_tokens": 0, "output_tokens": 0}
+        self.stop_reason: Optional[str] = None
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def stream(self, body: Dict[str, Any]) -> Iterator[str]:
+        """Text deltas of one call; ``usage`` and ``stop_reason`` are updated as they arrive.
+
+        Closing the generator early drops the connection, which stops the
+        generation.
+        """
+        self.stop_reason = None
+        payload = json.dumps(dict(body, stream=True)).encode("utf-8")
+        received, counted = 0, False
+        try:
+            with self.pool.stream("POST", "/v1/messages", payload, self.headers) as response:
+                if response.status != 200:
+                    raise APIError(response.status, response.read()[:300].decode("utf-8", "replace"))
+                for event, data in sse_events(response):
+                    if event == "content_block_delta" and data["delta"].get("type") == "text_delta":
+                        received += len(data["delta"]["text"])
+                        yield data["delta"]["text"]
+                    elif event == "message_start":
+                        self.usage["input_tokens"] += data["message"]["usage"].get("input_tokens", 0)
+                    elif event == "message_delta":
+                        self.usage["output_tokens"] += data.get("usage", {}).get("output_tokens", 0)
+                        self.stop_reason = data["delta"].get("stop_reason")
+                        counted = True
+                    elif event == "error":
+                        raise APIError(529, data.get("error", {}).get("message", "stream error"))
+        finally:
+            # A stream stopped early is billed for what was generated
+            if not counted:
+                self.usage["output_tokens"] += received // 4
+
+
+@dataclass
+class StructuredResult:
+    value: Dict[str, Any]
+    attempts: int
+    # Why each retry was needed
+    repairs: List[str]
+    input_tokens: int
+    output_tokens: int
+    seconds: float
+    first_event: Optional[float]
+
+
+class StructuredStream:
+    """One structured call: iterate for events, then read :attr:`result`.
+
+    ``body`` is a Messages API request. If it ends with an assistant prefill
+    (e.g. ``"{"``), the answer is parsed as its continuation. ``max_repairs``
+    is how often the whole prompt may run again; a failed run is first
+    followed by one tail retry, which does not count.
+
+    Each event is held back until the next one closes, since a retry drops
+    the last element before the failure. A path is reported once; only a
+    different value from a later run is reported again, as ``revised``.
+    """
+
+    def __init__(
+        self,
+        client: MessagesClient,
+        body: Dict[str, Any],
+        schema: Optional[OutputSchema] = None,
+        max_repairs: int = 2,
+    ):
+        self.client = client
+        self.body = body
+        self.schema = schema or schema_for(prompt_text(body))
+        self.max_repairs = max_repairs
+        self.result: Optional[StructuredResult] = None
+
+    def __iter__(self) -> Iterator[Event]:
+        messages = list(self.body.get("messages") or [])
+        prefill = ""
+        if messages and messages[-1].get("role") == "assistant":
+            prefill = prompt_text({"messages": messages[-1:]})
+            messages = messages[:-1]
+        original = prefill
+        usage_before = dict(self.client.usage)
+        started = time.perf_counter()
+        first_event: Optional[float] = None
+        repairs: List[str] = []
+        reported: Dict[Tuple[Any, ...], Any] = {}
+
+        def report(events: List[Event]) -> Iterator[Event]:
+            nonlocal first_event
+            for event in events:
+                if _report(event, reported):
+                    event.at = time.perf_counter() - started
+                    if first_event is None:
+                        first_event = event.at
+                    yield event
+
+        runs = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            whole = prefill == original
+            runs += whole
+            parser = JsonStream(self.schema)
+            parser.feed(prefill)
+            resumed = parser.checkpoint
+            request = dict(self.body, messages=messages + ([{"role": "assistant", "content": prefill}] if prefill else []))
+            stream = self.client.stream(request)
+            held: List[Event] = []
+            try:
+                for text in stream:
+                    for event in parser.feed(text):
+                        held.append(event)
+                    # Everything but the last closed element survives a retry
+                    yield from report(held[:-1])
+                    del held[:-1]
+                value = parser.close()
+                yield from report(held)
+            except (StreamError, *_NETWORK_ERRORS) as exc:
+                reason = str(exc)
+                if self.client.stop_reason == "max_tokens" and not parser.done:
+                    reason = "stopped at max_tokens"
+                repairs.append(reason)
+                # After a whole run, keep what was valid and let the model write
+                # the rest again; after a failed tail retry, start over
+                if whole and parser.previous > resumed:
+                    prefill = parser.buffer[: parser.previous]
+                elif runs <= self.max_repairs:
+                    prefill = original
+                else:
+                    break
+                continue
+            finally:
+                stream.close()
+            self.result = StructuredResult(
+                value=value,
+                attempts=attempt,
+                repairs=repairs,
+                input_tokens=self.client.usage["input_tokens"] - usage_before["input_tokens"],
+                output_tokens=self.client.usage["output_tokens"] - usage_before["output_tokens"],
+                seconds=time.perf_counter() - started,
+                first_event=first_event,
+            )
+            return
+        raise StructuredOutputError(
+            f"no valid answer after {attempt} attempt(s): {repairs[-1]}", parser.partial()
+        )
+
+    def run(self) -> StructuredResult:
+        for _ in self:
+            pass
+        assert self.result is not None
+        return self.result
+
+
+def _report(event: Event, reported: Dict[Tuple[Any, ...], Any]) -> bool:
+    """Whether ``event`` is news, marking it ``revised`` if it replaces a value."""
+    if event.path in reported:
+        if reported[event.path] == event.value:
+            return False
+        event.revised = True
+    reported[event.path] = event.value
+    return True
+
+
+def _chunks(handle, size: int = 256) -> Iterator[str]:
+    return iter(lambda: handle.read(size), "")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    call = sub.add_parser("call", help="stream one prompt and print fields and elements as they close")
+    call.add_argument("prompt", help="file with the user prompt ('-' for stdin)")
+    call.add_argument("--schema", choices=sorted(SCHEMAS), help="default: picked from the prompt")
+    call.add_argument("--url", default=DEFAULT_URL)
+    call.add_argument("--model", default=DEFAULT_MODEL)
+    call.add_argument("--max-tokens", type=int, default=2000)
+    call.add_argument("--temperature", type=float, default=0.3)
+    call.add_argument("--max-repairs", type=int, default=2, help="whole-prompt re-runs (tail retries are extra)")
+    check = sub.add_parser("parse", help="parse a saved answer the way a stream would")
+    check.add_argument("answer", help="file with the model's answer ('-' for stdin)")
+    check.add_argument("--schema", choices=sorted(SCHEMAS))
+    args = parser.parse_args(argv)
+
+    path = args.prompt if args.command == "call" else args.answer
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    if args.command == "parse":
+        stream = JsonStream(SCHEMAS[args.schema] if args.schema else None)
+        try:
+            for chunk in _chunks(handle):
+                for event in stream.feed(chunk):
+                    print(json.dumps({"path": event.path, "value": event.value}))
+            stream.close()
+        except StreamError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            print(f"valid up to offset {stream.checkpoint} of the JSON", file=sys.stderr)
+            return 1
+        finally:
+            handle.close()
+        return 0
+
+    with handle:
+        prompt = handle.read()
+    body = {
+        "model": args.model,
+        "max_tokens": args.max_tokens,
+        "temperature": args.temperature,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    client = MessagesClient(args.url)
+    try:
+        structured = StructuredStream(client, body, SCHEMAS[args.schema] if args.schema else None, args.max_repairs)
+        for event in structured:
+            line = {"at": round(event.at, 3), "path": event.path, "value": event.value}
+            print(json.dumps(dict(line, revised=True) if event.revised else line), flush=True)
+    except StructuredOutputError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        print(json.dumps({"partial": exc.partial}))
+        return 1
+    except APIError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        client.close()
+    result = structured.result
+    print(
+        f"{result.attempts} attempt(s), {result.output_tokens} output tokens, {result.seconds:.2f}s "
+        f"(first element after {result.first_event or 0:.2f}s)",
+        file=sys.stderr,
+    )
+    for reason in result.repairs:
+        print(f"  retried the tail: {reason}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
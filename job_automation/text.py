@@ -0,0 +1,116 @@
+"""Text normalization shared by the matchers, caches and indexes.
+
+Every component that compares JD text (phrase rules, cache keys, near-duplicate
+detection, retrieval) goes through :func:`normalize` so that case, punctuation
+and the different ways of writing "5+ years" do not change the result.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Iterable, Iterator, List
+
+NUMBER_WORDS = {
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+    "ten": "10",
+    "twelve": "12",
+    "fifteen": "15",
+    "twenty": "20",
+}
+
+_DASHES = re.compile(r"[‐-―−]")
+# "70,000" -> "70000"; starts with a literal so the scan stays cheap
+_THOUSANDS = re.compile(r",(?<=\d,)(?=\d{3}\b)")
+_NUMERIC_RANGE = re.compile(r"\d+-\d+")
+_NUMBER_WORD_SET = frozenset(NUMBER_WORDS)
+_DIGIT = re.compile(r"\d")
+_KEPT = "abcdefghijklmnopqrstuvwxyz0123456789+-"
+_ONE_LINE = {i: (chr(i) if chr(i) in _KEPT else " ") for i in range(128)}
+_KEEP_LINES = {**_ONE_LINE, ord("\n"): "\n"}
+_TOKEN = re.compile(r"[a-z0-9+]+")
+
+
+def normalize(text: str, keep_lines: bool = False) -> str:
+    """Return a lowercase, punctuation-free form of ``text``.
+
+    Only ``+`` (as in "5+ years") and the hyphen of a numeric range ("2-4")
+    survive; everything else that is not a letter or digit becomes a single
+    space, so "Cold-Calling!" and "cold calling" normalize the same way.
+    Number words become digits and "5 plus" / "2 to 4" become "5+" / "2-4".
+
+    With ``keep_lines`` newlines are preserved (blank lines dropped), which
+    lets callers normalize a whole document once and still split it into
+    sentences afterwards.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        text = _DASHES.sub("-", unicodedata.normalize("NFKD", text))
+        text = text.encode("ascii", "ignore").decode("ascii")
+    text = _THOUSANDS.sub("", text.lower())
+    if not keep_lines:
+        return _normalize_line(text.translate(_ONE_LINE))
+    lines = (_normalize_line(line) for line in text.translate(_KEEP_LINES).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _normalize_line(line: str) -> str:
+    words = line.split()
+    # Fast path: without digits or number words there is nothing to merge
+    if not _DIGIT.search(line) and _NUMBER_WORD_SET.isdisjoint(words):
+        return " ".join(line.replace("-", " ").split()) if "-" in line else " ".join(words)
+
+    out: List[str] = []
+    for word in _split_dashes(words):
+        word = NUMBER_WORDS.get(word, word)
+        previous = out[-1] if out else ""
+        if word in ("+", "plus") and previous[-1:].isdigit():
+            out[-1] = previous + "+"
+        elif (
+            word[:1].isdigit()
+            and previous in ("-", "to")
+            and len(out) > 1
+            and out[-2].isdigit()
+        ):
+            out[-2:] = [out[-2] + "-" + word]
+        else:
+            out.append(word)
+    return " ".join(word for word in out if word != "-")
+
+
+def _split_dashes(words: List[str]) -> Iterator[str]:
+    for word in words:
+        if "-" in word and word != "-" and not _NUMERIC_RANGE.fullmatch(word):
+            yield from word.replace("-", " - ").split()
+        else:
+            yield word
+
+
+def tokens(text: str) -> List[str]:
+    """Split already-normalized text into word tokens."""
+    return _TOKEN.findall(text)
+
+
+def flatten(value) -> Iterable[str]:
+    """Yield every string inside nested dicts/lists (e.g. ``requirements``)."""
+    if value is None:
+        return
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from flatten(item)
+    else:
+        yield str(value)
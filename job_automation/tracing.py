@@ -0,0 +1,959 @@
+"""Stage tracing, cost accounting and offline replay for n8n executions.
+
+Reads execution exports of ``cover-letter-generator.json`` and of the
+``jd-resume-generator.json`` run it calls: the JSON of
+``GET /api/v1/executions/{id}?includeData=true`` (one execution, a list, or
+the paged ``{"data": [...]}`` answer), JSONL of those, or the flatted
+``execution_data.data`` column of the n8n database.
+
+* Stages: one per node, from ``runData`` (start, execution time, items out,
+  inputs). ``lmChatAnthropic`` runs are attached to the agent they serve as
+  LLM calls with their token usage. A sub-workflow execution is inlined after
+  the ``Execute Workflow`` node that started it, its stages prefixed with the
+  workflow name (``Resume Generator/Parse JD Analysis``).
+* ``report``: per-stage p50/p95, tokens and cost per application, the critical
+  path of the median application with the stages that ran while it waited,
+  and the stages that ran one after the other
+  although neither needs the other's output: sibling branches after a fork,
+  and the per-item LLM calls of one agent. The projected wall time if they
+  had overlapped comes with it.
+* ``replay``: runs the recorded applications again against
+  :class:`~job_automation.fakes.FakeAnthropic` and
+  :class:`~job_automation.fakes.FakeGotenberg` with the recorded latencies
+  times ``--scale``. ``--shape serial`` runs one node at a time like n8n does
+  today; ``branches`` starts every stage once its inputs are done; ``fanout``
+  also sends the per-item LLM calls of an agent at once. ``--rewire`` moves
+  the inputs of a stage to try other pipeline shapes. ``--save`` keeps the
+  result and ``--baseline`` fails when p50 or p95 got slower.
+
+Usage::
+
+    python -m job_automation.tracing report exports/*.json
+    python -m job_automation.tracing replay exports/*.json --scale 0.02 --shape branches --save replay.json
+    python -m job_automation.tracing replay exports/*.json --scale 0.02 --shape branches --baseline replay.json
+    python -m job_automation.tracing replay exports/*.json --shape branches \\
+        --rewire "Extract Resume Content=Resume Generator/Combine All Data"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .gotenberg import CONVERT_HTML, LETTER_OPTIONS, multipart_body
+from .httpclient import ConnectionPool
+
+# USD per million input / output tokens, matched on the longest model prefix
+PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-sonnet-4-5": (3.0, 15.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4": (15.0, 75.0),
+}
+
+LLM = "llm"
+RENDER = "render"
+WORKFLOW = "workflow"
+NODE = "node"
+
+SHAPES = ("serial", "branches", "fanout")
+
+# Replayed prompts only need to select the right canned answer
+_PROMPT_CHARS = 4000
+
+
+@dataclass
+class LLMCall:
+    model: str
+    start: float
+    seconds: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    prompt: str = ""
+
+
+@dataclass
+class Stage:
+    """One node of one application; times are seconds from its start."""
+
+    name: str
+    kind: str
+    start: float
+    seconds: float
+    items: int = 0
+    after: List[str] = field(default_factory=list)
+    calls: List[LLMCall] = field(default_factory=list)
+    # Work of its own: an inlined sub-workflow is not counted twice
+    own: float = 0.0
+
+    @property
+    def end(self) -> float:
+        return self.start + self.seconds
+
+    def ideal(self, fanout: bool) -> float:
+        """Own time with the LLM calls sent at once when ``fanout``."""
+        if not fanout or len(self.calls) < 2:
+            return self.own
+        serial = sum(c.seconds for c in self.calls)
+        return max(0.0, self.own - serial) + max(c.seconds for c in self.calls)
+
+
+@dataclass
+class Application:
+    execution_id: str
+    workflow: str
+    started: float
+    stages: Dict[str, Stage]
+
+    @property
+    def wall(self) -> float:
+        return max((s.end for s in self.stages.values()), default=0.0)
+
+    @property
+    def calls(self) -> List[LLMCall]:
+        return [c for s in self.stages.values() for c in s.calls]
+
+    def tokens(self) -> Tuple[int, int]:
+        calls = self.calls
+        return sum(c.input_tokens for c in calls), sum(c.output_tokens for c in calls)
+
+    def cost(self, prices: Dict[str, Tuple[float, float]] = PRICES) -> Optional[float]:
+        """USD for all LLM calls; ``None`` if a model has no price."""
+        total = 0.0
+        for call in self.calls:
+            price = model_price(call.model, prices)
+            if price is None:
+                return None
+            total += (call.input_tokens * price[0] + call.output_tokens * price[1]) / 1e6
+        return total
+
+
+@dataclass
+class PathStep:
+    stage: str
+    start: float
+    seconds: float
+    # Idle time between the input it waited for and its own start
+    wait: float
+    # Stages that ran during the wait and for how long: n8n runs one node at a
+    # time, so a wait on the data path is the other branches' work
+    behind: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Overlap:
+    """Stages that ran one after the other without depending on each other."""
+
+    kind: str
+    at: str
+    stages: List[str]
+    serial: float
+    overlapped: float
+
+    @property
+    def saving(self) -> float:
+        return self.serial - self.overlapped
+
+
+@dataclass
+class StageStats:
+    name: str
+    kind: str
+    count: int
+    p50: float
+    p95: float
+    items: float
+    calls: float
+    input_tokens: float
+    output_tokens: float
+
+
+class TraceError(ValueError):
+    """An export is not an n8n execution, or a pipeline edit is invalid."""
+
+
+def model_price(model: str, prices: Dict[str, Tuple[float, float]] = PRICES) -> Optional[Tuple[float, float]]:
+    matches = [prefix for prefix in prices if model.startswith(prefix)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# -- loading -----------------------------------------------------------------
+
+
+def _unflatten(table: List[Any]) -> Any:
+    """Decode the ``flatted`` encoding n8n stores execution data in.
+
+    Every string inside an object or array is the index of the real value.
+    """
+    revived: Dict[int, Any] = {}
+
+    def revive(index: int) -> Any:
+        if index in revived:
+            return revived[index]
+        value = table[index]
+        if isinstance(value, list):
+            out: Any = []
+            revived[index] = out
+            out.extend(resolve(v) for v in value)
+        elif isinstance(value, dict):
+            out = {}
+            revived[index] = out
+            for key, v in value.items():
+                out[key] = resolve(v)
+        else:
+            out = revived[index] = value
+        return out
+
+    def resolve(value: Any) -> Any:
+        return revive(int(value)) if isinstance(value, str) else value
+
+    return revive(0)
+
+
+def _execution_data(execution: Dict[str, Any]) -> Dict[str, Any]:
+    data = execution.get("data")
+    if isinstance(data, str):
+        data = json.loads(data)
+        if isinstance(data, list):
+            data = _unflatten(data)
+        execution["data"] = data
+    if not isinstance(data, dict) or "resultData" not in data:
+        raise TraceError(f"execution {execution.get('id')}: no data.resultData (export with includeData=true)")
+    return data
+
+
+def iter_executions(path) -> Iterator[Dict[str, Any]]:
+    """Every execution in an export file."""
+    with open(path, encoding="utf-8") as handle:
+        if str(path).endswith(".jsonl"):
+            documents: Iterable[Any] = (json.loads(line) for line in handle if line.strip())
+        else:
+            documents = [json.load(handle)]
+        for document in documents:
+            if isinstance(document, dict) and isinstance(document.get("data"), list):
+                document = document["data"]
+            for execution in document if isinstance(document, list) else [document]:
+                _execution_data(execution)
+                yield execution
+
+
+def _model(node: Dict[str, Any], run: Dict[str, Any]) -> str:
+    override = _first_item(run.get("inputOverride", {}), "ai_languageModel")
+    model = override.get("options", {}).get("model")
+    if not model:
+        model = node.get("parameters", {}).get("model", "")
+        if isinstance(model, dict):
+            model = model.get("value", "")
+    return str(model or "unknown")
+
+
+def _first_item(outputs: Dict[str, Any], connection: str) -> Dict[str, Any]:
+    for items in outputs.get(connection) or []:
+        for item in items or []:
+            return item.get("json", {})
+    return {}
+
+
+def _llm_call(node: Dict[str, Any], run: Dict[str, Any], origin: float) -> LLMCall:
+    input_tokens = output_tokens = 0
+    for items in (run.get("data") or {}).get("ai_languageModel") or []:
+        for item in items or []:
+            usage = item.get("json", {}).get("tokenUsage") or item.get("json", {}).get("tokenUsageEstimate") or {}
+            input_tokens += int(usage.get("promptTokens", 0))
+            output_tokens += int(usage.get("completionTokens", 0))
+    messages = _first_item(run.get("inputOverride", {}), "ai_languageModel").get("messages") or []
+    prompt = "\n".join(m if isinstance(m, str) else json.dumps(m) for m in messages)
+    return LLMCall(
+        model=_model(node, run),
+        start=run.get("startTime", 0) / 1000 - origin,
+        seconds=run.get("executionTime", 0) / 1000,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        prompt=prompt[:_PROMPT_CHARS],
+    )
+
+
+def _kind(node: Dict[str, Any]) -> str:
+    kind = node.get("type", "")
+    if kind.endswith(".executeWorkflow"):
+        return WORKFLOW
+    if kind.endswith(".httpRequest") and "/forms/" in str(node.get("parameters", {}).get("url", "")):
+        return RENDER
+    return NODE
+
+
+def _stages(execution: Dict[str, Any], prefix: str, origin: float) -> Dict[str, Stage]:
+    workflow = execution.get("workflowData") or {}
+    nodes = {n["name"]: n for n in workflow.get("nodes", [])}
+    connections = workflow.get("connections", {})
+    inputs: Dict[str, List[str]] = defaultdict(list)
+    serves: Dict[str, str] = {}
+    for source, outputs in connections.items():
+        for kind, targets in outputs.items():
+            for target in (t for group in targets or [] for t in group or []):
+                if kind == "main":
+                    inputs[target["node"]].append(source)
+                elif kind == "ai_languageModel":
+                    serves[source] = target["node"]
+
+    stages: Dict[str, Stage] = {}
+    calls: Dict[str, List[LLMCall]] = defaultdict(list)
+    run_data = execution["data"]["resultData"].get("runData", {})
+    for name, runs in run_data.items():
+        node = nodes.get(name, {})
+        if "lmChat" in node.get("type", "") or any("ai_languageModel" in (r.get("data") or {}) for r in runs):
+            for run in runs:
+                agent = serves.get(name) or next(
+                    (s["previousNode"] for s in run.get("source") or [] if s), name
+                )
+                calls[agent].append(_llm_call(node, run, origin))
+            continue
+        after: List[str] = []
+        for run in runs:
+            after += [s["previousNode"] for s in run.get("source") or [] if s and s.get("previousNode")]
+        if not after:
+            after = [n for n in inputs.get(name, []) if n in run_data]
+        start = min(r.get("startTime", 0) for r in runs) / 1000 - origin
+        seconds = sum(r.get("executionTime", 0) for r in runs) / 1000
+        items = sum(
+            len(group or [])
+            for r in runs
+            for group in ((r.get("data") or {}).get("main") or [])
+        )
+        stages[name] = Stage(
+            name=prefix + name,
+            kind=_kind(node),
+            start=start,
+            seconds=seconds,
+            items=items,
+            after=[prefix + a for a in dict.fromkeys(after)],
+            own=seconds,
+        )
+    for agent, agent_calls in calls.items():
+        if agent in stages:
+            stages[agent].calls = sorted(agent_calls, key=lambda c: c.start)
+            stages[agent].kind = LLM
+    return {stage.name: stage for stage in sorted(stages.values(), key=lambda s: s.start)}
+
+
+def _workflow_name(execution: Dict[str, Any], fallback: str) -> str:
+    return (execution.get("workflowData") or {}).get("name") or fallback
+
+
+def _start_ms(execution: Dict[str, Any]) -> float:
+    runs = execution["data"]["resultData"].get("runData", {}).values()
+    return min((r.get("startTime", 0) for node_runs in runs for r in node_runs), default=0)
+
+
+def _children(executions: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], List[str]]:
+    """``(parent execution, Execute Workflow node) -> [child execution ids]``."""
+    links: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    linked: Set[str] = set()
+    for parent_id, execution in executions.items():
+        for name, runs in execution["data"]["resultData"].get("runData", {}).items():
+            for run in runs:
+                child = (run.get("metadata") or {}).get("subExecution") or {}
+                child_id = str(child.get("executionId", ""))
+                if child_id in executions:
+                    links[(parent_id, name)].append(child_id)
+                    linked.add(child_id)
+    # Older exports only link the other way round
+    for child_id, execution in executions.items():
+        parent = execution["data"].get("parentExecution") or {}
+        parent_id = str(parent.get("executionId", ""))
+        if child_id in linked or parent_id not in executions:
+            continue
+        nodes = executions[parent_id].get("workflowData", {}).get("nodes", [])
+        callers = [n["name"] for n in nodes if _kind(n) == WORKFLOW]
+        child_workflow = str(execution.get("workflowId", ""))
+        caller = next(
+            (n["name"] for n in nodes if _kind(n) == WORKFLOW and child_workflow and child_workflow in json.dumps(n["parameters"])),
+            callers[0] if callers else "",
+        )
+        links[(parent_id, caller)].append(child_id)
+    return links
+
+
+def _inline(
+    executions: Dict[str, Dict[str, Any]],
+    links: Dict[Tuple[str, str], List[str]],
+    execution_id: str,
+    prefix: str,
+    origin: float,
+) -> Dict[str, Stage]:
+    execution = executions[execution_id]
+    stages = _stages(execution, prefix, origin)
+    nodes = {n["name"]: n for n in (execution.get("workflowData") or {}).get("nodes", [])}
+    merged: Dict[str, Stage] = {}
+    for stage in stages.values():
+        node_name = stage.name[len(prefix):]
+        for child_id in links.get((execution_id, node_name), []):
+            cached = nodes.get(node_name, {}).get("parameters", {}).get("workflowId", {})
+            fallback = cached.get("cachedResultName", "") if isinstance(cached, dict) else ""
+            child_prefix = f"{prefix}{_workflow_name(executions[child_id], fallback or child_id)}/"
+            child = _inline(executions, links, child_id, child_prefix, origin)
+            needed = {a for s in child.values() for a in s.after}
+            for child_stage in child.values():
+                if not child_stage.after:
+                    child_stage.after = list(stage.after)
+            sinks = [s.name for s in child.values() if s.name not in needed]
+            stage.after = stage.after + sinks
+            if child:
+                wall = max(s.end for s in child.values()) - min(s.start for s in child.values())
+                stage.own = max(0.0, stage.own - wall)
+            merged.update(child)
+        merged[stage.name] = stage
+    return merged
+
+
+def load_applications(paths: Iterable) -> List[Application]:
+    """One :class:`Application` per top-level execution, sub-workflows inlined."""
+    executions: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        for execution in iter_executions(path):
+            executions[str(execution.get("id", len(executions)))] = execution
+    links = _children(executions)
+    nested = {child for children in links.values() for child in children}
+    applications = []
+    for execution_id, execution in executions.items():
+        if execution_id in nested:
+            continue
+        origin = _start_ms(execution) / 1000
+        stages = _inline(executions, links, execution_id, "", origin)
+        applications.append(
+            Application(execution_id, _workflow_name(execution, execution_id), origin, stages)
+        )
+    return sorted(applications, key=lambda a: a.started)
+
+
+# -- analysis ----------------------------------------------------------------
+
+
+def rewired(app: Application, rewire: Dict[str, List[str]]) -> Application:
+    """A copy of ``app`` whose stages in ``rewire`` wait for other inputs."""
+    stages = {}
+    for name, stage in app.stages.items():
+        stages[name] = Stage(**{**asdict(stage), "calls": stage.calls})
+    for name, inputs in rewire.items():
+        unknown = [n for n in [name, *inputs] if n not in stages]
+        if unknown:
+            raise TraceError(f"no stage named {', '.join(map(repr, unknown))}")
+        stages[name].after = list(inputs)
+    edited = Application(app.execution_id, app.workflow, app.started, stages)
+    _topological(edited)
+    return edited
+
+
+def _topological(app: Application) -> List[Stage]:
+    order: List[Stage] = []
+    state: Dict[str, int] = {}
+    for root in app.stages:
+        stack = [(root, False)]
+        while stack:
+            name, leaving = stack.pop()
+            if leaving:
+                state[name] = 2
+                order.append(app.stages[name])
+                continue
+            if state.get(name) == 2:
+                continue
+            if state.get(name) == 1:
+                raise TraceError(f"{app.execution_id}: stages wait for each other around {name!r}")
+            state[name] = 1
+            stack.append((name, True))
+            stack.extend((a, False) for a in app.stages[name].after if a in app.stages and state.get(a) != 2)
+    return order
+
+
+def makespan(app: Application, fanout: bool = False) -> float:
+    """Wall time if every stage started as soon as its inputs were done."""
+    finish: Dict[str, float] = {}
+    for stage in _topological(app):
+        ready = max((finish[a] for a in stage.after if a in finish), default=0.0)
+        finish[stage.name] = ready + stage.ideal(fanout)
+    return max(finish.values(), default=0.0)
+
+
+def critical_path(app: Application) -> List[PathStep]:
+    """The chain of stages that gated the end of the execution.
+
+    Walks back from the last stage to finish, each time to the input that
+    finished last. The wait before a step is attributed to the stages that
+    ran in it, so a long branch off the data path still shows up.
+    """
+    if not app.stages:
+        return []
+    steps: List[PathStep] = []
+    stage: Optional[Stage] = max(app.stages.values(), key=lambda s: s.end)
+    seen: Set[str] = set()
+    while stage is not None and stage.name not in seen:
+        seen.add(stage.name)
+        inputs = [app.stages[a] for a in stage.after if a in app.stages]
+        gate = max(inputs, key=lambda s: s.end, default=None)
+        ready = gate.end if gate else 0.0
+        start = stage.end - stage.own
+        wait = max(0.0, start - ready)
+        behind = _ran_between(app, ready, start) if wait > 0 else {}
+        steps.append(PathStep(stage.name, start, stage.own, wait, behind))
+        stage = gate
+    return steps[::-1]
+
+
+def _ran_between(app: Application, low: float, high: float) -> Dict[str, float]:
+    """Own time of each stage inside ``[low, high]``, longest first."""
+    ran = {}
+    for stage in app.stages.values():
+        overlap = min(high, stage.end) - max(low, stage.end - stage.own)
+        if overlap > 1e-3:
+            ran[stage.name] = overlap
+    return dict(sorted(ran.items(), key=lambda kv: -kv[1]))
+
+
+def overlaps(app: Application, min_saving: float = 0.5) -> List[Overlap]:
+    """Independent branches and per-item LLM calls that ran one after another."""
+    found: List[Overlap] = []
+    successors: Dict[str, List[str]] = defaultdict(list)
+    for stage in app.stages.values():
+        for name in stage.after:
+            successors[name].append(stage.name)
+
+    def reachable(name: str) -> Set[str]:
+        seen, stack = {name}, [name]
+        while stack:
+            for nxt in successors.get(stack.pop(), []):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    for fork, heads in successors.items():
+        if len(heads) < 2:
+            continue
+        regions = {head: reachable(head) for head in heads}
+        spans = []
+        for head, region in regions.items():
+            others = set().union(*(r for h, r in regions.items() if h != head))
+            own = [app.stages[n] for n in region - others]
+            if own:
+                spans.append((min(s.start for s in own), max(s.end for s in own), head))
+        spans.sort()
+        serial = all(later[0] >= earlier[1] - 1e-3 for earlier, later in zip(spans, spans[1:]))
+        if len(spans) < 2 or not serial:
+            continue
+        overlap = Overlap(
+            "branches",
+            fork,
+            [head for _, _, head in spans],
+            spans[-1][1] - spans[0][0],
+            max(end - start for start, end, _ in spans),
+        )
+        if overlap.saving >= min_saving:
+            found.append(overlap)
+
+    for stage in app.stages.values():
+        calls = stage.calls
+        if len(calls) < 2 or any(b.start < a.start + a.seconds - 1e-3 for a, b in zip(calls, calls[1:])):
+            continue
+        serial = sum(c.seconds for c in calls)
+        overlap = Overlap("fan-out", stage.name, [f"{len(calls)} calls"], serial, max(c.seconds for c in calls))
+        if overlap.saving >= min_saving:
+            found.append(overlap)
+    return found
+
+
+def stage_stats(apps: Sequence[Application]) -> List[StageStats]:
+    per_stage: Dict[str, List[Stage]] = defaultdict(list)
+    for app in apps:
+        for stage in app.stages.values():
+            per_stage[stage.name].append(stage)
+    first = {name: min(s.start for s in stages) for name, stages in per_stage.items()}
+    stats = []
+    for name in sorted(per_stage, key=first.__getitem__):
+        stages = per_stage[name]
+        seconds = [s.seconds for s in stages]
+        count = len(stages)
+        stats.append(
+            StageStats(
+                name=name,
+                kind=stages[0].kind,
+                count=count,
+                p50=_percentile(seconds, 50),
+                p95=_percentile(seconds, 95),
+                items=sum(s.items for s in stages) / count,
+                calls=sum(len(s.calls) for s in stages) / count,
+                input_tokens=sum(c.input_tokens for s in stages for c in s.calls) / count,
+                output_tokens=sum(c.output_tokens for s in stages for c in s.calls) / count,
+            )
+        )
+    return stats
+
+
+def summarize(
+    apps: Sequence[Application],
+    prices: Dict[str, Tuple[float, float]] = PRICES,
+    min_saving: float = 0.5,
+) -> Dict[str, Any]:
+    """Everything ``report`` prints, as plain data."""
+    if not apps:
+        return {"applications": 0}
+    walls = [a.wall for a in apps]
+    tokens = [a.tokens() for a in apps]
+    costs = [a.cost(prices) for a in apps]
+    priced = [c for c in costs if c is not None]
+    median = sorted(apps, key=lambda a: a.wall)[(len(apps) - 1) // 2]
+
+    flagged: Dict[Tuple[str, str], List[Overlap]] = defaultdict(list)
+    for app in apps:
+        for overlap in overlaps(app, min_saving):
+            flagged[(overlap.kind, overlap.at)].append(overlap)
+    flags = [
+        {
+            "kind": kind,
+            "at": at,
+            "stages": found[0].stages,
+            "seen": len(found),
+            "serial": sum(o.serial for o in found) / len(found),
+            "saving": sum(o.saving for o in found) / len(found),
+        }
+        for (kind, at), found in sorted(flagged.items(), key=lambda kv: -sum(o.saving for o in kv[1]))
+    ]
+    return {
+        "applications": len(apps),
+        "workflows": sorted({a.workflow for a in apps}),
+        "wall": {"p50": _percentile(walls, 50), "p95": _percentile(walls, 95)},
+        "projected": {
+            "branches": _percentile([makespan(a) for a in apps], 50),
+            "fanout": _percentile([makespan(a, fanout=True) for a in apps], 50),
+        },
+        "per_application": {
+            "input_tokens": sum(t[0] for t in tokens) / len(apps),
+            "output_tokens": sum(t[1] for t in tokens) / len(apps),
+            "llm_calls": sum(len(a.calls) for a in apps) / len(apps),
+            "cost": sum(priced) / len(priced) if priced else None,
+            "cost_p95": _percentile(priced, 95) if priced else None,
+            "unpriced_models": sorted({c.model for a in apps for c in a.calls if model_price(c.model, prices) is None}),
+        },
+        "stages": [asdict(s) for s in stage_stats(apps)],
+        "critical_path": {
+            "execution": median.execution_id,
+            "wall": median.wall,
+            "steps": [asdict(step) for step in critical_path(median)],
+        },
+        "overlaps": flags,
+    }
+
+
+def print_report(summary: Dict[str, Any], out=sys.stdout) -> None:
+    if not summary["applications"]:
+        print("no executions", file=out)
+        return
+    wall, per_app, projected = summary["wall"], summary["per_application"], summary["projected"]
+    print(
+        f"{summary['applications']} applications ({', '.join(summary['workflows'])}): "
+        f"wall p50 {wall['p50']:.1f}s p95 {wall['p95']:.1f}s",
+        file=out,
+    )
+    cost = "n/a" if per_app["cost"] is None else f"${per_app['cost']:.3f} (p95 ${per_app['cost_p95']:.3f})"
+    print(
+        f"per application: {per_app['llm_calls']:.1f} LLM calls, {per_app['input_tokens']:,.0f} tokens in / "
+        f"{per_app['output_tokens']:,.0f} out, cost {cost}",
+        file=out,
+    )
+    if per_app["unpriced_models"]:
+        print(f"  no price for {', '.join(per_app['unpriced_models'])} (--prices)", file=out)
+
+    width = max(len(s["name"]) for s in summary["stages"])
+    print(f"\n{'stage':<{width}}  {'kind':<8} {'p50':>7} {'p95':>7} {'items':>5} {'calls':>5} {'tokens in/out':>15}", file=out)
+    for s in summary["stages"]:
+        tokens = f"{s['input_tokens']:,.0f}/{s['output_tokens']:,.0f}" if s["calls"] else ""
+        calls = f"{s['calls']:.1f}" if s["calls"] else ""
+        print(
+            f"{s['name']:<{width}}  {s['kind']:<8} {s['p50']:6.2f}s {s['p95']:6.2f}s "
+            f"{s['items']:5.1f} {calls:>5} {tokens:>15}",
+            file=out,
+        )
+
+    path = summary["critical_path"]
+    print(f"\ncritical path of the median application ({path['execution']}, {path['wall']:.1f}s):", file=out)
+    for step in path["steps"]:
+        if step["seconds"] < 0.05 and step["wait"] < 0.05:
+            continue
+        wait = f"  (waited {step['wait']:.1f}s)" if step["wait"] >= 0.05 else ""
+        print(f"  {step['start']:7.1f}s  {step['seconds']:6.1f}s  {step['stage']}{wait}", file=out)
+        behind = [(name, seconds) for name, seconds in step["behind"].items() if seconds >= 0.05]
+        for name, seconds in behind[:3]:
+            print(f"  {'':>7}   {seconds:6.1f}s    while {name} ran", file=out)
+        if len(behind) > 3:
+            rest = sum(seconds for _, seconds in behind[3:])
+            print(f"  {'':>7}   {rest:6.1f}s    while {len(behind) - 3} more stage(s) ran", file=out)
+
+    print("\nran one after another, could overlap:", file=out)
+    for flag in summary["overlaps"]:
+        where = "after" if flag["kind"] == "branches" else "in"
+        print(
+            f"  {flag['kind']} {where} {flag['at']} ({flag['seen']}/{summary['applications']} applications): "
+            f"{flag['serial']:.1f}s serial, saves {flag['saving']:.1f}s",
+            file=out,
+        )
+        print(f"      {' | '.join(flag['stages'])}", file=out)
+    if not summary["overlaps"]:
+        print("  nothing", file=out)
+    print(
+        f"\nprojected wall p50: {wall['p50']:.1f}s as recorded, {projected['branches']:.1f}s with overlapping "
+        f"branches, {projected['fanout']:.1f}s with concurrent fan-out too",
+        file=out,
+    )
+
+
+# -- replay ------------------------------------------------------------------
+
+
+@dataclass
+class ReplayResult:
+    shape: str
+    scale: float
+    applications: int
+    # Replayed wall time per application, in recorded seconds
+    p50: float
+    p95: float
+    recorded_p50: float
+    predicted_p50: float
+    llm_calls: int
+    renders: int
+    errors: int
+    seconds: float
+
+
+class Replayer:
+    """Re-run recorded applications against the fake LLM and Gotenberg."""
+
+    def __init__(
+        self,
+        llm_url: str,
+        gotenberg_url: str,
+        scale: float = 0.05,
+        shape: str = "serial",
+        concurrency: int = 1,
+    ):
+        if shape not in SHAPES:
+            raise TraceError(f"unknown shape {shape!r}, expected one of {', '.join(SHAPES)}")
+        self.scale = scale
+        self.shape = shape
+        self.concurrency = concurrency
+        self.llm = ConnectionPool(llm_url, size=4 * concurrency)
+        self.gotenberg = ConnectionPool(gotenberg_url, size=4 * concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=8 * concurrency)
+        self.llm_calls = self.renders = self.errors = 0
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.llm.close()
+        self.gotenberg.close()
+
+    async def _request(self, pool: ConnectionPool, path: str, body: bytes, headers: Dict[str, str]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(self._executor, pool.request, "POST", path, body, headers)
+            if not response.ok:
+                self.errors += 1
+        except OSError:
+            self.errors += 1
+
+    async def _call(self, stage: Stage, call: LLMCall) -> None:
+        self.llm_calls += 1
+        body = {
+            "model": call.model,
+            "max_tokens": max(call.output_tokens, 1),
+            "messages": [{"role": "user", "content": call.prompt or stage.name}],
+        }
+        headers = {"Content-Type": "application/json", "X-Fake-Latency": f"{call.seconds * self.scale:.6f}"}
+        await self._request(self.llm, "/v1/messages", json.dumps(body).encode("utf-8"), headers)
+
+    async def _stage(self, stage: Stage) -> None:
+        if stage.kind == LLM:
+            waiting = sum(c.seconds for c in stage.calls)
+            await asyncio.sleep(max(0.0, stage.own - waiting) * self.scale)
+            if self.shape == "fanout":
+                await asyncio.gather(*(self._call(stage, c) for c in stage.calls))
+            else:
+                for call in stage.calls:
+                    await self._call(stage, call)
+        elif stage.kind == RENDER:
+            self.renders += 1
+            body, content_type = multipart_body(b"<html><body>replay</body></html>", LETTER_OPTIONS)
+            headers = {"Content-Type": content_type, "X-Fake-Latency": f"{stage.own * self.scale:.6f}"}
+            await self._request(self.gotenberg, CONVERT_HTML, body, headers)
+        else:
+            await asyncio.sleep(stage.own * self.scale)
+
+    async def replay(self, app: Application) -> float:
+        """Replay one application; returns its wall time in recorded seconds."""
+        started = time.perf_counter()
+        if self.shape == "serial":
+            # n8n runs one node at a time; a sub-workflow call ends after its stages
+            order = sorted(app.stages.values(), key=lambda s: s.end if s.kind == WORKFLOW else s.start)
+            for stage in order:
+                await self._stage(stage)
+        else:
+            _topological(app)  # rejects cycles before anything waits forever
+            done = {name: asyncio.Event() for name in app.stages}
+
+            async def run(stage: Stage) -> None:
+                for name in stage.after:
+                    if name in done:
+                        await done[name].wait()
+                await self._stage(stage)
+                done[stage.name].set()
+
+            await asyncio.gather(*(run(s) for s in app.stages.values()))
+        return (time.perf_counter() - started) / self.scale
+
+    async def run(self, apps: Sequence[Application]) -> ReplayResult:
+        slots = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        async def one(app: Application) -> float:
+            async with slots:
+                return await self.replay(app)
+
+        walls = await asyncio.gather(*(one(app) for app in apps))
+        fanout = self.shape == "fanout"
+        predicted = [a.wall if self.shape == "serial" else makespan(a, fanout) for a in apps]
+        return ReplayResult(
+            shape=self.shape,
+            scale=self.scale,
+            applications=len(apps),
+            p50=_percentile(list(walls), 50),
+            p95=_percentile(list(walls), 95),
+            recorded_p50=_percentile([a.wall for a in apps], 50),
+            predicted_p50=_percentile(predicted, 50),
+            llm_calls=self.llm_calls,
+            renders=self.renders,
+            errors=self.errors,
+            seconds=time.perf_counter() - started,
+        )
+
+
+def regressions(result: ReplayResult, baseline: Dict[str, Any], tolerance: float = 0.1) -> List[str]:
+    """What got worse than ``baseline`` (a saved :class:`ReplayResult`)."""
+    problems = []
+    for key in ("p50", "p95"):
+        before = baseline.get(key)
+        now = getattr(result, key)
+        if before and now > before * (1 + tolerance):
+            problems.append(f"{key} {now:.1f}s vs baseline {before:.1f}s (+{now / before - 1:.0%})")
+    if result.errors > baseline.get("errors", 0):
+        problems.append(f"{result.errors} failed requests vs baseline {baseline.get('errors', 0)}")
+    return problems
+
+
+def parse_rewire(values: Sequence[str]) -> Dict[str, List[str]]:
+    """``"Stage=Input[,Input...]"`` options; an empty right side makes a root."""
+    rewire = {}
+    for value in values:
+        name, sep, inputs = value.partition("=")
+        if not sep:
+            raise TraceError(f"--rewire {value!r}: expected STAGE=INPUT[,INPUT...]")
+        rewire[name.strip()] = [i.strip() for i in inputs.split(",") if i.strip()]
+    return rewire
+
+
+def load_prices(path: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    prices = dict(PRICES)
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            prices.update({model: (float(p[0]), float(p[1])) for model, p in json.load(handle).items()})
+    return prices
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="latency, tokens, cost, critical path and overlap candidates")
+    report.add_argument("exports", nargs="+", help="n8n execution exports (JSON or JSONL)")
+    report.add_argument("--prices", help='JSON {"model-prefix": [usd_per_mtok_in, usd_per_mtok_out]}')
+    report.add_argument("--min-saving", type=float, default=0.5, help="smallest overlap saving to flag (seconds)")
+    report.add_argument("--json", action="store_true", help="print the summary as JSON")
+    replay = sub.add_parser("replay", help="re-run the executions against the fake LLM and Gotenberg")
+    replay.add_argument("exports", nargs="+")
+    replay.add_argument("--scale", type=float, default=0.05, help="replayed seconds per recorded second")
+    replay.add_argument("--shape", choices=SHAPES, default="serial")
+    replay.add_argument(
+        "--rewire",
+        action="append",
+        default=[],
+        metavar="STAGE=INPUT[,INPUT]",
+        help="make STAGE wait for other inputs (branches and fanout shapes)",
+    )
+    replay.add_argument("--concurrency", type=int, default=1, help="applications replayed at once")
+    replay.add_argument("--chromium", type=int, default=6, help="concurrent renders of the fake Gotenberg")
+    replay.add_argument("--llm-url", help="use this LLM stand-in instead of starting FakeAnthropic")
+    replay.add_argument("--gotenberg-url", help="use this Gotenberg instead of starting FakeGotenberg")
+    replay.add_argument("--save", help="write the result as JSON")
+    replay.add_argument("--baseline", help="a saved result; exit 1 if p50/p95 got slower")
+    replay.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    try:
+        apps = load_applications(args.exports)
+        if args.command == "report":
+            summary = summarize(apps, load_prices(args.prices), args.min_saving)
+            if args.json:
+                print(json.dumps(summary, indent=2))
+            else:
+                print_report(summary)
+            return 0
+
+        rewire = parse_rewire(args.rewire)
+        if rewire:
+            apps = [rewired(app, rewire) for app in apps]
+    except TraceError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    from .fakes import FakeAnthropic, FakeGotenberg
+
+    with FakeAnthropic() as llm, FakeGotenberg(chromium=args.chromium) as gotenberg:
+        replayer = Replayer(
+            args.llm_url or llm.url,
+            args.gotenberg_url or gotenberg.url,
+            scale=args.scale,
+            shape=args.shape,
+            concurrency=args.concurrency,
+        )
+        try:
+            result = asyncio.run(replayer.run(apps))
+        finally:
+            replayer.close()
+    print(json.dumps(asdict(result)))
+    if args.save:
+        Path(args.save).write_text(json.dumps(asdict(result), indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        problems = regressions(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        for problem in problems:
+            print(f"regression: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,595 @@
+"""Application tracker: a SQLite store with a change log, exported to ``job-applications.xlsx``.
+
+``job-application-tracker`` rewrites ``cvs/Excel/job-applications.xlsx`` and a
+backup copy on every update, and ``jd-to-excel-workflow.json`` appends a Google
+Sheets row per form submit without checking for duplicates. Here the store is
+the source of truth and the workbook is a view of it:
+
+* Rows carry the "Extract Info" columns (``dateSubmitted``, ``companyName``,
+  ``jobTitle``, ``location``, ``salaryRange``, ``jobUrl``, ``status``, ...)
+  plus the generated PDFs. Rows are never deleted or renumbered, so the row
+  ID is also the spreadsheet row.
+* Unique indexes on the normalized job URL and on the hash of the normalized
+  JD make a posting that comes back (tracking parameters, a LinkedIn search
+  URL, the same JD pasted twice) update its row instead of adding another.
+* A merge updates the row in place; only ``events`` is append-only. Each
+  update event holds ``[previous, new]`` for every changed field, so an
+  overwritten ``jobTitle`` or status can be read back with ``history``.
+* Exports are incremental. Rows live in blocks of :data:`BLOCK_ROWS`, and a
+  change marks its block dirty. An export re-renders only the dirty blocks and
+  copies the other compressed blocks (see :mod:`job_automation.xlsx`). Callers
+  batch many updates into one export.
+
+Usage::
+
+    python -m job_automation.tracker add output/jds.jsonl decisions.jsonl
+    python -m job_automation.tracker status https://example.com/careers/123 PASS --resume cvs/.../1-R.pdf
+    python -m job_automation.tracker history https://example.com/careers/123
+    python -m job_automation.tracker export
+    python -m job_automation.tracker serve --port 8789
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .records import iter_records, job_description, url_key
+from .server import BackgroundServer, QuietHandler
+from .text import normalize
+from .xlsx import Column, Segment, deflate_segment, row_xml, write_workbook
+
+DEFAULT_DB = Path(".cache/tracker.sqlite")
+DEFAULT_WORKBOOK = Path(os.environ.get("EXCEL_TRACKER_PATH", "cvs/Excel/job-applications.xlsx"))
+BLOCK_ROWS = 64
+
+ADDED = "added"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+# The "Extract Info" output of jd-to-excel-workflow.json, plus the PDFs
+FIELDS = (
+    "dateSubmitted",
+    "dateFormatted",
+    "timestamp",
+    "companyName",
+    "jobTitle",
+    "location",
+    "salaryRange",
+    "jobUrl",
+    "jobDescription",
+    "status",
+    "notes",
+    "resumePdf",
+    "coverLetterPdf",
+)
+# Set once when the row is added
+_FIRST_SEEN = ("dateSubmitted", "dateFormatted", "timestamp")
+NEW = "New"
+# What "Extract Info" sends when it found nothing ("companyName: 'Unknown'",
+# always "status: 'New'"); a re-submitted JD must not reset a row with them
+_PLACEHOLDERS = frozenset({"unknown", "n/a", "not specified"})
+COLUMNS = (
+    Column("dateSubmitted", "Date Submitted", 14),
+    Column("companyName", "Company", 28),
+    Column("jobTitle", "Job Title", 36),
+    Column("location", "Location", 24),
+    Column("salaryRange", "Salary Range", 24),
+    Column("jobUrl", "Job URL", 40, link=True),
+    Column("status", "Status", 10),
+    Column("notes", "Notes", 40),
+    Column("resumePdf", "Resume", 14, link=True),
+    Column("coverLetterPdf", "Cover Letter", 14, link=True),
+)
+# The form trigger, sample-jd.json and prefilter decisions name some fields differently
+_ALIASES = {
+    "Job Description": "jobDescription",
+    "position": "jobTitle",
+    "company": "companyName",
+    "salary_range": "salaryRange",
+    "job_url": "jobUrl",
+    "verdict": "status",
+    "resume_pdf": "resumePdf",
+    "cover_letter_pdf": "coverLetterPdf",
+}
+_BODY_FIELDS = ("description", "responsibilities", "requirements")
+_COMPANY_LINE = re.compile(r"\b(company|inc\.|ltd\.|llc|corp\.?)(?=\W|$)", re.I)
+_SALARY_LINE = re.compile(r"\$[\d,]+|salary", re.I)
+_LOCATION_LINE = re.compile(r"location:", re.I)
+_HYPERLINK_FORMULA = re.compile(r'^=HYPERLINK\("((?:[^"]|"")*)"', re.I)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT,
+    content_hash TEXT,
+    {", ".join(f"{name} TEXT NOT NULL DEFAULT ''" for name in FIELDS)},
+    updated REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS applications_url ON applications (url_key);
+CREATE UNIQUE INDEX IF NOT EXISTS applications_content ON applications (content_hash);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    application INTEGER NOT NULL,
+    at REAL NOT NULL,
+    action TEXT NOT NULL,
+    changes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirty (block INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS segments (
+    block INTEGER PRIMARY KEY,
+    crc INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def _placeholder(name: str, value: str) -> bool:
+    return value.strip().lower() in _PLACEHOLDERS or (name == "status" and value == NEW)
+
+
+def content_hash(text: str) -> str:
+    normalized = normalize(text)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest() if normalized else ""
+
+
+def extract_info(text: str) -> Dict[str, str]:
+    """The "Extract Info" node's guesses from the first lines of a pasted JD."""
+    info: Dict[str, str] = {}
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    for index, line in enumerate(lines[:10]):
+        if index < 3 and 2 < len(line) < 100 and _COMPANY_LINE.search(line):
+            info["companyName"] = line
+        if index == 0 and len(line) > 2:
+            info["jobTitle"] = line
+        if _LOCATION_LINE.search(line):
+            info["location"] = _LOCATION_LINE.sub("", line, count=1).strip()
+        if _SALARY_LINE.search(line):
+            info["salaryRange"] = line[:100]
+    return info
+
+
+def application(record: Dict[str, Any]) -> Dict[str, str]:
+    """Map an Extract Info item, a ``sample-jd.json`` record or a decision row to :data:`FIELDS`.
+
+    Only fields present in ``record`` are returned, so a status update does not
+    blank the rest of the row.
+    """
+    values: Dict[str, str] = {}
+    for name, value in record.items():
+        field = _ALIASES.get(name, name)
+        if field in FIELDS and value not in (None, ""):
+            values[field] = str(value)
+    if "jobDescription" not in values and any(record.get(name) for name in _BODY_FIELDS):
+        # The URL line would make a re-posted JD hash differently
+        values["jobDescription"] = job_description({k: v for k, v in record.items() if k != "job_url"})
+    if "jobDescription" in values and not ("companyName" in values or "jobTitle" in values):
+        for field, value in extract_info(values["jobDescription"]).items():
+            values.setdefault(field, value)
+    return values
+
+
+@dataclass
+class ExportStats:
+    rows: int
+    blocks: int
+    rendered: int  # blocks re-rendered because a row in them changed
+    bytes: int
+    seconds: float
+
+
+class ApplicationStore:
+    """Applications in SQLite, one writer at a time."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def add(self, records: Iterable[Dict[str, Any]], now: Optional[datetime] = None) -> List[Tuple[int, str]]:
+        """Insert or merge records in one transaction; returns ``(row id, outcome)`` pairs.
+
+        A record matches an existing row on its normalized URL, or failing
+        that on its JD hash. Non-empty incoming fields overwrite the row except
+        the submission dates; the values they replace are kept in the event.
+        Placeholders ("Unknown", the default ``status`` "New") only fill empty
+        fields. A record with neither URL nor JD raises ``ValueError``.
+        """
+        now = now or datetime.now().astimezone()
+        results = []
+        with self._transaction():
+            for record in records:
+                results.append(self._merge(application(record), now))
+        return results
+
+    def _merge(self, values: Dict[str, str], now: datetime, explicit: bool = False) -> Tuple[int, str]:
+        url = url_key(values.get("jobUrl", ""))
+        digest = content_hash(values.get("jobDescription", ""))
+        if not url and not digest:
+            raise ValueError(f"record has neither jobUrl nor a job description: {sorted(values)}")
+        row = None
+        if url:
+            row = self._db.execute("SELECT * FROM applications WHERE url_key = ?", (url,)).fetchone()
+        if row is None and digest:
+            row = self._db.execute("SELECT * FROM applications WHERE content_hash = ?", (digest,)).fetchone()
+
+        stamp = time.time()
+        if row is None:
+            values = dict(
+                {
+                    "dateSubmitted": now.date().isoformat(),
+                    "dateFormatted": f"{now:%B} {now.day}, {now.year}",
+                    "timestamp": now.isoformat(),
+                    "status": NEW,
+                },
+                **values,
+            )
+            names = ["url_key", "content_hash", *values, "updated"]
+            cursor = self._db.execute(
+                f"INSERT INTO applications ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                (url or None, digest or None, *values.values(), stamp),
+            )
+            return self._changed(cursor.lastrowid, ADDED, values, digest, stamp), ADDED
+
+        changes = {
+            name: value
+            for name, value in values.items()
+            if name not in _FIRST_SEEN
+            and row[name] != value
+            and not (row[name] and (name == "jobUrl" or not explicit and _placeholder(name, value)))
+        }
+        keys: Dict[str, str] = {}
+        if url and not row["url_key"]:
+            keys["url_key"] = url
+            changes["jobUrl"] = values["jobUrl"]
+        if digest and digest != row["content_hash"] and not self._taken("content_hash", digest):
+            keys["content_hash"] = digest
+        elif "jobDescription" in changes:
+            # Same text up to normalization, or the JD of another row
+            del changes["jobDescription"]
+        if not changes and not keys:
+            return row["id"], UNCHANGED
+        assignments = {**keys, **changes, "updated": stamp}
+        self._db.execute(
+            f"UPDATE applications SET {', '.join(f'{name} = ?' for name in assignments)} WHERE id = ?",
+            (*assignments.values(), row["id"]),
+        )
+        previous = {name: row[name] for name in changes}
+        return self._changed(row["id"], UPDATED, changes, digest, stamp, previous), UPDATED
+
+    def _taken(self, column: str, value: str) -> bool:
+        return self._db.execute(f"SELECT 1 FROM applications WHERE {column} = ?", (value,)).fetchone() is not None
+
+    def _changed(
+        self,
+        row_id: int,
+        action: str,
+        changes: Dict[str, str],
+        digest: str,
+        stamp: float,
+        previous: Optional[Dict[str, str]] = None,
+    ) -> int:
+        logged: Dict[str, Any] = dict(changes)
+        if "jobDescription" in logged:
+            logged["jobDescription"] = digest[:16]
+        if previous is not None:
+            if "jobDescription" in previous:
+                previous = dict(previous, jobDescription=content_hash(previous["jobDescription"])[:16])
+            logged = {name: [previous.get(name, ""), value] for name, value in logged.items()}
+        self._db.execute(
+            "INSERT INTO events (application, at, action, changes) VALUES (?, ?, ?, ?)",
+            (row_id, stamp, action, json.dumps(logged, ensure_ascii=False)),
+        )
+        self._db.execute("INSERT OR IGNORE INTO dirty (block) VALUES (?)", (_block(row_id),))
+        return row_id
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look a row up by row ID, job URL or JD text."""
+        if key.isdigit():
+            row = self._db.execute("SELECT * FROM applications WHERE id = ?", (int(key),)).fetchone()
+        else:
+            row = self._db.execute("SELECT * FROM applications WHERE url_key = ?", (url_key(key),)).fetchone()
+            row = row or self._db.execute(
+                "SELECT * FROM applications WHERE content_hash = ?", (content_hash(key),)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def history(self, key: str) -> List[Dict[str, Any]]:
+        """Events of the row matching ``key``, oldest first; update events map
+        each field to ``[previous, new]``."""
+        row = self.find(key)
+        if row is None:
+            raise KeyError(key)
+        return [
+            {"at": at, "action": action, "changes": json.loads(changes)}
+            for at, action, changes in self._db.execute(
+                "SELECT at, action, changes FROM events WHERE application = ? ORDER BY id", (row["id"],)
+            )
+        ]
+
+    def update(self, key: str, **fields: str) -> Tuple[int, str]:
+        """Set fields of an existing row (``status``, ``notes``, PDFs, ...)."""
+        row = self.find(key)
+        if row is None:
+            raise KeyError(key)
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields: {sorted(unknown)}")
+        record = {"jobUrl": row["jobUrl"], **{k: v for k, v in fields.items() if v is not None}}
+        if not row["url_key"]:
+            record["jobDescription"] = row["jobDescription"]
+        # An explicit update may set status back to "New"
+        with self._transaction():
+            return self._merge(application(record), datetime.now().astimezone(), explicit=True)
+
+    def pending(self) -> int:
+        """Blocks changed since the last export."""
+        return self._db.execute("SELECT COUNT(*) FROM dirty").fetchone()[0]
+
+    def export(self, path=DEFAULT_WORKBOOK) -> ExportStats:
+        """Write the workbook, re-rendering only the blocks that changed.
+
+        The dirty marks are cleared only after the file is in place, so a
+        failed write (Excel holding the file open on Windows) is retried in
+        full by the next export.
+        """
+        started = time.perf_counter()
+        path = Path(path)
+        target = str(path.resolve())
+        with self._transaction():
+            meta = dict(self._db.execute("SELECT key, value FROM meta").fetchall())
+            layout = json.dumps([asdict(c) for c in COLUMNS] + [BLOCK_ROWS])
+            if meta.get("workbook") != target or meta.get("layout") != layout:
+                # PDF links are relative to the workbook, so a new target re-renders everything
+                self._db.execute("DELETE FROM segments")
+                self._db.execute(f"INSERT OR IGNORE INTO dirty SELECT DISTINCT (id - 1) / {BLOCK_ROWS} FROM applications")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [("workbook", target), ("layout", layout)],
+                )
+            blocks = [b for (b,) in self._db.execute("SELECT block FROM dirty ORDER BY block")]
+            for block in blocks:
+                segment = self._render(block, path.parent.resolve())
+                self._db.execute(
+                    "INSERT OR REPLACE INTO segments (block, crc, size, data) VALUES (?, ?, ?, ?)",
+                    (block, segment.crc, segment.size, segment.data),
+                )
+            segments = [
+                Segment(crc, size, data)
+                for crc, size, data in self._db.execute("SELECT crc, size, data FROM segments ORDER BY block")
+            ]
+            written = write_workbook(path, COLUMNS, segments)
+            self._db.execute("DELETE FROM dirty")
+        return ExportStats(len(self), len(segments), len(blocks), written, time.perf_counter() - started)
+
+    def _render(self, block: int, base: Path) -> Segment:
+        rows = self._db.execute(
+            f"SELECT id, {', '.join(c.field for c in COLUMNS)} FROM applications"
+            " WHERE id BETWEEN ? AND ? ORDER BY id",
+            (block * BLOCK_ROWS + 1, (block + 1) * BLOCK_ROWS),
+        )
+        xml = []
+        for row in rows:
+            values = dict(row)
+            links = {"jobUrl": values["jobUrl"]}
+            for field in ("resumePdf", "coverLetterPdf"):
+                if values[field]:
+                    links[field] = _relative(values[field], base)
+                    values[field] = Path(values[field]).name
+            xml.append(row_xml(values["id"] + 1, COLUMNS, values, links, values["status"].upper()))
+        return deflate_segment("".join(xml))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+
+def _block(row_id: int) -> int:
+    return (row_id - 1) // BLOCK_ROWS
+
+
+def _relative(pdf: str, base: Path) -> str:
+    try:
+        return Path(os.path.relpath(Path(pdf).resolve(), base)).as_posix()
+    except ValueError:  # another drive on Windows
+        return Path(pdf).resolve().as_posix()
+
+
+def xlsx_records(path) -> Iterator[Dict[str, Any]]:
+    """Rows of an existing tracker workbook (needs ``openpyxl``), keyed by :data:`FIELDS`."""
+    from openpyxl import load_workbook
+
+    headers = {c.header.lower(): c.field for c in COLUMNS}
+    headers.update({name.lower(): name for name in FIELDS})
+    headers.update({"position": "jobTitle", "company name": "companyName", "url": "jobUrl", "date": "dateSubmitted"})
+    workbook = load_workbook(path, read_only=False)
+    sheet = workbook.active
+    rows = sheet.iter_rows()
+    names = [headers.get(str(cell.value or "").strip().lower()) for cell in next(rows, [])]
+    for row in rows:
+        record = {}
+        for name, cell in zip(names, row):
+            if name is None:
+                continue
+            value = cell.hyperlink.target if cell.hyperlink is not None and cell.hyperlink.target else cell.value
+            if hasattr(value, "date"):
+                value = value.date().isoformat()
+            elif isinstance(value, str) and _HYPERLINK_FORMULA.match(value):
+                value = _HYPERLINK_FORMULA.match(value).group(1).replace('""', '"')
+            if value not in (None, ""):
+                record[name] = str(value)
+        if record.get("jobUrl") or record.get("jobDescription"):
+            yield record
+
+
+class _TrackerHandler(QuietHandler):
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/applications":
+            self.send_json(404, {"error": "not found"})
+            return
+        try:
+            payload = json.loads(self.read_body() or b"[]")
+        except ValueError as exc:
+            self.send_json(400, {"error": f"invalid JSON: {exc}"})
+            return
+        self.service.count_request()
+        items = payload if isinstance(payload, list) else [payload]
+        # n8n sends {"json": {...}} items from a Code node
+        records = [item.get("json", item) if isinstance(item, dict) else {} for item in items]
+        try:
+            with self.service.store.lock:
+                results = self.service.store.add(records)
+        except ValueError as exc:
+            self.send_json(400, {"error": str(exc)})
+            return
+        self.service.changed.set()
+        self.send_json(200, [{"row": row + 1, "outcome": outcome} for row, outcome in results])
+
+
+class TrackerServer(BackgroundServer):
+    """``POST /applications`` with one or more records; the workbook is
+    exported at most every ``interval`` seconds, so a burst of submits costs
+    one export."""
+
+    handler_class = _TrackerHandler
+
+    def __init__(self, store: ApplicationStore, workbook: Path, interval: float = 5.0):
+        super().__init__()
+        self.store = store
+        self.workbook = workbook
+        self.interval = interval
+        self.changed = threading.Event()
+        self._stopping = False
+        self._exporter: Optional[threading.Thread] = None
+
+    def start(self, port: int = 0, host: str = "127.0.0.1") -> "TrackerServer":
+        super().start(port, host)
+        self._exporter = threading.Thread(target=self._export_loop, daemon=True)
+        self._exporter.start()
+        return self
+
+    def stop(self) -> None:
+        super().stop()
+        self._stopping = True
+        self.changed.set()
+        if self._exporter is not None:
+            self._exporter.join()
+            self._exporter = None
+
+    def _export_loop(self) -> None:
+        while not self._stopping:
+            self.changed.wait()
+            time.sleep(0 if self._stopping else self.interval)
+            self.changed.clear()
+            try:
+                with self.store.lock:
+                    if self.store.pending():
+                        stats = self.store.export(self.workbook)
+                        print(f"exported {stats.rows} rows, {stats.rendered} block(s) re-rendered", file=sys.stderr)
+            except OSError as exc:
+                print(f"export failed, retrying on the next change: {exc}", file=sys.stderr)
+
+
+def _records(path: str) -> Iterator[Dict[str, Any]]:
+    return xlsx_records(path) if path.lower().endswith(".xlsx") else iter_records(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    parser.add_argument("--workbook", default=str(DEFAULT_WORKBOOK))
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="add or merge records, then export once")
+    add.add_argument("inputs", nargs="+", help="JSONL/CSV/JSON records, decisions, or an existing tracker .xlsx")
+    add.add_argument("--no-export", action="store_true")
+    status = sub.add_parser("status", help="update one row, then export")
+    status.add_argument("key", help="row ID, job URL or JD text")
+    status.add_argument("status", nargs="?")
+    status.add_argument("--notes")
+    status.add_argument("--resume", help="resume PDF path")
+    status.add_argument("--cover-letter", help="cover letter PDF path")
+    history = sub.add_parser("history", help="changes of one row, with the values they replaced")
+    history.add_argument("key", help="row ID, job URL or JD text")
+    sub.add_parser("export", help="write the workbook")
+    serve = sub.add_parser("serve", help="serve POST /applications")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8789)
+    serve.add_argument("--interval", type=float, default=5.0, help="seconds between exports")
+    args = parser.parse_args(argv)
+
+    store = ApplicationStore(args.db)
+    workbook = Path(args.workbook)
+    try:
+        if args.command == "serve":
+            print(f"tracker on http://{args.host}:{args.port}/applications", file=sys.stderr)
+            TrackerServer(store, workbook, args.interval).serve_forever(args.port, args.host)
+            return 0
+        if args.command == "history":
+            try:
+                events = store.history(args.key)
+            except KeyError:
+                print(f"no application matches {args.key!r}", file=sys.stderr)
+                return 1
+            for event in events:
+                print(json.dumps(event, ensure_ascii=False))
+            return 0
+        if args.command == "add":
+            for path in args.inputs:
+                outcomes = Counter(outcome for _, outcome in store.add(_records(path)))
+                print(f"{path}: {dict(outcomes)}", file=sys.stderr)
+            if args.no_export:
+                return 0
+        elif args.command == "status":
+            try:
+                row, outcome = store.update(
+                    args.key,
+                    status=args.status,
+                    notes=args.notes,
+                    resumePdf=args.resume,
+                    coverLetterPdf=args.cover_letter,
+                )
+            except KeyError:
+                print(f"no application matches {args.key!r}", file=sys.stderr)
+                return 1
+            print(f"row {row + 1}: {outcome}", file=sys.stderr)
+        stats = store.export(workbook)
+        print(json.dumps(asdict(stats)))
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
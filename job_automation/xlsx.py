@@ -0,0 +1,357 @@
+"""Minimal ``.xlsx`` writer that re-deflates only the rows that changed.
+
+A worksheet is one XML member of a zip file, so any library that edits a cell
+has to rewrite and recompress the whole sheet. Here the sheet is split into
+segments of consecutive rows. Each segment is deflated on its own and ends on a
+full flush, so the compressed segments can be concatenated into one valid
+deflate stream. The member CRC is combined from per-segment CRCs. Writing the
+workbook then means compressing the changed segments and copying the rest.
+
+Only what the tracker needs is supported: one sheet, inline strings, a bold
+header row, per-row fills, ``HYPERLINK`` formula cells and column widths.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, IO, Iterable, List, Optional, Sequence, Tuple
+
+EXCEL_CELL_LIMIT = 32767
+HYPERLINK_LIMIT = 255
+
+# Fill colours of the filter verdicts: Green=PASS, Red=REJECT, Yellow=ERROR
+FILLS = {"PASS": "FFC6EFCE", "REJECT": "FFFFC7CE", "ERROR": "FFFFEB9C"}
+_HEADER_FILL = "FFD9D9D9"
+_FILL_ORDER = [""] + list(FILLS)
+
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]")
+_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+SHEET_MEMBER = "xl/worksheets/sheet1.xml"
+
+
+@dataclass(frozen=True)
+class Column:
+    field: str
+    header: str
+    width: float
+    link: bool = False
+
+
+@dataclass
+class Segment:
+    """A deflated run of ``<row>`` elements plus what the zip needs to know."""
+
+    crc: int
+    size: int  # uncompressed bytes
+    data: bytes
+
+
+def _text(value: str) -> str:
+    if not value.isprintable():
+        value = _ILLEGAL_XML.sub("", value)
+    value = value[:EXCEL_CELL_LIMIT]
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+_LETTERS = [_letter(i) for i in range(64)]
+
+
+def _style(fill: str, link: bool) -> int:
+    """``cellXfs`` index: 0 default, 1 header, then (fill, link) pairs."""
+    return 2 + 2 * _FILL_ORDER.index(fill) + int(link)
+
+
+def cell_xml(ref: str, value: str, style: int, target: str = "") -> str:
+    if target and len(target) <= HYPERLINK_LIMIT:
+        label = value or target
+        formula = 'HYPERLINK("{}","{}")'.format(target.replace('"', '""'), label.replace('"', '""'))
+        return f'<c r="{ref}" s="{style}" t="str"><f>{_text(formula)}</f><v>{_text(label)}</v></c>'
+    if not value:
+        return f'<c r="{ref}" s="{style}"/>' if style > 2 else ""
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{_text(value)}</t></is></c>'
+
+
+def row_xml(
+    number: int,
+    columns: Sequence[Column],
+    values: Dict[str, str],
+    links: Optional[Dict[str, str]] = None,
+    fill: str = "",
+) -> str:
+    """One ``<row>``; ``links`` maps link columns to targets, ``fill`` is a :data:`FILLS` key."""
+    fill = fill if fill in FILLS else ""
+    links = links or {}
+    plain, linked = _style(fill, False), _style(fill, True)
+    cells = []
+    for index, column in enumerate(columns):
+        target = links.get(column.field, "") if column.link else ""
+        ref = f"{_LETTERS[index]}{number}"
+        cells.append(cell_xml(ref, values.get(column.field) or "", linked if target else plain, target))
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def deflate_segment(xml: str, level: int = 6) -> Segment:
+    raw = xml.encode("utf-8")
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    # A full flush byte-aligns the output and drops the history, so the next
+    # segment can follow without referring back into this one
+    data = compressor.compress(raw) + compressor.flush(zlib.Z_FULL_FLUSH)
+    return Segment(zlib.crc32(raw), len(raw), data)
+
+
+def sheet_head(columns: Sequence[Column]) -> str:
+    widths = "".join(
+        f'<col min="{i + 1}" max="{i + 1}" width="{c.width}" customWidth="1"/>'
+        for i, c in enumerate(columns)
+    )
+    header = "".join(
+        f'<c r="{_letter(i)}1" s="1" t="inlineStr"><is><t>{_text(c.header)}</t></is></c>'
+        for i, c in enumerate(columns)
+    )
+    return (
+        f'{_XML_DECL}<worksheet xmlns="{_NS}" xmlns:r="{_REL_NS}">'
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        "</sheetView></sheetViews>"
+        f'<sheetFormatPr defaultRowHeight="15"/><cols>{widths}</cols>'
+        f'<sheetData><row r="1">{header}</row>'
+    )
+
+
+SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _styles_xml() -> str:
+    fills = ['<fill><patternFill patternType="none"/></fill>', '<fill><patternFill patternType="gray125"/></fill>']
+    for rgb in [_HEADER_FILL] + list(FILLS.values()):
+        fills.append(f'<fill><patternFill patternType="solid"><fgColor rgb="{rgb}"/><bgColor indexed="64"/></patternFill></fill>')
+    # fill ids: 0 none, 2 header, 3.. verdict fills
+    xfs = [
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>',
+        '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/>',
+    ]
+    for position in range(len(_FILL_ORDER)):
+        fill_id = 0 if position == 0 else position + 2
+        for font_id in (0, 2):
+            xfs.append(
+                f'<xf numFmtId="0" fontId="{font_id}" fillId="{fill_id}" borderId="0" xfId="0"'
+                ' applyFont="1" applyFill="1"/>'
+            )
+    return (
+        f'{_XML_DECL}<styleSheet xmlns="{_NS}">'
+        '<fonts count="3">'
+        '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+        '<font><u/><sz val="11"/><color rgb="FF0563C1"/><name val="Calibri"/><family val="2"/></font>'
+        f'</fonts><fills count="{len(fills)}">{"".join(fills)}</fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        "</styleSheet>"
+    )
+
+
+def _package(sheet_name: str) -> List[Tuple[str, str]]:
+    return [
+        (
+            "[Content_Types].xml",
+            f'{_XML_DECL}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'<Override PartName="/{SHEET_MEMBER}" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            "</Types>",
+        ),
+        (
+            "_rels/.rels",
+            f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        ),
+        (
+            "xl/workbook.xml",
+            f'{_XML_DECL}<workbook xmlns="{_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheets><sheet name="{_text(sheet_name)}" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        ),
+        (
+            "xl/_rels/workbook.xml.rels",
+            f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/styles" Target="styles.xml"/></Relationships>',
+        ),
+        ("xl/styles.xml", _styles_xml()),
+    ]
+
+
+# -- CRC-32 of concatenated data -------------------------------------------
+#
+# crc32(A + B) = shift(crc32(A), len(B)) ^ crc32(B), where shift() feeds
+# len(B) zero bytes through the CRC register. shift() is linear over GF(2);
+# _SHIFTS[k] holds it for 2**k zero bytes as four byte-indexed tables.
+
+_SHIFTS: List[List[List[int]]] = []
+
+
+def _apply(tables: List[List[int]], crc: int) -> int:
+    return (
+        tables[0][crc & 0xFF]
+        ^ tables[1][(crc >> 8) & 0xFF]
+        ^ tables[2][(crc >> 16) & 0xFF]
+        ^ tables[3][crc >> 24]
+    )
+
+
+def _tables(columns: List[int]) -> List[List[int]]:
+    """Byte tables of the linear map whose image of bit ``i`` is ``columns[i]``."""
+    tables = []
+    for byte in range(4):
+        table = [0] * 256
+        for value in range(1, 256):
+            low = value & -value
+            table[value] = table[value ^ low] ^ columns[8 * byte + low.bit_length() - 1]
+        tables.append(table)
+    return tables
+
+
+def _shift_tables(power: int) -> List[List[int]]:
+    if not _SHIFTS:
+        # One zero bit: the register shifts right, xoring the polynomial on a carry
+        bit = [0xEDB88320] + [1 << n for n in range(31)]
+        columns = bit
+        for _ in range(3):
+            tables = _tables(columns)
+            columns = [_apply(tables, c) for c in columns]
+        _SHIFTS.append(_tables(columns))
+    while len(_SHIFTS) <= power:
+        previous = _SHIFTS[-1]
+        columns = [_apply(previous, _apply(previous, 1 << n)) for n in range(32)]
+        _SHIFTS.append(_tables(columns))
+    return _SHIFTS[power]
+
+
+def crc32_combine(crc1: int, crc2: int, length2: int) -> int:
+    """CRC-32 of ``A + B`` from ``crc32(A)``, ``crc32(B)`` and ``len(B)``."""
+    _shift_tables(length2.bit_length())
+    power = 0
+    while length2:
+        if length2 & 1:
+            t0, t1, t2, t3 = _SHIFTS[power]
+            crc1 = t0[crc1 & 0xFF] ^ t1[(crc1 >> 8) & 0xFF] ^ t2[(crc1 >> 16) & 0xFF] ^ t3[crc1 >> 24]
+        length2 >>= 1
+        power += 1
+    return crc1 ^ crc2
+
+
+# -- zip container ---------------------------------------------------------
+
+
+def _dos_time(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+class _ZipWriter:
+    """Stored-size zip writer for members whose deflate stream is built by the caller."""
+
+    def __init__(self, handle: IO[bytes]):
+        self.handle = handle
+        self.entries: List[Tuple[bytes, int, int, int, int]] = []
+        self.dos_time, self.dos_date = _dos_time(time.time())
+
+    def member(self, name: str, crc: int, size: int, compressed: int, chunks: Iterable[bytes]) -> None:
+        if max(size, compressed, self.handle.tell()) >= 0xFFFFFFFF:
+            raise ValueError(f"{name}: zip64 sizes are not supported")
+        encoded = name.encode("utf-8")
+        offset = self.handle.tell()
+        self.handle.write(
+            struct.pack(
+                "<4s5H3L2H", b"PK\x03\x04", 20, 0, 8, self.dos_time, self.dos_date,
+                crc, compressed, size, len(encoded), 0,
+            )
+        )
+        self.handle.write(encoded)
+        for chunk in chunks:
+            self.handle.write(chunk)
+        self.entries.append((encoded, crc, compressed, size, offset))
+
+    def small(self, name: str, text: str) -> None:
+        segment = deflate_segment(text)
+        tail = zlib.compressobj(6, zlib.DEFLATED, -15).flush(zlib.Z_FINISH)
+        self.member(name, segment.crc, segment.size, len(segment.data) + len(tail), [segment.data, tail])
+
+    def close(self) -> None:
+        start = self.handle.tell()
+        for name, crc, compressed, size, offset in self.entries:
+            self.handle.write(
+                struct.pack(
+                    "<4s6H3L5H2L", b"PK\x01\x02", 20, 20, 0, 8, self.dos_time, self.dos_date,
+                    crc, compressed, size, len(name), 0, 0, 0, 0, 0, offset,
+                )
+            )
+            self.handle.write(name)
+        end = self.handle.tell()
+        count = len(self.entries)
+        self.handle.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, count, count, end - start, start, 0))
+
+
+def write_workbook(
+    path: Path,
+    columns: Sequence[Column],
+    segments: Iterable[Segment],
+    sheet_name: str = "Applications",
+) -> int:
+    """Write the workbook atomically from the row segments in order; returns the file size."""
+    segments = list(segments)
+    head = deflate_segment(sheet_head(columns))
+    tail_raw = SHEET_TAIL.encode("utf-8")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    tail = compressor.compress(tail_raw) + compressor.flush(zlib.Z_FINISH)
+
+    crc, size, compressed = head.crc, head.size, len(head.data)
+    for segment in segments:
+        crc = crc32_combine(crc, segment.crc, segment.size)
+        size += segment.size
+        compressed += len(segment.data)
+    crc = crc32_combine(crc, zlib.crc32(tail_raw), len(tail_raw))
+    size += len(tail_raw)
+    compressed += len(tail)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    with temporary.open("wb") as handle:
+        writer = _ZipWriter(handle)
+        for name, text in _package(sheet_name):
+            writer.small(name, text)
+        chunks = [head.data] + [s.data for s in segments] + [tail]
+        writer.member(SHEET_MEMBER, crc, size, compressed, chunks)
+        writer.close()
+        written = handle.tell()
+    # Replacing in one step never leaves a half-written tracker behind; on
+    # Windows this raises PermissionError while Excel has the file open
+    os.replace(temporary, path)
+    return written
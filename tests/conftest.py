@@ -0,0 +1,17 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.fixture
+def sample_jd() -> Dict[str, Any]:
+    return json.loads((EXAMPLES / "sample-jd.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="session")
+def criteria_path() -> Path:
+    return EXAMPLES / "filter-criteria.yaml"
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from job_automation.dispatcher import DONE, AIMDLimiter, Dispatcher, JobQueue, TokenBucket, keyed_jobs, main
+from job_automation.fakes import FakeWebhook
+
+WEBHOOK = "/webhook/cover-letter-generator"
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    yield queue
+    queue.close()
+
+
+def _write_jsonl(path, descriptions):
+    path.write_text("".join(json.dumps({"description": d}) + "\n" for d in descriptions), encoding="utf-8")
+    return path
+
+
+def _dispatcher(queue, url, pdf_dir, on_result=None):
+    return Dispatcher(
+        queue, url, pdf_dir, AIMDLimiter(2, maximum=4), TokenBucket(0), backoff=0.05, timeout=10, on_result=on_result
+    )
+
+
+def _keys(queue):
+    return dict(queue._db.execute("SELECT key, job_description FROM jobs").fetchall())
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue([("1", "jd one"), ("2", "jd two")]) == {"added": 2}
+    assert queue.enqueue([("1", "jd one"), ("2", "jd two")]) == {"unchanged": 2}
+    assert queue.enqueue([("2", "jd two, edited")]) == {"replaced": 1}
+
+
+def test_unkeyed_records_continue_after_the_highest_key(queue, tmp_path):
+    a = _write_jsonl(tmp_path / "a.jsonl", ["alpha", "beta", "gamma"])
+    b = _write_jsonl(tmp_path / "b.jsonl", ["delta", "epsilon", "zeta"])
+    assert queue.enqueue(keyed_jobs(a)) == {"added": 3}
+    assert queue.enqueue(keyed_jobs(b)) == {"added": 3}
+    assert queue.enqueue(keyed_jobs(a)) == {"unchanged": 3}
+    keys = _keys(queue)
+    assert [keys[str(n)].split("\n")[-1] for n in range(1, 7)] == ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+
+
+def test_done_jobs_are_only_replaced_with_force(queue):
+    queue.enqueue([("1", "old jd")])
+    queue.complete(queue.claim().key, 1.0)
+    assert queue.enqueue([("1", "new jd")]) == {"kept": 1}
+    assert queue.counts()[DONE] == 1
+    assert queue.enqueue([("1", "new jd")], force=True) == {"replaced": 1}
+    assert queue.counts()[DONE] == 0
+
+
+def test_cli_keeps_both_files(tmp_path):
+    a = _write_jsonl(tmp_path / "a.jsonl", ["alpha", "beta", "gamma"])
+    b = _write_jsonl(tmp_path / "b.jsonl", ["delta", "epsilon", "zeta"])
+    db = tmp_path / "queue.sqlite"
+    with FakeWebhook() as hook:
+        url = hook.url + WEBHOOK
+        assert main(["--db", str(db), "run", str(a), str(b), "--url", url, "--rate", "0"]) == 0
+        assert main(["--db", str(db), "run", str(a), "--url", url, "--rate", "0"]) == 0
+    assert sorted(hook.calls) == ["1", "2", "3", "4", "5", "6"]
+
+
+def test_resume_after_a_kill_loses_and_repeats_nothing(queue, tmp_path):
+    jobs = [(str(n), f"jd {n}") for n in range(1, 21)]
+    queue.enqueue(jobs)
+    with FakeWebhook(latency=0.05, pdf_dir=tmp_path) as hook:
+        url = hook.url + WEBHOOK
+        finished = 0
+        task = None
+
+        def count(key, outcome, latency, error):
+            nonlocal finished
+            finished += outcome == DONE
+            if finished >= 10:
+                task.cancel()
+
+        async def killed():
+            nonlocal task
+            task = asyncio.ensure_future(_dispatcher(queue, url, tmp_path, count).run())
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(killed())
+        assert queue.counts()[DONE] < len(jobs)
+        # Executions the dead run started still finish on the n8n side
+        time.sleep(0.2)
+        summary = asyncio.run(_dispatcher(queue, url, tmp_path).run())
+
+    assert queue.counts()[DONE] == len(jobs)
+    assert summary.recovered > 0
+    assert summary.skipped == summary.recovered
+    assert all(hook.calls[key] == 1 for key, _ in jobs)
@@ -0,0 +1,56 @@
+import socket
+
+import pytest
+
+from job_automation.fakes import FAKE_PDF, FakeGotenberg
+from job_automation.gotenberg import GotenbergClient, RenderError, RenderJob, multipart_body
+
+HTML = "<html><body><h1>Alex</h1></body></html>"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_multipart_body_carries_options_and_file():
+    body, content_type = multipart_body(b"<p>x</p>", {"paperWidth": "8.5"})
+    boundary = content_type.split("boundary=")[1]
+    assert body.startswith(f"--{boundary}\r\n".encode())
+    assert b'name="paperWidth"\r\n\r\n8.5\r\n' in body
+    assert b'filename="index.html"' in body and b"<p>x</p>" in body
+    assert body.endswith(f"--{boundary}--\r\n".encode())
+
+
+def test_render_writes_pdf(tmp_path):
+    with FakeGotenberg() as gotenberg, GotenbergClient(gotenberg.url) as client:
+        result = client.render(HTML, tmp_path / "out" / "1-R.pdf")
+    assert result.ok and result.attempts == 1
+    assert (tmp_path / "out" / "1-R.pdf").read_bytes() == FAKE_PDF
+    assert not list((tmp_path / "out").glob("*.part"))
+
+
+def test_retries_server_errors(tmp_path):
+    with FakeGotenberg(failure_rate=0.5, seed=3) as gotenberg:
+        with GotenbergClient(gotenberg.url, retries=8, backoff=0.0) as client:
+            results = list(client.render_many(RenderJob(HTML, tmp_path / f"{n}.pdf", str(n)) for n in range(20)))
+    assert all(result.ok for result in results)
+    assert sum(result.attempts for result in results) > 20
+    assert len(list(tmp_path.glob("*.pdf"))) == 20
+
+
+def test_render_raises_after_retries(tmp_path):
+    with FakeGotenberg(failure_rate=1.0) as gotenberg:
+        with GotenbergClient(gotenberg.url, retries=2, backoff=0.0) as client, pytest.raises(RenderError):
+            client.render(HTML, tmp_path / "1-R.pdf")
+    assert not (tmp_path / "1-R.pdf").exists()
+
+
+@pytest.mark.parametrize("url", ["http://gotenberg.invalid:3000", f"http://127.0.0.1:{_free_port()}"])
+def test_network_errors_fail_the_document_not_the_batch(tmp_path, url):
+    with GotenbergClient(url, retries=1, backoff=0.0, timeout=5.0) as client:
+        results = list(client.render_many(RenderJob(HTML, tmp_path / f"{n}.pdf", str(n)) for n in range(3)))
+    assert len(results) == 3
+    assert not any(result.ok for result in results)
+    assert all(result.attempts == 2 and result.error for result in results)
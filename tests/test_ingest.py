@@ -0,0 +1,173 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from job_automation.ingest import (
+    DUPLICATE,
+    INVALID,
+    OK,
+    FingerprintSet,
+    Schema,
+    extract,
+    ingest_stream,
+    main,
+    parse_salary,
+)
+
+SAMPLE = Path(__file__).resolve().parent.parent / "examples" / "sample-jd.json"
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return Schema.from_file(SAMPLE)
+
+
+def _posting(n, **fields):
+    return dict(
+        {
+            "job_url": f"https://example.com/careers/{n}",
+            "position": "Data Analyst",
+            "company": f"Company {n}",
+            "description": f"Posting number {n}: build dashboards and reports for team {n}.",
+        },
+        **fields,
+    )
+
+
+@pytest.mark.parametrize(
+    "text, low, high, period",
+    [
+        ("$70,000 - $90,000 CAD", 70000, 90000, "year"),
+        ("80 000 $ - 95 000 $", 80000, 95000, "year"),
+        ("80 000 $ à 95 000 $ par année", 80000, 95000, "year"),
+        ("70 000–90 000 $ CAD", 70000, 90000, "year"),
+        ("$70 - 90K", 70000, 90000, "year"),
+        ("70k$-90k$", 70000, 90000, "year"),
+        ("$45/hr", 93600, 93600, "hour"),
+        ("25 $/h", 52000, 52000, "hour"),
+        ("$5,000 a month", 60000, 60000, "month"),
+        ("up to $90K", None, 90000, "year"),
+    ],
+)
+def test_parse_salary(text, low, high, period):
+    salary = parse_salary(text)
+    assert (salary["min"], salary["max"], salary["period"]) == (low, high, period)
+    assert salary["source_currency"] == "CAD"
+
+
+def test_parse_salary_converts_currencies():
+    assert parse_salary("US$50 - 60 per hour")["source_currency"] == "USD"
+    assert parse_salary("€45,000 - €55,000") == {
+        "min": 67500,
+        "max": 82500,
+        "currency": "CAD",
+        "source_currency": "EUR",
+        "period": "year",
+    }
+
+
+def test_parse_salary_needs_money_unless_bare():
+    assert parse_salary("3 to 5 years of experience") is None
+    assert parse_salary("70000 - 90000") is None
+    assert parse_salary("70000 - 90000", bare=True)["max"] == 90000
+
+
+def test_extract_fills_missing_fields():
+    text = (
+        "Data Analyst at Acme\n"
+        "Location: Toronto, ON (Hybrid)\n"
+        "Salary: $70,000 - $90,000\n\n"
+        "Responsibilities:\n- Build dashboards\n- Write SQL\n\n"
+        "Qualifications:\n- 2+ years of Python\n"
+    )
+    record, filled = extract({"description": text})
+    assert (record["position"], record["company"], record["location"]) == ("Data Analyst", "Acme", "Toronto, ON (Hybrid)")
+    assert record["responsibilities"] == ["Build dashboards", "Write SQL"]
+    assert record["requirements"] == {"required": ["2+ years of Python"]}
+    assert record["salary_cad"]["max"] == 90000
+    assert "position" in filled and "salary_range" in filled
+
+
+def test_dedupe_on_url_and_body(schema, tmp_path):
+    lines = [
+        json.dumps(_posting(1)),
+        json.dumps(_posting(1, job_url="https://www.example.com/careers/1/?utm_source=feed", company="Other")),
+        json.dumps(_posting(2, description=_posting(1)["description"])),
+        json.dumps(_posting(3)),
+        '{"position": "broken"',
+    ]
+    seen = FingerprintSet(tmp_path / "seen.fpset")
+    statuses = [status for status, _ in ingest_stream(lines, schema, seen)]
+    seen.close()
+    assert statuses == [OK, DUPLICATE, DUPLICATE, OK, INVALID]
+
+
+def test_seen_set_waits_for_the_flush(schema, tmp_path):
+    seen = FingerprintSet(tmp_path / "seen.fpset")
+    flushes = []
+    lines = [json.dumps(_posting(n)) for n in range(1, 4)]
+    stream = ingest_stream(lines, schema, seen, flush=lambda: flushes.append(len(seen)))
+    assert next(stream)[0] == OK
+    # A crash here must not leave posting 1 marked seen
+    assert len(seen) == 0
+    assert [status for status, _ in stream] == [OK, OK]
+    assert flushes == [0] and len(seen) == 6
+    seen.close()
+
+
+def test_rerun_appends_only_new_postings(tmp_path):
+    crawl = tmp_path / "crawl.jsonl"
+    output = tmp_path / "jds.jsonl"
+    crawl.write_text("".join(json.dumps(_posting(n)) + "\n" for n in range(1, 4)), encoding="utf-8")
+    args = [str(crawl), "-o", str(output), "--workers", "1", "--schema", str(SAMPLE)]
+    assert main(args) == 0
+    assert main(args) == 0
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 3
+    assert (tmp_path / "jds.seen.fpset").exists()
+
+    with crawl.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_posting(4)) + "\n")
+    assert main(args) == 0
+    companies = [json.loads(line)["company"] for line in output.read_text(encoding="utf-8").splitlines()]
+    assert companies == ["Company 1", "Company 2", "Company 3", "Company 4"]
+
+
+def test_fingerprint_set_grows_and_persists(tmp_path):
+    path = tmp_path / "seen.fpset"
+    seen = FingerprintSet(path, capacity=16)
+    for value in range(1, 101):
+        assert seen.add(value * 7919)
+    assert not seen.add(7919)
+    seen.close()
+    seen = FingerprintSet(path)
+    assert len(seen) == 100 and seen.capacity >= 200
+    assert all(value * 7919 in seen for value in range(1, 101))
+    assert 13 not in seen
+    seen.close()
+
+
+def test_fingerprint_set_recovers_its_count_after_a_crash(tmp_path):
+    path = tmp_path / "seen.fpset"
+    crash = (
+        "import os, sys\n"
+        "from job_automation.ingest import FingerprintSet\n"
+        "seen = FingerprintSet(sys.argv[1], capacity=16)\n"
+        "for value in range(1, 9):\n"
+        "    seen.add(value * 7919)\n"
+        "os._exit(0)\n"
+    )
+    root = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", crash, str(path)], cwd=root, check=True, timeout=30)
+
+    seen = FingerprintSet(path)
+    assert len(seen) == 8
+    for value in range(9, 17):
+        assert seen.add(value * 7919)
+    assert len(seen) == 16 and seen.capacity >= 32
+    # With a stale count the table filled up and this lookup never ended
+    assert 123456789 not in seen
+    seen.close()
+    assert len(FingerprintSet(path)) == 16
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from job_automation.layout import FontMetrics, LayoutEngine, Style, default_font, font_for
+from job_automation.layout_calibration import _agrees, check, load, pdf_fonts, recorded_font
+
+REFERENCES = Path(__file__).resolve().parent.parent / "calibration" / "layout"
+
+
+def test_font_for_strips_subset_prefixes():
+    assert font_for(["AAAAAB+ArialMT"]) == "arial"
+    assert font_for(["BCDEEE+LiberationSans-Bold"]) == "arial"
+    assert font_for(["CAAAAA+DejaVuSans", "CAAAAB+DejaVuSans-Bold"]) == "dejavu"
+    assert font_for(["Times-Roman"]) is None
+    assert font_for([]) is None
+
+
+def test_special_widths_are_em_fractions():
+    # a (0.556) + en dash (0.556) + b (0.556)
+    assert FontMetrics(font="arial").em_width("a–b") == pytest.approx(1.668, abs=1e-3)
+
+
+def test_dejavu_is_wider_than_arial():
+    text = "Built a resume pipeline with Python and Chromium"
+    arial, dejavu = FontMetrics(font="arial"), FontMetrics(font="dejavu")
+    assert dejavu.em_width(text) / arial.em_width(text) == pytest.approx(1.13, abs=0.03)
+    assert dejavu.em_width(text, bold=True) > arial.em_width(text, bold=True)
+
+
+def test_line_box_floors_to_whole_pixels():
+    assert Style(font_size=11.0, line_height=1.25).line_box == pytest.approx(13.5)
+    assert Style(font_size=12.0, line_height=1.5).line_box == pytest.approx(18.0)
+    assert Style(line_height_pt=15.0).line_box == pytest.approx(15.0)
+
+
+def test_pdf_fonts_reads_base_fonts():
+    data = b"<< /Type /Font /BaseFont /AAAAAA+DejaVuSans >> << /BaseFont /AAAAAB+DejaVuSans-Bold >>"
+    assert pdf_fonts(data) == ["AAAAAA+DejaVuSans", "AAAAAB+DejaVuSans-Bold"]
+
+
+def test_wrap_probes_only_compare_whether_they_wrapped():
+    wrap = next(r for r in load(REFERENCES) if r.kind == "wrap" and r.pages > 1)
+    assert _agrees(wrap, 3)
+    assert not _agrees(wrap, 1)
+
+
+def test_committed_references_agree_with_their_font():
+    font = recorded_font(REFERENCES)
+    assert font == "dejavu"
+    result = check(REFERENCES, LayoutEngine(font=font))
+    assert result.total == 33
+    assert result.mismatches == []
+
+
+def test_arial_tables_miss_dejavu_wraps():
+    assert check(REFERENCES, LayoutEngine(font="arial")).mismatches
+
+
+def test_default_font_follows_the_committed_references(tmp_path):
+    assert default_font() == default_font(REFERENCES) == recorded_font(REFERENCES)
+    assert LayoutEngine().metrics.font == "dejavu"
+    assert default_font(tmp_path) == "arial"
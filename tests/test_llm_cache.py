@@ -0,0 +1,111 @@
+import json
+import urllib.request
+
+import pytest
+
+from job_automation.fakes import FakeAnthropic
+from job_automation.llm_cache import HIT, MISS, NEAR, CachingProxy, ResponseCache, request_key
+
+JD = (
+    "Req ID R-10482\nData Analyst at Maple Analytics\n"
+    "We are seeking a talented Data Analyst to join our growing team. You will work "
+    "with cross-functional partners to turn data into decisions, build reports and "
+    "automate recurring analysis with SQL, Python and Tableau. Our culture values "
+    "curiosity, ownership and clear communication. You will partner with finance, "
+    "marketing and operations leads to define metrics, maintain dashboards, run "
+    "ad hoc deep dives and present findings to senior stakeholders every quarter. "
+    "Experience with dbt, Airflow or Snowflake is an asset; a degree in statistics, "
+    "economics or computer science is expected."
+)
+REPOSTED = JD.replace("R-10482", "JR-2231") + "\nWe are an equal opportunity employer."
+OTHER = "Door-to-door sales representative. Commission only. Must have car and a valid licence."
+
+
+def body(prompt, **overrides):
+    return {
+        "model": "claude-sonnet-4-5-20250929",
+        "max_tokens": 2000,
+        "temperature": 0.3,
+        "messages": [{"role": "user", "content": prompt}],
+        **overrides,
+    }
+
+
+def analyze(jd):
+    return body(f"Extract TOP 10 skills.\n\n<job_description>\n{jd}\n</job_description>\n\nReturn top_10_skills")
+
+
+def cover_letter(analysis):
+    return body(f"Write a cover letter.\n\n<job_analysis>\n{analysis}\n</job_analysis>\n\ncover_letter_text")
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(":memory:")
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_jd_formatting():
+    assert request_key(analyze(JD)).key == request_key(analyze("  " + JD.upper().replace(" ", "   "))).key
+    assert request_key(analyze(JD)).key != request_key(analyze(JD + " Kafka")).key
+
+
+def test_key_depends_on_settings():
+    assert request_key(analyze(JD)).key != request_key(dict(analyze(JD), temperature=0.0)).key
+    assert request_key(analyze(JD)).scope != request_key(dict(analyze(JD), model="claude-haiku-4-5")).scope
+
+
+def test_cover_letter_key_normalizes_analysis():
+    analysis = "Company: Maple Analytics\nRole: Data Analyst\nTop Skills: [\"SQL\", \"Python\"]"
+    key = request_key(cover_letter(analysis))
+    assert key.key == request_key(cover_letter("\n  " + analysis.replace("\n", "\n\n") + "  ")).key
+    assert key.jd == ""  # no near-duplicate lookups for derived text
+
+
+def test_exact_hit(cache):
+    key = request_key(analyze(JD))
+    assert cache.get(key) == (None, MISS)
+    cache.put(key, b'{"answer": 1}', 1.5)
+    assert cache.get(key) == (b'{"answer": 1}', HIT)
+    assert cache.stats.saved_seconds == pytest.approx(1.5)
+
+
+def test_near_duplicate_hit(cache):
+    cache.put(request_key(analyze(JD)), b"analysis", 1.0)
+    assert cache.get(request_key(analyze(REPOSTED))) == (b"analysis", NEAR)
+    # The near hit is stored under its own key as well
+    assert cache.get(request_key(analyze(REPOSTED))) == (b"analysis", HIT)
+    assert cache.get(request_key(analyze(OTHER))) == (None, MISS)
+
+
+def test_near_duplicates_stay_within_scope(cache):
+    cache.put(request_key(analyze(JD)), b"analysis", 1.0)
+    other_model = dict(analyze(REPOSTED), model="claude-haiku-4-5")
+    assert cache.get(request_key(other_model)) == (None, MISS)
+
+
+def test_eviction_by_size(cache):
+    cache.max_bytes = 1000
+    for n in range(10):
+        cache.put(request_key(body(f"prompt {n}")), b"x" * 300, 0.1)
+    assert cache.summary()["bytes"] <= 1000
+    assert cache.get(request_key(body("prompt 9")))[1] == HIT
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url + "/v1/messages", data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.headers["X-Cache"], response.read()
+
+
+def test_proxy_answers_repeats_from_cache(cache):
+    with FakeAnthropic(latency=0.0) as llm, CachingProxy(cache, upstream=llm.url) as proxy:
+        outcome, first = _post(proxy.url, analyze(JD))
+        assert outcome == MISS
+        assert _post(proxy.url, analyze(JD)) == (HIT, first)
+        assert _post(proxy.url, analyze(REPOSTED)) == (NEAR, first)
+        assert _post(proxy.url, dict(analyze(JD), stream=True))[0] == "BYPASS"
+        assert llm.requests == 2
@@ -0,0 +1,121 @@
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from job_automation.materials import (
+    BACHELOR_COURSES,
+    MASTER_COURSES,
+    PROJECTS,
+    SKILLS,
+    MaterialsIndex,
+    ShortlistServer,
+    chunk_markdown,
+)
+
+SKILL_NOTES = """# Skills
+
+## Tools
+- **Docker** and Kubernetes
+- [Power BI](https://example.com) dashboards
+
+Built reporting in
+Tableau for finance.
+"""
+PROJECTS_MD = {
+    "churn-model": "# Churn model\nPredicted churn with Python and scikit-learn machine learning.",
+    "sales-dashboard": "# Sales dashboard\nTableau dashboard over SQL views for the sales team.",
+    "inventory-api": "# Inventory API\nREST service in Java with PostgreSQL.",
+    "log-pipeline": "# Log pipeline\nKafka and Spark streaming of web logs.",
+}
+
+
+@pytest.fixture
+def data(tmp_path):
+    root = tmp_path / "data"
+    (root / "relevant_project").mkdir(parents=True)
+    for name, text in PROJECTS_MD.items():
+        (root / "relevant_project" / f"{name}.md").write_text(text, encoding="utf-8")
+    (root / "relevant_skills.md").write_text(SKILL_NOTES, encoding="utf-8")
+    (root / "edu_master_course.md").write_text("- Machine Learning\n- Distributed Systems\n", encoding="utf-8")
+    (root / "edu_bech_course.md").write_text("- Linear Algebra\n- Operating Systems\n", encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def index(data, tmp_path):
+    index = MaterialsIndex(data, tmp_path / "index.json")
+    index.refresh()
+    return index
+
+
+def test_chunk_markdown_splits_items_and_keeps_headings():
+    chunks = chunk_markdown(SKILL_NOTES, SKILLS, "relevant_skills.md")
+    assert [c.name for c in chunks] == ["Docker and Kubernetes", "Power BI dashboards", "Built reporting in Tableau for finance."]
+    assert chunks[0].text == "Tools: Docker and Kubernetes"
+    [project] = chunk_markdown(PROJECTS_MD["churn-model"], PROJECTS, "relevant_project/churn-model.md")
+    assert (project.name, project.text) == ("churn-model", PROJECTS_MD["churn-model"])
+
+
+def test_refresh_only_reindexes_changed_files(data, tmp_path):
+    store = tmp_path / "index.json"
+    first = MaterialsIndex(data, store).refresh()
+    assert (first.indexed, first.unchanged) == (7, 0)
+
+    again = MaterialsIndex(data, store)
+    assert again.refresh().unchanged == 7
+
+    skills = data / "relevant_skills.md"
+    stat = skills.stat()
+    os.utime(skills, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (data / "edu_bech_course.md").write_text("- Linear Algebra\n- Databases\n", encoding="utf-8")
+    (data / "relevant_project" / "log-pipeline.md").unlink()
+    stats = again.refresh()
+    assert (stats.unchanged, stats.touched, stats.indexed, stats.removed) == (4, 1, 1, 1)
+    assert [h.name for h in again.search(["Databases"], BACHELOR_COURSES)] == ["Databases"]
+
+
+def test_bm25_ranks_by_skill_and_rank(index):
+    hits = index.search(
+        [{"skill": "Tableau", "jd_keywords": ["dashboards"]}, {"skill": "Machine Learning"}], PROJECTS, k=4
+    )
+    assert [h.name for h in hits[:2]] == ["sales-dashboard", "churn-model"]
+    assert hits[0].matched == ["Tableau"] and hits[1].matched == ["Machine Learning"]
+    # Projects are padded with unmatched ones
+    assert len(hits) == 4 and hits[-1].score == 0
+    assert [h.name for h in index.search(["Machine Learning"], MASTER_COURSES)] == ["Machine Learning"]
+
+
+def test_prompt_fields_keep_the_workflow_format(index):
+    fields = index.prompt_fields(["Tableau", "Docker"], {PROJECTS: 2})
+    assert fields["projectsContent"].startswith("[FILE: sales-dashboard]\n# Sales dashboard\n")
+    assert fields["projectsContent"].count("[FILE: ") == 2
+    assert list(fields["projectsMap"]) == ["sales-dashboard", "churn-model"]
+    assert fields["projectsMap"]["sales-dashboard"] == PROJECTS_MD["sales-dashboard"]
+    assert fields["skillsContent"].splitlines() == ["- Tools: Docker and Kubernetes", "- Tools: Built reporting in Tableau for finance."]
+
+
+def test_courses_fall_back_to_the_full_list(index):
+    fields = index.prompt_fields(["Python", "Tableau"])
+    assert fields["bachelorCoursesContent"] == "- Linear Algebra\n- Operating Systems"
+    assert fields["masterCoursesContent"] == "- Machine Learning\n- Distributed Systems"
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url + "/shortlist", data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_server_validates_k(index):
+    with ShortlistServer(index) as server:
+        fields = _post(server.url, {"top_10_skills": [{"skill": "SQL"}], "k": {PROJECTS: 1}})
+        assert list(fields["projectsMap"]) == ["sales-dashboard"]
+        for k in (3, {PROJECTS: -1}, {PROJECTS: "2"}, {"papers": 2}):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                _post(server.url, {"top_10_skills": ["SQL"], "k": k})
+            assert error.value.code == 400
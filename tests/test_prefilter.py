@@ -0,0 +1,106 @@
+import pytest
+
+from job_automation.prefilter import (
+    LOCATION,
+    MAX_YEARS,
+    MIN_SALARY,
+    NEEDS_LLM,
+    PASS,
+    REJECT,
+    REJECT_EDUCATION,
+    REJECT_PHRASE,
+    REQUIRED_SKILL,
+    CompiledCriteria,
+    classify_stream,
+)
+
+
+@pytest.fixture(scope="module")
+def criteria(criteria_path):
+    return CompiledCriteria.from_file(criteria_path)
+
+
+def test_sample_jd_passes(criteria, sample_jd):
+    decision = criteria.classify(sample_jd)
+    assert (decision.verdict, decision.rule, decision.matched) == (PASS, REQUIRED_SKILL, "SQL")
+
+
+@pytest.mark.parametrize(
+    "change, rule",
+    [
+        ({"description": "Daily cold-calling of prospects."}, REJECT_PHRASE),
+        ({"description": "A PhD in Statistics is required."}, REJECT_EDUCATION),
+        ({"description": "You bring 8+ years of experience in analytics."}, MAX_YEARS),
+        ({"salary_range": "$40,000 - $50,000 CAD"}, MIN_SALARY),
+        ({"location": "Vancouver, BC"}, LOCATION),
+    ],
+)
+def test_hard_rules_reject(criteria, sample_jd, change, rule):
+    decision = criteria.classify({**sample_jd, **change})
+    assert (decision.verdict, decision.rule) == (REJECT, rule)
+
+
+@pytest.mark.parametrize(
+    "description",
+    [
+        "We do not require a PhD.",
+        "PhD or equivalent experience.",
+        "A PhD is an asset.",
+        "Ideally 8+ years of experience.",
+        "Master's degree or PhD in Statistics.",
+        "No cold calling involved.",
+    ],
+)
+def test_preferred_or_negated_requirements_do_not_reject(criteria, sample_jd, description):
+    assert criteria.classify({**sample_jd, "description": description}).verdict != REJECT
+
+
+def test_negated_degree_needs_llm(criteria, sample_jd):
+    decision = criteria.classify({**sample_jd, "description": "We do not require a PhD."})
+    assert decision.verdict == NEEDS_LLM
+    assert "PhD" in decision.reason
+
+
+@pytest.mark.parametrize("location", [["Toronto, ON"], ["Hybrid", "Mississauga, ON"]])
+def test_location_list(criteria, sample_jd, location):
+    assert criteria.classify({**sample_jd, "location": location}).verdict == PASS
+
+
+@pytest.mark.parametrize("location", [None, "", []])
+def test_missing_location_needs_llm(criteria, sample_jd, location):
+    decision = criteria.classify({**sample_jd, "location": location})
+    assert decision.verdict == NEEDS_LLM
+    assert "location not stated" in decision.reason
+
+
+def test_remote_elsewhere_needs_llm(criteria, sample_jd):
+    assert criteria.classify({**sample_jd, "location": "Remote (US)"}).verdict == NEEDS_LLM
+
+
+@pytest.mark.parametrize(
+    "description, verdict, skill",
+    [
+        ("Support our R&D launches. You will excel in a fast-paced team.", NEEDS_LLM, ""),
+        ("Build campaign reports in Excel.", PASS, "Excel"),
+        ("Model churn in R, then present it.", PASS, "R"),
+    ],
+)
+def test_common_word_skills_match_only_as_written(criteria, description, verdict, skill):
+    record = {"position": "Marketing Coordinator", "location": "Toronto, ON", "description": description}
+    decision = criteria.classify(record)
+    assert (decision.verdict, decision.matched) == (verdict, skill)
+
+
+def test_no_required_skill_needs_llm(criteria):
+    record = {"position": "Analyst", "location": "Toronto, ON", "description": "Build reports."}
+    decision = criteria.classify(record)
+    assert decision.verdict == NEEDS_LLM
+    assert "no required skill" in decision.reason
+
+
+def test_pool_keeps_input_order(criteria, sample_jd):
+    records = [{**sample_jd, "job_url": str(n)} for n in range(40)]
+    records[7]["description"] = "Door-to-door sales."
+    results = list(classify_stream(records, criteria, workers=2, batch_size=5))
+    assert [record["job_url"] for record, _ in results] == [str(n) for n in range(40)]
+    assert [n for n, (_, decision) in enumerate(results) if decision["verdict"] == REJECT] == [7]
@@ -0,0 +1,202 @@
+import json
+
+import pytest
+
+from job_automation.fakes import FakeAnthropic
+from job_automation.structured import (
+    SCHEMAS,
+    JsonStream,
+    MessagesClient,
+    StreamError,
+    StructuredOutputError,
+    StructuredStream,
+)
+
+SKILLS = {
+    "top_10_skills": [
+        {"rank": 1, "skill": "SQL", "category": "technical"},
+        {"rank": 2, "skill": "Python", "category": "technical"},
+        {"rank": 3, "skill": "Tableau", "category": "tools"},
+    ],
+    "job_title": "Data Analyst",
+}
+PROMPT = 'Return ONLY valid JSON: {"top_10_skills": ...}'
+
+
+def _feed(stream, text, size=7):
+    events = []
+    for start in range(0, len(text), size):
+        events += stream.feed(text[start:start + size])
+    return events
+
+
+def _body(prefill=None):
+    messages = [{"role": "user", "content": PROMPT}]
+    if prefill:
+        messages.append({"role": "assistant", "content": prefill})
+    return {"model": "claude-sonnet-4-5-20250929", "max_tokens": 2000, "messages": messages}
+
+
+def _replies(*answers):
+    """A responder that gives each answer once, then repeats the last."""
+    calls = []
+
+    def reply(prompt):
+        calls.append(prompt)
+        return answers[min(len(calls), len(answers)) - 1]
+
+    return reply
+
+
+def test_elements_close_in_order_across_chunks():
+    text = "Here is the analysis:\n```json\n" + json.dumps(SKILLS, indent=2) + "\n```\nLet me know!"
+    stream = JsonStream(SCHEMAS["jd_analysis"])
+    events = _feed(stream, text)
+    assert [e.path for e in events] == [
+        ("top_10_skills", 0),
+        ("top_10_skills", 1),
+        ("top_10_skills", 2),
+        ("top_10_skills",),
+        ("job_title",),
+    ]
+    assert stream.close() == SKILLS
+
+
+def test_escapes_and_scalars_split_across_chunks():
+    value = {"cover_letter_text": 'Dear "Team",\n\\ thanks', "key_points_highlighted": ["SQL"], "tone_analysis": "warm"}
+    stream = JsonStream(SCHEMAS["cover_letter"])
+    _feed(stream, json.dumps(value), size=1)
+    assert stream.close() == value
+
+
+def test_stray_brace_fails_with_a_checkpoint_after_the_last_good_element():
+    text = json.dumps(SKILLS)
+    at = text.index(', {"rank": 3')
+    stream = JsonStream(SCHEMAS["jd_analysis"])
+    with pytest.raises(StreamError, match="unexpected"):
+        _feed(stream, text[:at] + "}}" + text[at:])
+    assert stream.buffer[: stream.checkpoint].endswith('"Python", "category": "technical"}')
+    assert stream.partial()["top_10_skills"] == SKILLS["top_10_skills"][:2]
+
+
+def test_quoted_numbers_are_coerced():
+    text = json.dumps(SKILLS).replace('"rank": 1', '"rank": "1"')
+    stream = JsonStream(SCHEMAS["jd_analysis"])
+    events = _feed(stream, text)
+    assert events[0].value["rank"] == 1
+    assert stream.close() == SKILLS
+
+
+def test_off_schema_element_fails():
+    text = json.dumps(SKILLS).replace('"rank": 1', '"rank": "first"')
+    with pytest.raises(StreamError, match=r"top_10_skills\[0\]\.rank should be a number"):
+        _feed(JsonStream(SCHEMAS["jd_analysis"]), text)
+
+
+def test_missing_required_field_fails():
+    with pytest.raises(StreamError, match="missing top_10_skills"):
+        _feed(JsonStream(SCHEMAS["jd_analysis"]), '{"job_title": "Data Analyst"}')
+
+
+def test_tail_retry_resumes_after_the_last_good_element():
+    full = json.dumps(SKILLS)
+    cut = full[: full.index('{"rank": 3') + 12]
+    with FakeAnthropic(responder=_replies(cut, full)) as llm:
+        client = MessagesClient(llm.url)
+        result = StructuredStream(client, _body()).run()
+        client.close()
+    assert result.value == SKILLS
+    assert result.attempts == 2 and len(result.repairs) == 1
+    # The retry resumed after the first skill and wrote the rest again
+    assert llm.requests == 2
+
+
+def _stray_brace(text, skill):
+    """``text`` with a stray "}" that cuts the element of ``skill`` short."""
+    at = text.index(f'"{skill}", "category"') + len(f'"{skill}"')
+    return text[:at] + "}" + text[at:]
+
+
+def test_retry_drops_the_element_a_stray_brace_cut_short():
+    full = json.dumps(SKILLS)
+    # "Python" closes early without its category, which is still valid; the
+    # retry must not keep it, or the model would continue a text it never wrote
+    with FakeAnthropic(responder=_replies(_stray_brace(full, "Python"), full)) as llm:
+        client = MessagesClient(llm.url)
+        result = StructuredStream(client, _body()).run()
+        client.close()
+    assert result.value == SKILLS
+    assert result.attempts == 2
+
+
+def test_failed_tail_retry_is_followed_by_a_whole_run():
+    full = json.dumps(SKILLS)
+    cut = full[: full.index('{"rank": 3') + 12]
+    with FakeAnthropic(responder=_replies(_stray_brace(full, "Python"), cut, full)) as llm:
+        client = MessagesClient(llm.url)
+        result = StructuredStream(client, _body(), max_repairs=1).run()
+        client.close()
+    assert result.value == SKILLS
+    assert result.attempts == 3 and len(result.repairs) == 2
+
+
+def _events(llm, **options):
+    client = MessagesClient(llm.url)
+    stream = StructuredStream(client, _body(), **options)
+    events = [(e.path, e.value, e.revised) for e in stream]
+    client.close()
+    return events, stream.result
+
+
+def test_events_are_reported_once_and_never_cut():
+    full = json.dumps(SKILLS)
+    with FakeAnthropic(responder=_replies(_stray_brace(full, "Python"), full)) as llm:
+        events, result = _events(llm)
+    assert result.attempts == 2
+    assert events == [
+        (("top_10_skills", 0), SKILLS["top_10_skills"][0], False),
+        (("top_10_skills", 1), SKILLS["top_10_skills"][1], False),
+        (("top_10_skills", 2), SKILLS["top_10_skills"][2], False),
+        (("top_10_skills",), SKILLS["top_10_skills"], False),
+        (("job_title",), "Data Analyst", False),
+    ]
+
+
+def test_whole_run_only_reports_what_changed():
+    full = json.dumps(SKILLS)
+    other = full.replace('"Tableau", "category": "tools"', '"Power BI", "category": "tools"')
+    # A stray brace in the first element leaves no prefix to keep
+    with FakeAnthropic(responder=_replies(_stray_brace(full, "SQL"), other)) as llm:
+        events, _ = _events(llm, max_repairs=1)
+    assert [path for path, _, _ in events].count(("top_10_skills", 0)) == 1
+
+    cut = full[: full.index('"job_title"') + 5]
+    with FakeAnthropic(responder=_replies(cut, cut, other)) as llm:
+        events, result = _events(llm, max_repairs=1)
+    assert result.value["top_10_skills"][2]["skill"] == "Power BI"
+    paths = [path for path, _, _ in events]
+    # Only the element the re-run wrote differently comes twice
+    assert len(paths) == len(set(paths)) + 1
+    revised = [(path, value["skill"]) for path, value, revised in events if revised and len(path) == 2]
+    assert revised == [(("top_10_skills", 2), "Power BI")]
+
+
+def test_stray_brace_in_the_first_element_runs_the_prompt_again():
+    full = json.dumps(SKILLS)
+    with FakeAnthropic(responder=_replies(_stray_brace(full, "SQL"), full)) as llm:
+        client = MessagesClient(llm.url)
+        result = StructuredStream(client, _body(), max_repairs=1).run()
+        client.close()
+    assert result.value == SKILLS
+    assert result.attempts == 2
+
+
+def test_gives_up_with_the_partial_answer():
+    full = json.dumps(SKILLS)
+    cut = full[: full.index('{"rank": 2')]
+    with FakeAnthropic(responder=_replies(cut)) as llm:
+        client = MessagesClient(llm.url)
+        with pytest.raises(StructuredOutputError) as error:
+            StructuredStream(client, _body(), max_repairs=1).run()
+        client.close()
+    assert error.value.partial["top_10_skills"] == SKILLS["top_10_skills"][:1]
@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from job_automation.tracing import (
+    LLM,
+    NODE,
+    RENDER,
+    WORKFLOW,
+    Application,
+    LLMCall,
+    ReplayResult,
+    Stage,
+    _unflatten,
+    critical_path,
+    iter_executions,
+    load_applications,
+    makespan,
+    overlaps,
+    regressions,
+    stage_stats,
+)
+
+# Two cover-letter runs with their resume sub-workflow. The second is 1.5x
+# slower, and its child is flatted and linked only through parentExecution.
+EXPORT = Path(__file__).resolve().parent / "fixtures" / "n8n-executions.json"
+
+
+def _stage(name, start, seconds, after=(), kind=NODE, calls=()):
+    return Stage(name, kind, start, seconds, after=list(after), calls=list(calls), own=seconds)
+
+
+def _serial_app():
+    """Two branches after a fork, run one after the other as n8n does."""
+    stages = [
+        _stage("Webhook", 0.0, 0.1),
+        _stage("Resume", 0.1, 10.0, ["Webhook"]),
+        _stage("Process Input", 10.1, 0.2, ["Resume"]),
+        _stage("Cover Letter", 10.3, 24.0, ["Webhook"], LLM, [LLMCall("claude-sonnet-4-5", 10.3, 24.0)]),
+        _stage("PDF", 34.3, 2.0, ["Process Input", "Cover Letter"]),
+    ]
+    return Application("1", "cover-letter-generator", 0.0, {s.name: s for s in stages})
+
+
+def test_critical_path_attributes_waits_to_the_stages_that_ran():
+    steps = critical_path(_serial_app())
+    assert [s.stage for s in steps] == ["Webhook", "Cover Letter", "PDF"]
+
+    app = _serial_app()
+    app.stages["PDF"].after = ["Process Input"]
+    steps = critical_path(app)
+    assert [s.stage for s in steps] == ["Webhook", "Resume", "Process Input", "PDF"]
+    wait = steps[3]
+    assert round(wait.wait, 1) == 24.0
+    assert list(wait.behind) == ["Cover Letter"]
+    assert round(wait.behind["Cover Letter"], 1) == 24.0
+    assert steps[2].behind == {}
+
+
+def test_overlap_and_projection():
+    app = _serial_app()
+    [branches] = overlaps(app)
+    assert branches.kind == "branches" and branches.at == "Webhook"
+    assert sorted(branches.stages) == ["Cover Letter", "Resume"]
+    assert round(branches.saving, 1) == 10.2
+    assert round(makespan(app), 1) == 26.1
+
+
+@pytest.fixture(scope="module")
+def apps():
+    return load_applications([EXPORT])
+
+
+def test_unflatten_resolves_shared_references():
+    table = [{"a": "1", "b": "1", "n": 3}, {"name": "2", "tags": "3"}, "Webhook", ["2", 0.5]]
+    value = _unflatten(table)
+    assert value == {"a": {"name": "Webhook", "tags": ["Webhook", 0.5]}, "b": value["a"], "n": 3}
+    assert value["a"] is value["b"]
+
+
+def test_iter_executions_reads_paged_and_flatted_exports(tmp_path):
+    executions = list(iter_executions(EXPORT))
+    assert [e["id"] for e in executions] == ["101", "102", "103", "104"]
+    assert executions[3]["data"]["parentExecution"]["executionId"] == "103"
+    assert "Analyze JD" in executions[3]["data"]["resultData"]["runData"]
+
+    lines = tmp_path / "executions.jsonl"
+    lines.write_text("".join(json.dumps(e) + "\n" for e in executions[:2]), encoding="utf-8")
+    assert [e["id"] for e in iter_executions(lines)] == ["101", "102"]
+
+
+def test_sub_workflows_are_inlined_with_their_llm_calls(apps):
+    assert [a.execution_id for a in apps] == ["101", "103"]
+    stages = apps[0].stages
+    assert list(stages) == [
+        "Webhook",
+        "Resume Generator/Start",
+        "Resume Generator/Analyze JD",
+        "Resume Generator/Parse JD Analysis",
+        "Generate Resume",
+        "AI Agent - Write Cover Letter",
+        "Render PDF",
+    ]
+    resume = stages["Generate Resume"]
+    assert resume.kind == WORKFLOW
+    assert resume.after == ["Webhook", "Resume Generator/Parse JD Analysis"]
+    # Its own time excludes the 8.25 s the child ran
+    assert round(resume.own, 2) == 1.75
+    assert stages["Resume Generator/Start"].after == ["Webhook"]
+    assert stages["Render PDF"].kind == RENDER
+
+    analyze = stages["Resume Generator/Analyze JD"]
+    assert analyze.kind == LLM
+    assert [(c.model, c.input_tokens, c.output_tokens) for c in analyze.calls] == [
+        ("claude-haiku-4-5-20251001", 1000, 200),
+        ("claude-haiku-4-5-20251001", 1200, 300),
+    ]
+    [letter] = stages["AI Agent - Write Cover Letter"].calls
+    assert (letter.model, letter.seconds) == ("claude-sonnet-4-5-20250929", 5.8)
+    # The older export of the second run is linked child -> parent only
+    assert "Resume Generator/Analyze JD" in apps[1].stages
+
+
+def test_cost_and_tokens(apps):
+    assert apps[0].tokens() == (4200, 1300)
+    # Haiku 4.5: 2,200 in / 500 out at $1/$5; Sonnet 4.5: 2,000 / 800 at $3/$15
+    assert apps[0].cost() == pytest.approx(0.0047 + 0.018)
+    assert apps[0].cost({"claude-sonnet-4-5": (3.0, 15.0)}) is None
+
+
+def test_stage_stats(apps):
+    stats = {s.name: s for s in stage_stats(apps)}
+    analyze = stats["Resume Generator/Analyze JD"]
+    assert (analyze.count, analyze.p50, analyze.p95) == (2, 8.0, 12.0)
+    assert (analyze.calls, analyze.input_tokens, analyze.output_tokens) == (2.0, 2200.0, 500.0)
+    assert stats["Resume Generator/Parse JD Analysis"].items == 10.0
+    assert list(stats)[:2] == ["Webhook", "Generate Resume"]
+
+
+def test_exported_critical_path_and_overlaps(apps):
+    steps = critical_path(apps[0])
+    assert [s.stage for s in steps] == ["Webhook", "AI Agent - Write Cover Letter", "Render PDF"]
+    assert list(steps[1].behind)[:2] == ["Resume Generator/Analyze JD", "Generate Resume"]
+    kinds = {(o.kind, o.at): o for o in overlaps(apps[0])}
+    assert round(kinds[("fan-out", "Resume Generator/Analyze JD")].saving, 1) == 3.0
+    assert ("branches", "Webhook") in kinds
+    assert makespan(apps[0]) < apps[0].wall
+
+
+def _replayed(p50, p95, errors=0):
+    return ReplayResult("branches", 0.02, 2, p50, p95, 17.9, 12.0, 6, 2, errors, 1.0)
+
+
+def test_regressions_against_a_baseline():
+    baseline = {"p50": 10.0, "p95": 20.0, "errors": 0}
+    assert regressions(_replayed(10.5, 21.0), baseline) == []
+    problems = regressions(_replayed(12.0, 20.0, errors=1), baseline)
+    assert problems == ["p50 12.0s vs baseline 10.0s (+20%)", "1 failed requests vs baseline 0"]
@@ -0,0 +1,112 @@
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from job_automation.records import url_key
+from job_automation.tracker import ADDED, BLOCK_ROWS, UNCHANGED, UPDATED, ApplicationStore, application
+
+NOW = datetime(2026, 2, 16, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ApplicationStore(tmp_path / "tracker.sqlite")
+    yield store
+    store.close()
+
+
+def _posting(n, **fields):
+    return dict(
+        {"jobUrl": f"https://example.com/careers/{n}", "companyName": f"Company {n}", "jobTitle": "Data Analyst"},
+        **fields,
+    )
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.example.com/careers/123/?utm_source=x&ref=feed#apply", "example.com/careers/123"),
+        ("http://example.com/careers/123", "example.com/careers/123"),
+        ("example.com/jobs?id=7&gh_src=abc", "example.com/jobs?id=7"),
+        ("https://www.linkedin.com/jobs/search/?currentJobId=4012345678&keywords=data", "linkedin.com/jobs/view/4012345678"),
+        ("https://ca.linkedin.com/jobs/view/data-analyst-at-acme-4012345678?trk=x", "linkedin.com/jobs/view/4012345678"),
+        ("", ""),
+    ],
+)
+def test_url_key(url, expected):
+    assert url_key(url) == expected
+
+
+def test_application_maps_aliases(sample_jd):
+    values = application(sample_jd)
+    assert values["jobTitle"] == sample_jd["position"]
+    assert values["companyName"] == sample_jd["company"]
+    assert values["jobDescription"]
+
+
+def test_same_posting_updates_its_row(store):
+    [(row, outcome)] = store.add([_posting(1)], NOW)
+    assert outcome == ADDED
+    again = _posting(1, jobUrl="https://www.example.com/careers/1/?utm_campaign=feed")
+    assert store.add([again], NOW) == [(row, UNCHANGED)]
+    assert store.add([_posting(1, status="PASS")], NOW) == [(row, UPDATED)]
+    assert len(store) == 1
+    assert store.find("1")["status"] == "PASS"
+
+
+def test_resubmitted_form_keeps_status_and_company(store):
+    form = _posting(1, status="New", companyName="Unknown")
+    [(row, _)] = store.add([dict(form, companyName="Acme")], NOW)
+    store.update("1", status="Applied")
+    assert store.add([form], NOW) == [(row, UNCHANGED)]
+    assert (store.find("1")["status"], store.find("1")["companyName"]) == ("Applied", "Acme")
+    # An explicit update can still reset the status
+    assert store.update("1", status="New") == (row, UPDATED)
+    assert store.find("1")["status"] == "New"
+
+
+def test_same_jd_without_url_matches_on_content(store):
+    text = "Data Analyst\nAcme Company\nLocation: Toronto, ON\n\nBuild dashboards."
+    [(row, _)] = store.add([{"jobDescription": text}], NOW)
+    assert store.add([{"jobDescription": "  " + text.replace("\n\n", "\n \n\n") + "\n"}], NOW) == [(row, UNCHANGED)]
+    assert len(store) == 1
+
+
+def test_record_without_url_or_jd_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.add([{"status": "PASS"}], NOW)
+
+
+def test_history_keeps_overwritten_values(store):
+    store.add([_posting(1)], NOW)
+    store.add([_posting(1, jobTitle="Senior Data Analyst", status="PASS")], NOW)
+    events = store.history("https://example.com/careers/1")
+    assert [e["action"] for e in events] == [ADDED, UPDATED]
+    assert events[1]["changes"] == {"jobTitle": ["Data Analyst", "Senior Data Analyst"], "status": ["New", "PASS"]}
+    with pytest.raises(KeyError):
+        store.history("https://example.com/careers/404")
+
+
+def test_export_rerenders_only_changed_blocks(store, tmp_path):
+    workbook = tmp_path / "job-applications.xlsx"
+    store.add([_posting(n) for n in range(1, 3 * BLOCK_ROWS + 1)], NOW)
+    first = store.export(workbook)
+    assert (first.rows, first.blocks, first.rendered) == (3 * BLOCK_ROWS, 3, 3)
+    assert store.pending() == 0
+
+    store.update("https://example.com/careers/2", status="PASS")
+    second = store.export(workbook)
+    assert (second.blocks, second.rendered) == (3, 1)
+
+    with zipfile.ZipFile(workbook) as archive:
+        assert archive.testzip() is None
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert sheet.count("<row ") == 3 * BLOCK_ROWS + 1
+    assert "PASS" in sheet
+
+
+def test_export_to_a_new_path_renders_everything(store, tmp_path):
+    store.add([_posting(n) for n in range(1, BLOCK_ROWS + 2)], NOW)
+    store.export(tmp_path / "a.xlsx")
+    assert store.export(tmp_path / "b.xlsx").rendered == 2